@@ -0,0 +1,169 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+import { IERC20 } from "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import { SafeERC20 } from "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+import { ReentrancyGuard } from "@openzeppelin/contracts/security/ReentrancyGuard.sol";
+import { AccessControl } from "@openzeppelin/contracts/access/AccessControl.sol";
+import { MerkleProof } from "@openzeppelin/contracts/utils/cryptography/MerkleProof.sol";
+import "../interfaces/IMerkleCampaignDistributor.sol";
+
+/// @title MerkleCampaignDistributor
+/// @notice Pays one-off reward campaigns of long-tail tokens from Merkle roots of per-user entitlements
+///         computed off-chain from the stake history of an MFD (see scripts/merkle_rewards.py).
+///         The tokens never become rewards of the MFD, so campaigns add nothing to the cost of staking,
+///         and a claim costs the same however many campaigns and leaves exist.
+///
+/// Error Codes:
+///     ACL - Already claimed
+///     CNE - Campaign not ended
+///     ICM - Invalid campaign
+///     IPF - Invalid proof
+///     RNA - Roles: not an admin
+///     RNM - Roles: not a campaign manager
+///     ZAD - Zero address
+///     ZAM - Zero amount
+///     ZBL - Zero balance
+
+contract MerkleCampaignDistributor is IMerkleCampaignDistributor, ReentrancyGuard, AccessControl {
+    using SafeERC20 for IERC20;
+
+    struct Campaign {
+        address rewardToken;
+        uint40 deadline;
+        bytes32 merkleRoot;
+        uint256 remaining;
+    }
+
+    address public immutable override mfd;
+
+    Campaign[] private _campaigns;
+
+    /// @dev campaign id => word index => bitmap of claimed leaves
+    mapping(uint256 => mapping(uint256 => uint256)) private _claimedBitMap;
+
+    bytes32 public constant override CAMPAIGN_MANAGER_ROLE = keccak256("CAMPAIGN_MANAGER_ROLE");
+
+    constructor(address _mfd, address _owner) {
+        require(_mfd != address(0) && _owner != address(0), "ZAD");
+        _setupRole(DEFAULT_ADMIN_ROLE, _owner);
+        mfd = _mfd;
+    }
+
+    /// @dev Reverts if called by any account other than the default admin.
+    function _onlyAdmin() private view {
+        require(hasRole(DEFAULT_ADMIN_ROLE, msg.sender), "RNA");
+    }
+
+    /// @dev Reverts if called by an account which is not allowed to create campaigns.
+    function _onlyCampaignManager() private view {
+        require(hasRole(CAMPAIGN_MANAGER_ROLE, msg.sender), "RNM");
+    }
+
+    /// @notice Creates a campaign paying `amount` of `rewardToken` to the leaves of `merkleRoot`
+    function createCampaign(
+        address rewardToken,
+        bytes32 merkleRoot,
+        uint256 amount,
+        uint256 deadline
+    ) external override nonReentrant returns (uint256 campaignId) {
+        _onlyCampaignManager();
+        require(rewardToken != address(0), "ZAD");
+        require(amount > 0, "ZAM");
+        require(merkleRoot != bytes32(0) && deadline > block.timestamp && deadline <= type(uint40).max, "ICM");
+
+        // credit what arrived, so fee-on-transfer tokens cannot leave the campaign short
+        uint256 balanceBefore = IERC20(rewardToken).balanceOf(address(this));
+        IERC20(rewardToken).safeTransferFrom(msg.sender, address(this), amount);
+        uint256 received = IERC20(rewardToken).balanceOf(address(this)) - balanceBefore;
+
+        campaignId = _campaigns.length;
+        _campaigns.push(Campaign({
+            rewardToken: rewardToken,
+            deadline: uint40(deadline),
+            merkleRoot: merkleRoot,
+            remaining: received
+        }));
+
+        emit CampaignCreated(campaignId, rewardToken, merkleRoot, received, deadline);
+    }
+
+    /// @notice Checks if the leaf at an index of a campaign was claimed
+    function isClaimed(uint256 campaignId, uint256 index) public view override returns (bool) {
+        uint256 word = _claimedBitMap[campaignId][index / 256];
+        uint256 mask = 1 << (index % 256);
+        return word & mask == mask;
+    }
+
+    /// @notice Pays the entitlement of a leaf to its account, anyone can claim on behalf of the account
+    function claim(
+        uint256 campaignId,
+        uint256 index,
+        address account,
+        uint256 amount,
+        bytes32[] calldata merkleProof
+    ) external override nonReentrant {
+        require(campaignId < _campaigns.length, "ICM");
+        Campaign storage campaign = _campaigns[campaignId];
+
+        uint256 wordIndex = index / 256;
+        uint256 mask = 1 << (index % 256);
+        uint256 word = _claimedBitMap[campaignId][wordIndex];
+        require(word & mask == 0, "ACL");
+
+        // leaves are 84 bytes, so no inner node of 64 bytes can pass as one
+        bytes32 leaf = keccak256(abi.encodePacked(index, account, amount));
+        require(MerkleProof.verifyCalldata(merkleProof, campaign.merkleRoot, leaf), "IPF");
+
+        _claimedBitMap[campaignId][wordIndex] = word | mask;
+        // reverts once the campaign was withdrawn, or if the tree pays out more than was funded
+        campaign.remaining -= amount;
+        IERC20(campaign.rewardToken).safeTransfer(account, amount);
+
+        emit Claimed(campaignId, index, account, amount);
+    }
+
+    /// @notice Returns the parameters of a campaign
+    function getCampaign(uint256 campaignId) external view override returns (address rewardToken, bytes32 merkleRoot,
+            uint256 deadline, uint256 remainingAmount) {
+        require(campaignId < _campaigns.length, "ICM");
+        Campaign storage campaign = _campaigns[campaignId];
+        rewardToken = campaign.rewardToken;
+        merkleRoot = campaign.merkleRoot;
+        deadline = campaign.deadline;
+        remainingAmount = campaign.remaining;
+    }
+
+    /// @notice Returns the number of campaigns
+    function campaignsLength() external view override returns (uint256) {
+        return _campaigns.length;
+    }
+
+    /// @notice Withdraws the unclaimed rewards of a campaign after its deadline
+    function withdrawUnclaimed(uint256 campaignId, address recipient) external override nonReentrant {
+        _onlyCampaignManager();
+        require(recipient != address(0), "ZAD");
+        require(campaignId < _campaigns.length, "ICM");
+        Campaign storage campaign = _campaigns[campaignId];
+        require(block.timestamp > campaign.deadline, "CNE");
+
+        uint256 amount = campaign.remaining;
+        require(amount > 0, "ZBL");
+        campaign.remaining = 0;
+        IERC20(campaign.rewardToken).safeTransfer(recipient, amount);
+
+        emit UnclaimedWithdrawn(campaignId, recipient, amount);
+    }
+
+    /// @notice Checks if the caller has the campaign manager role
+    function isCampaignManager(address user) public view override returns (bool) {
+        return hasRole(CAMPAIGN_MANAGER_ROLE, user);
+    }
+
+    /// @notice grants campaign manager role
+    function grantCampaignManagerRole(address account) external override {
+        _onlyAdmin();
+        grantRole(CAMPAIGN_MANAGER_ROLE, account);
+    }
+
+}
@@ -3,7 +3,9 @@ pragma solidity =0.8.12;
 
 import {IERC20} from "@openzeppelin/contracts/token/ERC20/IERC20.sol";
 import {IERC20Metadata} from "@openzeppelin/contracts/token/ERC20/extensions/IERC20Metadata.sol";
+import {IERC20Permit} from "@openzeppelin/contracts/token/ERC20/extensions/IERC20Permit.sol";
 import {SafeERC20} from "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+import {SafeCast} from "@openzeppelin/contracts/utils/math/SafeCast.sol";
 
 import { Ownable } from "@openzeppelin/contracts/access/Ownable.sol";
 import { Pausable } from "@openzeppelin/contracts/security/Pausable.sol";
@@ -11,31 +13,43 @@ import { Pausable } from "@openzeppelin/contracts/security/Pausable.sol";
 import {IICHIVault} from "interfaces/IICHIVault.sol";
 import { IMultiFeeDistributionFactory } from "interfaces/IMultiFeeDistributionFactory.sol";
 
-/// @title Multi Fee Distribution Contract
+/// @title Multi Fee Distribution Base
 /// @author Gamma
-/// @dev All function calls are currently implemented without side effects
-contract MultiFeeDistribution is
+/// @dev Staking and reward logic shared by the CREATE2 deployed MultiFeeDistribution and its clone variant
+abstract contract MultiFeeDistributionBase is
     Pausable,
     Ownable
 {
     using SafeERC20 for IERC20;
 
+    // amount, lastTimeUpdated and retiredIndex share a slot, rewardPerToken keeps a full slot for the 1e50 precision
     struct RewardData {
-        uint256 amount;
-        uint256 lastTimeUpdated; // seems like it exists only for a null check in recoverERC20? i.e. if active reward don't allow owner to recover the reward token
+        uint192 amount;
+        uint40 lastTimeUpdated; // used by recoverERC20 and RewardCampaignDistributor to detect an active reward
+        uint24 retiredIndex; // position in retiredRewardTokens + 1, zero while the reward is active
         uint256 rewardPerToken;
     }
 
+    // tokenAmount, lastTimeUpdated and retiredRewardsSettled share a slot
     struct UserData {
-        uint256 tokenAmount;
-        uint256 lastTimeUpdated; // TODO: is this even really needed??
-        uint256 tokenClaimable; // TODO: is this even used??
+        uint192 tokenAmount;
+        uint40 lastTimeUpdated;
+        uint24 retiredRewardsSettled; // number of retiredRewardTokens already settled against tokenAmount
         mapping(address => uint256) rewardPerToken;
     }
+
+    // rewardRate, periodFinish and lastUpdateTime share a slot
+    struct RewardStream {
+        uint128 rewardRate; // tokens streamed per second
+        uint40 periodFinish;
+        uint40 lastUpdateTime;
+        uint256 reserve; // funded tokens not streamed yet, counted in RewardData.amount
+    }
+
     /********************** Contract Addresses ***********************/
 
-    /// @notice Address of LP token
-    address public immutable stakingToken;
+    /// @notice Address of LP token, kept by each deployment variant
+    function _stakingToken() internal view virtual returns (address);
 
     /********************** Lock & Earn Info ***********************/
 
@@ -47,10 +61,40 @@ contract MultiFeeDistribution is
     /// @notice Reward tokens being distributed
     address[] public rewardTokens;
 
+    /// @notice rewardToken => position in rewardTokens + 1, zero if the token is not an active reward
+    mapping(address => uint256) public rewardTokenIndex;
+
+    /// @notice Reward tokens no longer distributed, whose residual balances can still be claimed via getReward
+    address[] public retiredRewardTokens;
+
+    /// @notice Maximum value of collectionInterval
+    uint256 public constant MAX_COLLECTION_INTERVAL = 7 days;
+
+    // lastCollectionBlock, lastCollectionTime, collectionInterval and activeRewardStreams share a slot
+
+    /// @notice Block in which the vault was last collected and the reward accumulators last updated
+    uint64 public lastCollectionBlock;
+
+    /// @notice Timestamp at which the vault was last collected and the reward accumulators last updated
+    uint40 public lastCollectionTime;
+
+    /// @notice Minimum number of seconds between two collections on claim, stakes and unstakes collect once per block
+    uint40 public collectionInterval;
+
+    /// @notice Number of reward streams with a reserve left, zero skips the stream accrual entirely
+    uint32 public activeRewardStreams;
+
+    /// @notice rewardToken => rate based emission funded through fundRewardStream
+    mapping(address => RewardStream) public rewardStreams;
+
     /// @notice address => RPT
+    /// @dev Returns (uint192 amount, uint40 lastTimeUpdated, uint24 retiredIndex, uint256 rewardPerToken),
+    /// four words where earlier versions returned three, callers decoding (amount, lastTimeUpdated, rewardPerToken) must be updated
     mapping(address => RewardData) public rewardData;
 
     /// @notice address => RPT
+    /// @dev Returns (uint192 tokenAmount, uint40 lastTimeUpdated, uint24 retiredRewardsSettled),
+    /// the third word held the unused tokenClaimable in earlier versions
     mapping(address => UserData) public userData;
 
     /// @notice rewardToken => user => claimable amount
@@ -76,23 +120,37 @@ contract MultiFeeDistribution is
         uint256 reward
     );
     event Recovered(address indexed token, uint256 amount);
+    event RewardAdded(address indexed rewardToken);
+    event RewardRetired(address indexed rewardToken);
+    event RewardUpdated(
+        address indexed rewardToken,
+        uint256 rewardPerToken,
+        uint256 amount
+    );
+    event UserRewardUpdated(
+        address indexed user,
+        address indexed rewardToken,
+        uint256 rewardPerToken,
+        uint256 claimable
+    );
+    event CollectionIntervalUpdated(uint256 collectionInterval);
+    event RewardsCollected(address indexed caller);
+    event RewardStreamUpdated(
+        address indexed rewardToken,
+        uint256 reserve,
+        uint256 rewardRate,
+        uint256 periodFinish
+    );
 
     /********************** Errors ***********************/
     error AddressZero();
     error InvalidBurn();
     error InsufficientPermission();
     error ActiveReward();
+    error InactiveReward();
     error IsStakingToken();
     error InvalidAmount();
-
-    constructor() {
-        IMultiFeeDistributionFactory factory = IMultiFeeDistributionFactory(msg.sender);
-        bytes memory _deployData = factory.cachedDeployData();
-        (address _stakingToken) = abi.decode(_deployData, (address));
-
-        if (_stakingToken == address(0)) revert AddressZero();
-        stakingToken = _stakingToken;
-    }
+    error InvalidInterval();
 
     /********************** Setters ***********************/
 
@@ -120,17 +178,113 @@ contract MultiFeeDistribution is
         }
     }
 
+    /**
+     * @notice Set the minimum time between two vault collections.
+     * @dev Between collections, claims pay against the accumulators of the last collection, trading
+     *      reward freshness for cheaper claims. Stakes and unstakes collect once per block
+     *      and updateReward always collects.
+     * @param _collectionInterval in seconds, zero to collect at most once per block on claim
+     */
+    function setCollectionInterval(uint256 _collectionInterval) external onlyOwner {
+        if (_collectionInterval > MAX_COLLECTION_INTERVAL) revert InvalidInterval();
+        collectionInterval = uint40(_collectionInterval);
+        emit CollectionIntervalUpdated(_collectionInterval);
+    }
+
     /**
      * @notice Add a new reward token to be distributed to stakers.
      * @param _rewardToken address
      */
     function addReward(address _rewardToken) external {
-        if (_rewardToken == address(0)) revert InvalidBurn();
         if (!managers[msg.sender]) revert InsufficientPermission();
-        for (uint i; i < rewardTokens.length; i ++) {
-            if (rewardTokens[i] == _rewardToken) revert ActiveReward();
+        _addReward(_rewardToken);
+    }
+
+    /**
+     * @notice Add several new rewards in one transaction, reverting if any of them is active or retired.
+     * @dev Duplicates, also within _rewardTokens, are found through rewardTokenIndex without scanning rewardTokens.
+     * @param _rewardTokens addresses of the reward tokens
+     */
+    function addRewards(address[] calldata _rewardTokens) external {
+        if (!managers[msg.sender]) revert InsufficientPermission();
+        uint256 length = _rewardTokens.length;
+        for (uint256 i; i < length; i ++) {
+            _addReward(_rewardTokens[i]);
+        }
+    }
+
+    /**
+     * @notice Stop distributing a drained reward token so that it no longer costs gas on every stake, unstake and claim.
+     * @dev The accumulator is updated one last time and frozen. Stakers keep their residual balance,
+     *      which is settled on their next stake/unstake or claimed by passing the token to getReward.
+     *      Tokens arriving after retirement are not distributed, the owner can recover them with recoverERC20.
+     *      A retired token cannot be added again.
+     * @param _rewardToken address
+     */
+    function retireReward(address _rewardToken) external {
+        if (!managers[msg.sender]) revert InsufficientPermission();
+        uint256 index = rewardTokenIndex[_rewardToken];
+        if (index == 0) revert InactiveReward();
+
+        // the accumulator is frozen below, so it must include anything that arrived in this block
+        _forceUpdateReward();
+        if (rewardStreams[_rewardToken].reserve != 0) revert ActiveReward();
+
+        // swap and pop to keep rewardTokens compact
+        uint256 length = rewardTokens.length;
+        if (index != length) {
+            address lastToken = rewardTokens[length - 1];
+            rewardTokens[index - 1] = lastToken;
+            rewardTokenIndex[lastToken] = index;
         }
-        rewardTokens.push(_rewardToken);
+        rewardTokens.pop();
+        delete rewardTokenIndex[_rewardToken];
+
+        retiredRewardTokens.push(_rewardToken);
+        rewardData[_rewardToken].retiredIndex = SafeCast.toUint24(retiredRewardTokens.length);
+
+        emit RewardRetired(_rewardToken);
+    }
+
+    /**
+     * @notice Stream an amount of a reward token to stakers at a constant rate over a duration, without keeper transactions.
+     * @dev Accrual is computed from block.timestamp on every update, and claimableRewards includes it.
+     *      Whatever is left of a running stream is added to the amount and spread over the new duration.
+     *      Like any other reward, what is streamed while nothing is staked goes to the next stakers.
+     * @param _rewardToken active reward token
+     * @param amount pulled from the caller, the stream gets what this contract receives of it
+     * @param duration of the stream, in seconds
+     */
+    function fundRewardStream(address _rewardToken, uint256 amount, uint256 duration) external {
+        if (!managers[msg.sender]) revert InsufficientPermission();
+        if (rewardTokenIndex[_rewardToken] == 0) revert InactiveReward();
+        if (amount == 0 || duration == 0) revert InvalidAmount();
+
+        // settle what the current stream owes so far, before its rate changes
+        uint256 _totalStakes = totalStakes;
+        if (_totalStakes != 0) _updateRewardToken(_rewardToken, _totalStakes);
+
+        // only what arrived is credited, tokens charging a fee on transfer deliver less than amount
+        uint256 balanceBefore = IERC20(_rewardToken).balanceOf(address(this));
+        IERC20(_rewardToken).safeTransferFrom(msg.sender, address(this), amount);
+        amount = IERC20(_rewardToken).balanceOf(address(this)) - balanceBefore;
+        if (amount == 0) revert InvalidAmount();
+        RewardData storage r = rewardData[_rewardToken];
+        r.amount += SafeCast.toUint192(amount);
+
+        RewardStream storage stream = rewardStreams[_rewardToken];
+        uint256 reserve = stream.reserve;
+        if (reserve == 0) activeRewardStreams += 1;
+        reserve += amount;
+        uint256 rewardRate = reserve / duration;
+        uint256 periodFinish = block.timestamp + duration;
+
+        stream.reserve = reserve;
+        stream.rewardRate = SafeCast.toUint128(rewardRate);
+        stream.periodFinish = SafeCast.toUint40(periodFinish);
+        stream.lastUpdateTime = uint40(block.timestamp);
+
+        emit RewardStreamUpdated(_rewardToken, reserve, rewardRate, periodFinish);
     }
 
     /********************** View functions ***********************/
@@ -144,8 +298,12 @@ contract MultiFeeDistribution is
         address tokenAddress,
         uint256 tokenAmount
     ) external onlyOwner {
-        if (tokenAddress == stakingToken) revert IsStakingToken();
-        if (rewardData[tokenAddress].lastTimeUpdated > 0) revert ActiveReward();
+        if (tokenAddress == _stakingToken()) revert IsStakingToken();
+        RewardData storage r = rewardData[tokenAddress];
+        if (r.retiredIndex != 0) {
+            // a retired reward credits nothing that arrives later, only what stakers are still owed must stay
+            if (tokenAmount > IERC20(tokenAddress).balanceOf(address(this)) - r.amount) revert ActiveReward();
+        } else if (r.lastTimeUpdated > 0) revert ActiveReward();
         IERC20(tokenAddress).safeTransfer(owner(), tokenAmount);
         emit Recovered(tokenAddress, tokenAmount);
     }
@@ -166,6 +324,27 @@ contract MultiFeeDistribution is
         return userData[user].rewardPerToken[rewardToken];
     }
 
+    /// @notice getUserRewardPerToken for many users and reward tokens in one call, indexed [user][rewardToken]
+    function getUserRewardPerTokenForMany(
+        address[] calldata users,
+        address[] calldata _rewardTokens
+    ) external view returns (uint256[][] memory rewardPerTokens) {
+        rewardPerTokens = new uint256[][](users.length);
+        for (uint256 i; i < users.length; i ++) {
+            UserData storage userInfo = userData[users[i]];
+            uint256[] memory values = new uint256[](_rewardTokens.length);
+            for (uint256 j; j < _rewardTokens.length; j ++) {
+                values[j] = userInfo.rewardPerToken[_rewardTokens[j]];
+            }
+            rewardPerTokens[i] = values;
+        }
+    }
+
+    /// @notice Number of retired reward tokens
+    function retiredRewardTokensLength() external view returns (uint256) {
+        return retiredRewardTokens.length;
+    }
+
     /********************** Reward functions ***********************/
 
     /**
@@ -191,6 +370,58 @@ contract MultiFeeDistribution is
         return (rewardTokens, rewardAmounts);
     }
 
+    /**
+     * @notice Claimable amount of the given reward tokens for many accounts in one call.
+     * @param accounts for rewards
+     * @param _rewardTokens array of reward tokens, all active reward tokens if empty
+     * @return tokens the reward tokens the amounts refer to
+     * @return rewardAmounts claimable amount per account, per reward token
+     */
+    function claimableRewardsForMany(
+        address[] calldata accounts,
+        address[] calldata _rewardTokens
+    )
+        external
+        view
+        returns (address[] memory tokens, uint256[][] memory rewardAmounts)
+    {
+        if (_rewardTokens.length > 0) {
+            tokens = _rewardTokens;
+        } else {
+            tokens = rewardTokens;
+        }
+        uint256 tokensLength = tokens.length;
+        rewardAmounts = new uint256[][](accounts.length);
+        for (uint256 i; i < accounts.length; i ++) {
+            uint256[] memory amounts = new uint256[](tokensLength);
+            for (uint256 j; j < tokensLength; j ++) {
+                amounts[j] = claimable[tokens[j]][accounts[i]] + _earned(accounts[i], tokens[j]) / 1e50;
+            }
+            rewardAmounts[i] = amounts;
+        }
+    }
+
+    /**
+     * @notice Address and residual claimable amount of all retired reward tokens for the given account.
+     * @param account for rewards
+     */
+    function claimableRetiredRewards(
+        address account
+    )
+        external
+        view
+        returns (address[] memory, uint256[] memory)
+    {
+        uint256[] memory rewardAmounts = new uint256[](retiredRewardTokens.length);
+        for (uint256 i; i < retiredRewardTokens.length; i ++) {
+            rewardAmounts[i] = claimable[retiredRewardTokens[i]][account] + _earned(
+                account,
+                retiredRewardTokens[i]
+            ) / 1e50;
+        }
+        return (retiredRewardTokens, rewardAmounts);
+    }
+
     /********************** Operate functions ***********************/
 
     /**
@@ -203,12 +434,49 @@ contract MultiFeeDistribution is
         uint256 amount,
         address onBehalfOf
     ) external {
+        _updateRewardOncePerBlock();
+        _stake(amount, onBehalfOf);
+    }
+
+    /**
+     * @notice Stake tokens using an EIP-2612 permit instead of a prior approve.
+     * @dev A failing permit is ignored, e.g. when the staking token doesn't support permits
+     *      or the permit was already submitted by someone else, so the stake falls back to the existing allowance.
+     * @param amount to stake.
+     * @param onBehalfOf address for staking.
+     * @param deadline of the permit signature.
+     * @param v of the permit signature.
+     * @param r of the permit signature.
+     * @param s of the permit signature.
+     */
+    function stakeWithPermit(
+        uint256 amount,
+        address onBehalfOf,
+        uint256 deadline,
+        uint8 v,
+        bytes32 r,
+        bytes32 s
+    ) external {
+        try IERC20Permit(_stakingToken()).permit(msg.sender, address(this), amount, deadline, v, r, s) {} catch {}
+        _updateRewardOncePerBlock();
         _stake(amount, onBehalfOf);
     }
 
+    /**
+     * @notice Stake tokens and claim all pending staking rewards in a single call.
+     * @param amount to stake.
+     */
+    function stakeAndClaim(
+        uint256 amount
+    ) external returns (uint256[] memory claimableAmounts) {
+        _updateRewardOncePerBlock();
+        _stake(amount, msg.sender);
+        claimableAmounts = _payRewards(msg.sender, rewardTokens);
+    }
+
     /**
      * @notice Stake tokens to receive rewards.
-     * @dev Locked tokens cannot be withdrawn for defaultLockDuration and are eligible to receive rewards.
+     * @dev expects _updateRewardOncePerBlock to have been called earlier in the same transaction
      * @param amount to stake.
      * @param onBehalfOf address for staking.
      */
@@ -217,39 +485,57 @@ contract MultiFeeDistribution is
         address onBehalfOf
     ) internal whenNotPaused {
         if (amount == 0) revert InvalidAmount();
-        _updateReward();
-
-        for (uint i; i < rewardTokens.length; i ++) {
-            _calculateClaimable(onBehalfOf, rewardTokens[i]);
-        }
+        _settleRewards(onBehalfOf);
 
-        IERC20(stakingToken).safeTransferFrom(
+        IERC20(_stakingToken()).safeTransferFrom(
             msg.sender,
             address(this),
             amount
         );
         UserData storage userInfo = userData[onBehalfOf];
-        userInfo.tokenAmount += amount;
+        userInfo.tokenAmount += SafeCast.toUint192(amount);
         totalStakes += amount;
 
         emit Stake(onBehalfOf, amount);
     }
 
     function unstake(uint256 amount) external {
+        _updateRewardOncePerBlock();
+        _unstake(amount, msg.sender);
+    }
+
+    /**
+     * @notice Unstake tokens and claim the given rewards in a single call.
+     * @param amount to unstake.
+     * @param _rewardTokens array of reward tokens
+     */
+    function unstakeAndClaim(
+        uint256 amount,
+        address[] memory _rewardTokens
+    ) external whenNotPaused returns (uint256[] memory claimableAmounts) {
+        _updateRewardOncePerBlock();
         _unstake(amount, msg.sender);
+        claimableAmounts = _payRewards(msg.sender, _rewardTokens);
     }
 
+    /**
+     * @notice Unstake the full balance and claim all pending staking rewards in a single call.
+     */
+    function exit() external whenNotPaused returns (uint256[] memory claimableAmounts) {
+        _updateRewardOncePerBlock();
+        _unstake(userData[msg.sender].tokenAmount, msg.sender);
+        claimableAmounts = _payRewards(msg.sender, rewardTokens);
+    }
+
+    /// @dev expects _updateRewardOncePerBlock to have been called earlier in the same transaction
     function _unstake(uint256 amount, address onBehalfOf) internal {
         UserData storage userInfo = userData[onBehalfOf];
         if (userInfo.tokenAmount < amount || amount == 0)
             revert InvalidAmount();
-        _updateReward();
-        for (uint i; i < rewardTokens.length; i ++) {
-            _calculateClaimable(onBehalfOf, rewardTokens[i]);
-        }
-        IERC20(stakingToken).safeTransfer(onBehalfOf, amount);
+        _settleRewards(onBehalfOf);
+        IERC20(_stakingToken()).safeTransfer(onBehalfOf, amount);
 
-        userInfo.tokenAmount -= amount;
+        userInfo.tokenAmount -= SafeCast.toUint192(amount);
         totalStakes -= amount;
 
         emit Unstake(onBehalfOf, amount);
@@ -270,8 +556,45 @@ contract MultiFeeDistribution is
         claimableAmounts = _getReward(msg.sender, rewardTokens);
     }
 
-    function updateReward() external {
+    /**
+     * @notice Claim pending staking rewards for many users at once.
+     * @dev The vault is collected and the accumulators are updated once for the whole batch.
+     * @param _users array of users to claim for
+     * @param _rewardTokens array of reward tokens
+     * @return claimableAmounts amount paid per user, per reward token
+     */
+    function getRewardForMany(
+        address[] calldata _users,
+        address[] memory _rewardTokens
+    ) external whenNotPaused returns (uint256[][] memory claimableAmounts) {
         _updateReward();
+
+        uint256 length = _users.length;
+        claimableAmounts = new uint256[][](length);
+        for (uint256 i; i < length; i ++) {
+            claimableAmounts[i] = _payRewards(_users[i], _rewardTokens);
+        }
+    }
+
+    /**
+     * @notice Collect the vault and update the reward accumulators, regardless of the collection interval.
+     */
+    function updateReward() external {
+        _forceUpdateReward();
+        emit RewardsCollected(msg.sender);
+    }
+
+    /**
+     * @notice Credit a reward token pushed to this contract, without collecting the vault or scanning the other rewards.
+     * @dev Called by RewardCampaignDistributor after each transfer. Only the token's own balance is read,
+     *      so anyone may call it; rewards received while nothing is staked stay pending until there are stakers.
+     * @param _rewardToken active reward token
+     */
+    function notifyReward(address _rewardToken) external {
+        if (rewardTokenIndex[_rewardToken] == 0) revert InactiveReward();
+        uint256 _totalStakes = totalStakes;
+        if (_totalStakes == 0) return;
+        _updateRewardToken(_rewardToken, _totalStakes);
     }
 
     /**
@@ -284,44 +607,193 @@ contract MultiFeeDistribution is
         address _user,
         address _rewardToken
     ) internal view returns (uint256 earnings) {
-        RewardData memory rewardInfo = rewardData[_rewardToken];
+        RewardData storage rewardInfo = rewardData[_rewardToken];
         UserData storage userInfo = userData[_user];
+        if (_isRetiredRewardSettled(rewardInfo, userInfo)) return 0;
+
+        return (_rewardPerToken(_rewardToken) - userInfo.rewardPerToken[_rewardToken]) * userInfo.tokenAmount;
+    }
+
+    /**
+     * @notice Reward per token including the stream accrual since the last update.
+     */
+    function _rewardPerToken(address _rewardToken) internal view returns (uint256) {
+        uint256 rewardPerToken = rewardData[_rewardToken].rewardPerToken;
+        uint256 _totalStakes = totalStakes;
+        if (_totalStakes == 0) return rewardPerToken;
+
+        RewardStream storage stream = rewardStreams[_rewardToken];
+        uint256 reserve = stream.reserve;
+        if (reserve == 0) return rewardPerToken;
+        return rewardPerToken + _pendingStream(stream, reserve) * 1e50 / _totalStakes;
+    }
+
+    /**
+     * @notice Amount a stream has released since its last update, all of its reserve once the period is over.
+     */
+    function _pendingStream(
+        RewardStream storage stream,
+        uint256 reserve
+    ) internal view returns (uint256) {
+        if (block.timestamp >= stream.periodFinish) return reserve;
+        uint256 streamed = uint256(stream.rewardRate) * (block.timestamp - stream.lastUpdateTime);
+        return streamed < reserve ? streamed : reserve;
+    }
 
-        return (rewardInfo.rewardPerToken - userInfo.rewardPerToken[_rewardToken]) * userInfo.tokenAmount;
+    /**
+     * @notice Release the stream accrual since the last update, to be credited to the accumulator.
+     */
+    function _releaseStream(address _rewardToken) internal returns (uint256 streamed) {
+        RewardStream storage stream = rewardStreams[_rewardToken];
+        uint256 reserve = stream.reserve;
+        if (reserve == 0) return 0;
+
+        streamed = _pendingStream(stream, reserve);
+        stream.lastUpdateTime = uint40(block.timestamp);
+        if (streamed == 0) return 0;
+
+        stream.reserve = reserve - streamed;
+        if (streamed == reserve) activeRewardStreams -= 1;
     }
 
     /**
-     * @notice Update user reward info.
+     * @notice Whether a user's accrual for a retired reward has already been settled.
+     * @dev Once settled, the user's balance may have changed since retirement, so the frozen accumulator no longer applies.
+     */
+    function _isRetiredRewardSettled(
+        RewardData storage rewardInfo,
+        UserData storage userInfo
+    ) internal view returns (bool) {
+        uint256 retiredIndex = rewardInfo.retiredIndex;
+        return retiredIndex != 0 && userInfo.retiredRewardsSettled >= retiredIndex;
+    }
+
+    /**
+     * @notice Append a reward token, constant time whatever the number of rewards.
+     */
+    function _addReward(address _rewardToken) internal {
+        if (_rewardToken == address(0)) revert InvalidBurn();
+        if (rewardTokenIndex[_rewardToken] != 0 || rewardData[_rewardToken].retiredIndex != 0) revert ActiveReward();
+        rewardTokens.push(_rewardToken);
+        rewardTokenIndex[_rewardToken] = rewardTokens.length;
+        emit RewardAdded(_rewardToken);
+    }
+
+    /**
+     * @notice Update user reward info, at most once per block and once per collectionInterval.
+     * @dev Only for claims, which pay against the accumulators of the last collection and are picked
+     *      up by the next update otherwise. Stakes and unstakes go through _updateRewardOncePerBlock:
+     *      settling a balance change against accumulators older than the block would let a new staker
+     *      share the rewards accrued before they joined, by forcing an update and unstaking right after.
      */
     function _updateReward() internal {
-        IICHIVault(stakingToken).collectRewards();
-        for (uint i; i < rewardTokens.length; i ++) {
-            address rewardToken = rewardTokens[i];
-            if (totalStakes > 0) {
-                RewardData storage r = rewardData[rewardToken];
-                uint256 currentBalance = IERC20(rewardToken).balanceOf(address(this));
-                uint256 diff =  currentBalance - r.amount;
-                r.lastTimeUpdated = block.timestamp;
-                r.rewardPerToken += diff * 1e50 / totalStakes;
-                r.amount = currentBalance;
-            }
+        if (
+            lastCollectionBlock == block.number ||
+            block.timestamp < uint256(lastCollectionTime) + collectionInterval
+        ) return;
+        _forceUpdateReward();
+    }
+
+    /**
+     * @notice Update user reward info at most once per block, regardless of the collection interval.
+     * @dev For stakes and unstakes. Streams release by timestamp, so nothing is left to release in the
+     *      block of a collection. Only vault fees and pushed rewards that arrive later in that block
+     *      are left for the next collection. They are then shared by whoever is staked at that point,
+     *      as for rewards arriving between any two collections, so this bounds the exposure
+     *      to a single block. Batches of stakes in one block, e.g. from a router, collect only once.
+     */
+    function _updateRewardOncePerBlock() internal {
+        if (lastCollectionBlock == block.number) return;
+        _forceUpdateReward();
+    }
+
+    /**
+     * @notice Collect the vault and update the reward accumulators.
+     */
+    function _forceUpdateReward() internal {
+        lastCollectionBlock = uint64(block.number);
+        lastCollectionTime = uint40(block.timestamp);
+        IICHIVault(_stakingToken()).collectRewards();
+        uint256 _totalStakes = totalStakes;
+        if (_totalStakes == 0) return;
+
+        uint256 length = rewardTokens.length;
+        for (uint i; i < length; i ++) {
+            _updateRewardToken(rewardTokens[i], _totalStakes);
+        }
+    }
+
+    /**
+     * @notice Credit the balance of a reward token received since its last update to its accumulator.
+     */
+    function _updateRewardToken(address _rewardToken, uint256 _totalStakes) internal {
+        RewardData storage r = rewardData[_rewardToken];
+        uint256 currentBalance = IERC20(_rewardToken).balanceOf(address(this));
+        // streamed tokens are already counted in amount, so they add to the balance difference
+        uint256 diff =  currentBalance - r.amount;
+        if (activeRewardStreams != 0) diff += _releaseStream(_rewardToken);
+        if (diff > 0) {
+            uint256 rewardPerToken = r.rewardPerToken + diff * 1e50 / _totalStakes;
+            r.rewardPerToken = rewardPerToken;
+            r.amount = SafeCast.toUint192(currentBalance);
+            emit RewardUpdated(_rewardToken, rewardPerToken, currentBalance);
         }
+        r.lastTimeUpdated = uint40(block.timestamp);
     }
 
     function _calculateClaimable(address _onBehalf, address _rewardToken) internal {
         UserData storage userInfo = userData[_onBehalf];
-        RewardData memory r = rewardData[_rewardToken];
+        RewardData storage r = rewardData[_rewardToken];
+        if (_isRetiredRewardSettled(r, userInfo)) return;
+        uint256 rewardPerToken = r.rewardPerToken;
+        uint256 userRewardPerToken = userInfo.rewardPerToken[_rewardToken];
+
+        // nothing to settle if the user is already up to date with the accumulator
+        if (rewardPerToken != userRewardPerToken) {
+            uint256 userClaimable = claimable[_rewardToken][_onBehalf];
+            if (userInfo.lastTimeUpdated > 0 && userInfo.tokenAmount > 0) {
+                userClaimable += (rewardPerToken - userRewardPerToken) * userInfo.tokenAmount / 1e50;
+                claimable[_rewardToken][_onBehalf] = userClaimable;
+            }
 
-        if (userInfo.lastTimeUpdated > 0 && userInfo.tokenAmount > 0) {
-            claimable[_rewardToken][_onBehalf] += (r.rewardPerToken - userInfo.rewardPerToken[_rewardToken]) * userInfo.tokenAmount / 1e50;
+            userInfo.rewardPerToken[_rewardToken] = rewardPerToken;
+            emit UserRewardUpdated(_onBehalf, _rewardToken, rewardPerToken, userClaimable);
         }
+        userInfo.lastTimeUpdated = uint40(block.timestamp);
+    }
+
+    /**
+     * @notice Settle all rewards of a user against the current accumulators, before their balance changes.
+     */
+    function _settleRewards(address _onBehalf) internal {
+        uint256 length = rewardTokens.length;
+        for (uint256 i; i < length; i ++) {
+            _calculateClaimable(_onBehalf, rewardTokens[i]);
+        }
+        _settleRetiredRewards(_onBehalf);
+    }
+
+    /**
+     * @notice Settle rewards retired since the user's last balance change, before the balance changes again.
+     * @dev Each retired reward is settled at most once per user.
+     */
+    function _settleRetiredRewards(address _onBehalf) internal {
+        UserData storage userInfo = userData[_onBehalf];
+        uint256 settled = userInfo.retiredRewardsSettled;
+        uint256 length = retiredRewardTokens.length;
+        if (settled == length) return;
 
-        userInfo.rewardPerToken[_rewardToken] = r.rewardPerToken;
-        userInfo.lastTimeUpdated = block.timestamp;
+        if (userInfo.tokenAmount > 0) {
+            for (uint256 i = settled; i < length; i ++) {
+                _calculateClaimable(_onBehalf, retiredRewardTokens[i]);
+            }
+        }
+        userInfo.retiredRewardsSettled = uint24(length);
     }
 
     /**
      * @notice User gets reward
+     * @dev the vault is collected and the accumulators are updated once, regardless of how many tokens are claimed
      * @param _user address
      * @param _rewardTokens array of reward tokens
      */
@@ -329,22 +801,35 @@ contract MultiFeeDistribution is
         address _user,
         address[] memory _rewardTokens
     ) internal whenNotPaused returns (uint256[] memory claimableAmounts) {
+        _updateReward();
+        claimableAmounts = _payRewards(_user, _rewardTokens);
+    }
 
-        claimableAmounts = new uint256[](_rewardTokens.length);
+    /**
+     * @notice Settle and transfer the given rewards to a user against the current accumulators
+     * @dev expects _updateReward to have been called earlier in the same transaction
+     * @param _user address
+     * @param _rewardTokens array of reward tokens
+     */
+    function _payRewards(
+        address _user,
+        address[] memory _rewardTokens
+    ) internal returns (uint256[] memory claimableAmounts) {
+        uint256 length = _rewardTokens.length;
+        claimableAmounts = new uint256[](length);
 
-        for (uint256 i; i < _rewardTokens.length; i++) {
+        for (uint256 i; i < length; i++) {
             address token = _rewardTokens[i];
-            RewardData storage r = rewardData[token];
-            _updateReward();
             _calculateClaimable(_user, token);
-            if (claimable[token][_user] > 0) {
+            uint256 reward = claimable[token][_user];
+            if (reward > 0) {
                 // we store the claimableAmount for this current rewardToken
-                claimableAmounts[i] = claimable[token][_user];
+                claimableAmounts[i] = reward;
 
-                IERC20(token).safeTransfer(_user, claimable[token][_user]);
-                r.amount -= claimable[token][_user];
-                emit RewardPaid(_user, token, claimable[token][_user]);
                 claimable[token][_user] = 0;
+                rewardData[token].amount -= SafeCast.toUint192(reward);
+                IERC20(token).safeTransfer(_user, reward);
+                emit RewardPaid(_user, token, reward);
             }
         }
     }
@@ -364,4 +849,25 @@ contract MultiFeeDistribution is
     function unpause() public onlyOwner {
         _unpause();
     }
-}
\ No newline at end of file
+}
+
+/// @title Multi Fee Distribution Contract
+/// @author Gamma
+/// @dev Deployed by MultiFeeDistributionFactory through CREATE2, reading its staking token from the factory
+contract MultiFeeDistribution is MultiFeeDistributionBase {
+    /// @notice Address of LP token
+    address public immutable stakingToken;
+
+    constructor() {
+        IMultiFeeDistributionFactory factory = IMultiFeeDistributionFactory(msg.sender);
+        bytes memory _deployData = factory.cachedDeployData();
+        (address _stakingTokenAddress) = abi.decode(_deployData, (address));
+
+        if (_stakingTokenAddress == address(0)) revert AddressZero();
+        stakingToken = _stakingTokenAddress;
+    }
+
+    function _stakingToken() internal view override returns (address) {
+        return stakingToken;
+    }
+}
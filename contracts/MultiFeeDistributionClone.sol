@@ -0,0 +1,34 @@
+// SPDX-License-Identifier: MIT
+pragma solidity =0.8.12;
+
+import { Initializable } from "@openzeppelin/contracts/proxy/utils/Initializable.sol";
+import { MultiFeeDistributionBase } from "./MultiFeeDistribution.sol";
+
+/// @title Multi Fee Distribution Clone
+/// @author Gamma
+/// @dev Implementation behind the minimal proxies deployed by MultiFeeDistributionFactory.deployStakerClone.
+///      The staking token is a storage variable set once by initialize, so a clone costs a cold
+///      storage read per transaction that the CREATE2 deployed MultiFeeDistribution keeps in its bytecode.
+contract MultiFeeDistributionClone is MultiFeeDistributionBase, Initializable {
+    /// @notice Address of LP token
+    address public stakingToken;
+
+    constructor() {
+        _disableInitializers();
+    }
+
+    /**
+     * @notice Set the staking token and owner of a clone, called by the factory in the deploying transaction.
+     * @param _stakingTokenAddress staked ICHI vault
+     * @param _owner owner of the staker
+     */
+    function initialize(address _stakingTokenAddress, address _owner) external initializer {
+        if (_stakingTokenAddress == address(0) || _owner == address(0)) revert AddressZero();
+        stakingToken = _stakingTokenAddress;
+        _transferOwnership(_owner);
+    }
+
+    function _stakingToken() internal view override returns (address) {
+        return stakingToken;
+    }
+}
@@ -2,12 +2,17 @@
 pragma solidity =0.8.12;
 
 import { MultiFeeDistribution } from "./MultiFeeDistribution.sol";
+import { MultiFeeDistributionClone } from "./MultiFeeDistributionClone.sol";
 import { IMultiFeeDistributionFactory } from "interfaces/IMultiFeeDistributionFactory.sol";
 import { IOwnable } from "interfaces/IOwnable.sol";
 import { IICHIVault } from "interfaces/IICHIVault.sol";
 import { Ownable } from "@openzeppelin/contracts/access/Ownable.sol";
+import { Create2 } from "@openzeppelin/contracts/utils/Create2.sol";
+import { Clones } from "@openzeppelin/contracts/proxy/Clones.sol";
 
 contract MultiFeeDistributionFactory is IMultiFeeDistributionFactory, Ownable {
+    using Clones for address;
+
     bytes32 public override constant bytecodeHash =
         keccak256(type(MultiFeeDistribution).creationCode);
 
@@ -18,17 +23,57 @@ contract MultiFeeDistributionFactory is IMultiFeeDistributionFactory, Ownable {
 
     address public immutable ichiFactory;
 
-    constructor(address _ichiFactory) {
+    // MultiFeeDistributionClone implementation behind the stakers deployed by deployStakerClone
+    address public immutable override stakerImplementation;
+
+    constructor(address _ichiFactory, address _stakerImplementation) {
+        require(_stakerImplementation != address(0), "ZAD");
         ichiFactory = _ichiFactory;
+        stakerImplementation = _stakerImplementation;
     }
 
     function deployStaker(address ichiVault) external override returns (address staker) {
+        staker = _deployStaker(ichiVault);
+    }
+
+    function deployStakers(address[] calldata ichiVaults) external override returns (address[] memory stakers) {
+        uint256 length = ichiVaults.length;
+        stakers = new address[](length);
+        for (uint256 i; i < length; i++) {
+            stakers[i] = _deployStaker(ichiVaults[i]);
+        }
+    }
+
+    function predictStakerAddress(address ichiVault) external view override returns (address) {
+        return Create2.computeAddress(keccak256(abi.encode(ichiVault)), bytecodeHash);
+    }
+
+    /// @notice Deploy the staker of a vault as a minimal proxy of stakerImplementation, at an address derived from the vault
+    function deployStakerClone(address ichiVault) external override returns (address staker) {
+        _checkVault(ichiVault);
+
+        staker = stakerImplementation.cloneDeterministic(keccak256(abi.encode(ichiVault)));
+        MultiFeeDistributionClone(staker).initialize(ichiVault, owner());
 
+        vaultToStaker[ichiVault] = staker;
+
+        emit StakerCreated(msg.sender, staker);
+    }
+
+    function predictStakerCloneAddress(address ichiVault) external view override returns (address) {
+        return stakerImplementation.predictDeterministicAddress(keccak256(abi.encode(ichiVault)));
+    }
+
+    function _checkVault(address ichiVault) internal view {
         require(vaultToStaker[ichiVault] == address(0), "ALREADY_DEPLOYED");
 
         // NOTE: this doesn't ensure tight coupling, and serves more of a sanity check
         // it's not easily possible to check if an ichiVault is registered with v1 of the ICHIVaultFactory
         require(IICHIVault(ichiVault).ichiVaultFactory() == ichiFactory, "INVALID_VF");
+    }
+
+    function _deployStaker(address ichiVault) internal returns (address staker) {
+        _checkVault(ichiVault);
 
         bytes memory _deployData = abi.encode(ichiVault);
         cachedDeployData = _deployData;
@@ -0,0 +1,240 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+import { IERC20 } from "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import { SafeERC20 } from "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+import { ReentrancyGuard } from "@openzeppelin/contracts/security/ReentrancyGuard.sol";
+import { AccessControl } from "@openzeppelin/contracts/access/AccessControl.sol";
+import { Initializable } from "@openzeppelin/contracts/proxy/utils/Initializable.sol";
+import { MultiFeeDistribution } from "./MultiFeeDistribution.sol";
+import "../interfaces/IMultiTokenCampaignDistributor.sol";
+
+/// @title MultiTokenCampaignDistributor
+/// @notice Runs an independent campaign for each of several reward tokens of one MFD,
+///         and distributes the due share of every token in a single call
+///
+/// Error Codes:
+///     ICM - Invalid campaign
+///     IAL - Insufficient allowance
+///     NAC - No active campaign
+///     RNA - Roles: not an admin
+///     RNM - Roles: not a campaign manager
+///     RND - Roles: not a distributor
+///     ZAD - Zero address
+///     ZBL - Zero balance
+
+contract MultiTokenCampaignDistributor is IMultiTokenCampaignDistributor, ReentrancyGuard, AccessControl, Initializable {
+    using SafeERC20 for IERC20;
+
+    struct Campaign {
+        uint256 start;
+        uint256 end;
+        uint256 amount;
+        uint256 lastDistribution;
+    }
+
+    address public override mfd;
+
+    /// @notice Reward tokens that ever had a campaign, in the order of their first campaign
+    address[] public override rewardTokens;
+
+    mapping(address => Campaign) private _campaigns;
+
+    bytes32 public constant override CAMPAIGN_MANAGER_ROLE = keccak256("CAMPAIGN_MANAGER_ROLE");
+    bytes32 public constant override DISTRIBUTOR_ROLE = keccak256("DISTRIBUTOR_ROLE");
+
+    /// @notice Initializes the contract with MFD
+    function initialize(address _mfd, address __owner) external override initializer {
+        require(_mfd != address(0), "ZAD");
+        _setupRole(DEFAULT_ADMIN_ROLE, __owner);
+        // lets the factory distribute through distributeAll
+        _setupRole(DISTRIBUTOR_ROLE, msg.sender);
+
+        mfd = _mfd;
+        emit Initialized(_mfd);
+    }
+
+    /// @dev Reverts if called by any account other than the default admin.
+    function _onlyAdmin() private view {
+        require(hasRole(DEFAULT_ADMIN_ROLE, msg.sender), "RNA");
+    }
+
+    /// @dev Reverts if called by an account which is not allowed to set campaigns.
+    function _onlyCampaignManager() private view {
+        require(hasRole(CAMPAIGN_MANAGER_ROLE, msg.sender), "RNM");
+    }
+
+    /// @dev Reverts if called by an account which is not allowed to trigger reward distribution.
+    function _onlyDistributor() private view {
+        require(hasRole(DISTRIBUTOR_ROLE, msg.sender), "RND");
+    }
+
+    /// @notice Sets or resets the campaign of a reward token with new parameters
+    function setCampaign(
+        address rewardToken,
+        uint256 startTime,
+        uint256 endTime,
+        uint256 amount
+    ) external override nonReentrant {
+        _onlyCampaignManager();
+        require(rewardToken != address(0), "ZAD");
+        require(endTime > startTime, "ICM");
+
+        if (amount > 0) {
+            require(IERC20(rewardToken).allowance(msg.sender, address(this)) >= amount, "IAL");
+            // Transfer reward tokens from sender to distributor contract
+            IERC20(rewardToken).safeTransferFrom(msg.sender, address(this), amount);
+        }
+
+        Campaign storage campaign = _campaigns[rewardToken];
+        // end is never zero once a campaign was set
+        if (campaign.end == 0) {
+            rewardTokens.push(rewardToken);
+        }
+
+        campaign.start = startTime;
+        campaign.end = endTime;
+        campaign.lastDistribution = startTime;  // Reset last distribution
+        campaign.amount = IERC20(rewardToken).balanceOf(address(this));
+
+        emit CampaignSet(msg.sender, rewardToken, startTime, endTime, amount, campaign.amount);
+    }
+
+    function _isActive(Campaign storage campaign) private view returns (bool) {
+        return block.timestamp >= campaign.start && campaign.lastDistribution < campaign.end;
+    }
+
+    /// @dev Same conditions as RewardCampaignDistributor._checkMFD, plus the token still being an active reward of the MFD.
+    ///      MFDs deployed before reward retirement have no rewardTokenIndex and never retire a reward.
+    function _isMFDReady(address rewardToken) private view returns (bool) {
+        // MFDs deployed before the storage packing return three words from rewardData and newer ones four,
+        // lastTimeUpdated is the second word of both
+        (bool success, bytes memory data) = mfd.staticcall(
+            abi.encodeWithSignature("rewardData(address)", rewardToken)
+        );
+        if (!success || data.length < 64) return false;
+        (, uint256 lastTimeUpdated) = abi.decode(data, (uint256, uint256));
+        if (lastTimeUpdated == 0 || lastTimeUpdated == block.timestamp) return false;
+
+        try MultiFeeDistribution(mfd).rewardTokenIndex(rewardToken) returns (uint256 index) {
+            return index != 0;
+        } catch {
+            return true;
+        }
+    }
+
+    function _distributionEnabled(address rewardToken) private view returns (bool) {
+        Campaign storage campaign = _campaigns[rewardToken];
+        return _isActive(campaign) &&
+            block.timestamp > campaign.lastDistribution &&
+            IERC20(rewardToken).balanceOf(address(this)) > 0;
+    }
+
+    function tokenDistributionEnabled(address rewardToken) public view override returns (bool) {
+        return _distributionEnabled(rewardToken);
+    }
+
+    function distributionEnabled() public view override returns (bool) {
+        uint256 length = rewardTokens.length;
+        for (uint256 i; i < length; i++) {
+            if (_distributionEnabled(rewardTokens[i])) return true;
+        }
+        return false;
+    }
+
+    /// @notice Distributes the due share of every reward token to the MFD
+    /// @dev Tokens whose campaign is not due, or which the MFD cannot take yet, are skipped
+    function distributeRewards() external override nonReentrant {
+        _onlyDistributor();
+
+        uint256 distributed;
+        uint256 length = rewardTokens.length;
+        for (uint256 i; i < length; i++) {
+            address rewardToken = rewardTokens[i];
+            if (!_distributionEnabled(rewardToken) || !_isMFDReady(rewardToken)) continue;
+
+            Campaign storage campaign = _campaigns[rewardToken];
+            uint256 remainingAmount = IERC20(rewardToken).balanceOf(address(this));
+
+            // Calculate the time range for distribution
+            uint256 timeSinceLastDistribution = block.timestamp - campaign.lastDistribution;
+            uint256 remainingCampaignTime = campaign.end - campaign.lastDistribution;
+
+            // Calculate the reward distribution
+            uint256 rewardShare = remainingAmount;
+            if (timeSinceLastDistribution < remainingCampaignTime) {
+                rewardShare = timeSinceLastDistribution * remainingAmount / remainingCampaignTime;
+            }
+
+            // Send the calculated reward share to the MFD and credit it right away, MFDs without the hook
+            // pick the transfer up on their next update
+            IERC20(rewardToken).safeTransfer(mfd, rewardShare);
+            try MultiFeeDistribution(mfd).notifyReward(rewardToken) {} catch {}
+
+            campaign.lastDistribution = block.timestamp;  // Update the last distribution time
+            distributed++;
+
+            emit RewardsDistributed(msg.sender, mfd, rewardToken, rewardShare);
+        }
+        require(distributed > 0, "NAC");
+    }
+
+    /// @notice Returns the current campaign parameters of a reward token
+    function getCampaign(address rewardToken) external view override returns (uint256 startTime, uint256 endTime,
+            uint256 amount, uint256 remainingAmount, bool isActive) {
+        Campaign storage campaign = _campaigns[rewardToken];
+        isActive = _isActive(campaign);
+        remainingAmount = IERC20(rewardToken).balanceOf(address(this));
+        startTime = campaign.start;
+        endTime = campaign.end;
+        amount = campaign.amount;
+    }
+
+    /// @notice Returns the last distribution timestamp of a reward token
+    function lastDistribution(address rewardToken) external view override returns (uint256) {
+        return _campaigns[rewardToken].lastDistribution;
+    }
+
+    function rewardTokensLength() external view override returns (uint256) {
+        return rewardTokens.length;
+    }
+
+    /// @notice Checks if the caller has the campaign manager role
+    function isCampaignManager(address user) public view override returns (bool) {
+        return hasRole(CAMPAIGN_MANAGER_ROLE, user);
+    }
+
+    /// @notice Checks if the caller has the distributor role
+    function isDistributor(address user) public view override returns (bool) {
+        return hasRole(DISTRIBUTOR_ROLE, user);
+    }
+
+    /// @notice grants campaign manager role
+    function grantCampaignManagerRole(address account) external override {
+        _onlyAdmin();
+        grantRole(CAMPAIGN_MANAGER_ROLE, account);
+    }
+
+    /// @notice grants distributor role
+    function grantDistributorRole(address account) external override {
+        _onlyAdmin();
+        grantRole(DISTRIBUTOR_ROLE, account);
+    }
+
+    /// @notice Withdraws tokens from the contract
+    function withdrawTokens(address _token, address _recipient) external override {
+        if (_campaigns[_token].end != 0) {
+            _onlyCampaignManager();
+        } else {
+            _onlyAdmin();
+        }
+
+        IERC20 token = IERC20(_token);
+        uint256 tokenBalance = token.balanceOf(address(this));
+        require(tokenBalance > 0, "ZBL");
+        token.safeTransfer(_recipient, tokenBalance);
+
+        emit WithdrawTokens(msg.sender, _token, _recipient, tokenBalance);
+    }
+
+}
@@ -16,6 +16,7 @@ import "../interfaces/IRewardCampaignDistributor.sol";
 ///     ICM - Invalid campaign
 ///     IAL - Insufficient allowance
 ///     ILT - Invalid MFD last time updated
+///     IAR - Inactive reward on the MFD
 ///     ITT - Insufficient target tokens
 ///     NAC - No active campaign
 ///     RNA - Roles: not an admin
@@ -49,6 +50,8 @@ contract RewardCampaignDistributor is IRewardCampaignDistributor, ReentrancyGuar
     {
         require(_mfd != address(0) && _rewardToken != address(0), "ZAD");
         _setupRole(DEFAULT_ADMIN_ROLE, __owner);
+        // lets the factory distribute on behalf of the distributors through distributeAll
+        _setupRole(DISTRIBUTOR_ROLE, msg.sender);
 
         mfd = _mfd;
         rewardToken = _rewardToken;
@@ -96,11 +99,23 @@ contract RewardCampaignDistributor is IRewardCampaignDistributor, ReentrancyGuar
     }
 
     function _checkMFD() private view {
-        (,uint256 lastTimeUpdated,) = MultiFeeDistribution(mfd).rewardData(rewardToken);
+        // MFDs deployed before the storage packing return three words from rewardData and newer ones four,
+        // lastTimeUpdated is the second word of both
+        (bool success, bytes memory data) = mfd.staticcall(
+            abi.encodeWithSignature("rewardData(address)", rewardToken)
+        );
+        require(success && data.length >= 64, "ILT");
+        (, uint256 lastTimeUpdated) = abi.decode(data, (uint256, uint256));
         require(
             lastTimeUpdated != 0 && lastTimeUpdated != block.timestamp,
             "ILT"
         );
+
+        // retired rewards keep their reward data, a transfer would only add to the MFD's unaccounted balance.
+        // MFDs deployed before retiring was added have no rewardTokenIndex and never retire rewards
+        try MultiFeeDistribution(mfd).rewardTokenIndex(rewardToken) returns (uint256 index) {
+            require(index != 0, "IAR");
+        } catch {}
     }
 
     function distributionEnabled() public view override returns (bool) {
@@ -129,8 +144,10 @@ contract RewardCampaignDistributor is IRewardCampaignDistributor, ReentrancyGuar
             rewardShare = timeSinceLastDistribution.mul(remainingAmount).div(remainingCampaignTime);
         }
 
-        // Send the calculated reward share to the MFD
+        // Send the calculated reward share to the MFD and credit it right away. The transfer alone is a valid
+        // push, so MFDs without the hook, deployed before it was added, pick it up on their next update
         IERC20(rewardToken).safeTransfer(mfd, rewardShare);
+        try MultiFeeDistribution(mfd).notifyReward(rewardToken) {} catch {}
 
         lastDistribution = block.timestamp;  // Update the last distribution time
 
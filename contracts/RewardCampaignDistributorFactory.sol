@@ -5,6 +5,8 @@ import { Clones} from "@openzeppelin/contracts/proxy/Clones.sol";
 import { Ownable } from "@openzeppelin/contracts/access/Ownable.sol";
 import { ReentrancyGuard } from "@openzeppelin/contracts/security/ReentrancyGuard.sol";
 import { RewardCampaignDistributor } from "./RewardCampaignDistributor.sol";
+import { MultiTokenCampaignDistributor } from "./MultiTokenCampaignDistributor.sol";
+import "../interfaces/IRewardCampaignDistributor.sol";
 import "../interfaces/IRewardCampaignDistributorFactory.sol";
 
 /// @title RewardCampaignDistributor Factory
@@ -12,6 +14,7 @@ import "../interfaces/IRewardCampaignDistributorFactory.sol";
 ///
 /// Error Codes:
 ///     DAE - Distributor already exists
+///     OOG - Out of gas in a distribution
 ///     ZAD - Zero address
 
 contract RewardCampaignDistributorFactory is IRewardCampaignDistributorFactory, Ownable, ReentrancyGuard {
@@ -22,10 +25,15 @@ contract RewardCampaignDistributorFactory is IRewardCampaignDistributorFactory,
     mapping(address => mapping(address => address)) public getDistributor;
     address[] public override allDistributors;
 
-    constructor(address _distributorImplementation) {
-        require(_distributorImplementation != address(0), "ZAD");
+    address public immutable multiTokenDistributorImplementation;
+    mapping(address => address) public override getMultiTokenDistributor;
+    address[] public override allMultiTokenDistributors;
+
+    constructor(address _distributorImplementation, address _multiTokenDistributorImplementation) {
+        require(_distributorImplementation != address(0) && _multiTokenDistributorImplementation != address(0), "ZAD");
 
         distributorImplementation = _distributorImplementation;
+        multiTokenDistributorImplementation = _multiTokenDistributorImplementation;
 
         emit DeployRewardCampaignDistributorFactory(msg.sender, _distributorImplementation);
     }
@@ -46,10 +54,68 @@ contract RewardCampaignDistributorFactory is IRewardCampaignDistributorFactory,
         emit RewardCampaignDistributorCreated(distributor, mfd, rewardToken);
     }
 
+    function createMultiTokenCampaignDistributor(address mfd) external override onlyOwner nonReentrant returns (address distributor) {
+        require(mfd != address(0), "ZAD");
+        require(getMultiTokenDistributor[mfd] == address(0), "DAE");
+
+        distributor = multiTokenDistributorImplementation.clone();
+        // set owner to msg.sender
+        MultiTokenCampaignDistributor(distributor).initialize(mfd, msg.sender);
+
+        allMultiTokenDistributors.push(distributor);
+        getMultiTokenDistributor[mfd] = distributor;
+
+        emit MultiTokenCampaignDistributorCreated(distributor, mfd);
+    }
+
+    /// @notice Distributes rewards for every enabled distributor of an MFD
+    /// @dev The factory is granted the distributor role when it creates a distributor, and only
+    ///      distributes where the caller holds the role as well, so no distributor's permissions are widened.
+    ///      A distribution that fails, e.g. because the MFD was updated in this block, is skipped and
+    ///      reported through DistributionFailed. One that ran out of gas reverts the whole call instead,
+    ///      so too low a gas limit cannot make the distributions look failed.
+    ///      The multi-token distributor of the MFD, if any, counts as one distributor.
+    function distributeAll(address mfd) external override nonReentrant returns (uint256 distributed) {
+        address[] storage distributors = allDistributorsForMFD[mfd];
+        uint256 length = distributors.length;
+        for (uint256 i; i < length; i++) {
+            if (_distribute(mfd, distributors[i])) distributed++;
+        }
+
+        address multiTokenDistributor = getMultiTokenDistributor[mfd];
+        if (multiTokenDistributor != address(0) && _distribute(mfd, multiTokenDistributor)) distributed++;
+
+        emit DistributeAll(msg.sender, mfd, distributed);
+    }
+
+    /// @dev Both distributor variants share the function signatures used here
+    function _distribute(address mfd, address _distributor) private returns (bool) {
+        IRewardCampaignDistributor distributor = IRewardCampaignDistributor(_distributor);
+        if (
+            !distributor.isDistributor(msg.sender) ||
+            !distributor.isDistributor(address(this)) ||
+            !distributor.distributionEnabled()
+        ) return false;
+
+        uint256 gasBefore = gasleft();
+        try distributor.distributeRewards() {
+            return true;
+        } catch (bytes memory reason) {
+            // the call is forwarded all but 1/64 of the gas left, running out of it leaves no more than that
+            require(gasleft() > gasBefore / 63, "OOG");
+            emit DistributionFailed(mfd, _distributor, reason);
+            return false;
+        }
+    }
+
     function allDistributorsLength() external view override returns (uint256) {
         return allDistributors.length;
     }
 
+    function allMultiTokenDistributorsLength() external view override returns (uint256) {
+        return allMultiTokenDistributors.length;
+    }
+
     function allDistributorsForMFDLength(address mfd) external view override returns (uint256) {
         require(mfd != address(0), "ZAD");
         return allDistributorsForMFD[mfd].length;
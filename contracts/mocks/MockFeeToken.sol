@@ -0,0 +1,20 @@
+// SPDX-License-Identifier: MIT
+pragma solidity >=0.8.12;
+
+import {ERC20} from "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+
+// ERC20 burning a fee of feeBps basis points on every transfer, the recipient receives the rest
+contract MockFeeToken is ERC20 {
+    uint256 public immutable feeBps;
+
+    constructor(uint256 initialSupply, uint256 _feeBps) ERC20("Fee", "FEE") {
+        feeBps = _feeBps;
+        _mint(msg.sender, initialSupply);
+    }
+
+    function _transfer(address from, address to, uint256 amount) internal override {
+        uint256 fee = amount * feeBps / 10_000;
+        _burn(from, fee);
+        super._transfer(from, to, amount - fee);
+    }
+}
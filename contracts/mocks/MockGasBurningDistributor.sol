@@ -0,0 +1,23 @@
+// SPDX-License-Identifier: MIT
+pragma solidity >=0.8.12;
+
+// a distributor implementation whose distribution consumes all the gas it is given
+contract MockGasBurningDistributor {
+    uint256 public burned;
+
+    function initialize(address, address, address) external {}
+
+    function isDistributor(address) external pure returns (bool) {
+        return true;
+    }
+
+    function distributionEnabled() external pure returns (bool) {
+        return true;
+    }
+
+    function distributeRewards() external {
+        while (true) {
+            burned++;
+        }
+    }
+}
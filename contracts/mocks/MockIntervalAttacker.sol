@@ -0,0 +1,22 @@
+// SPDX-License-Identifier: MIT
+pragma solidity >=0.8.12;
+
+import {IERC20} from "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+
+import {MultiFeeDistribution} from "../MultiFeeDistribution.sol";
+
+// stakes, forces a collection and unstakes within a single transaction, trying to take a share
+// of the rewards that accrued during the collection interval without having staked for them
+contract MockIntervalAttacker {
+    function attack(MultiFeeDistribution mfd, uint256 amount) external returns (uint256[] memory claimed) {
+        IERC20 stakingToken = IERC20(mfd.stakingToken());
+        stakingToken.transferFrom(msg.sender, address(this), amount);
+        stakingToken.approve(address(mfd), amount);
+
+        mfd.stake(amount, address(this));
+        mfd.updateReward();
+        (address[] memory rewardTokens, ) = mfd.claimableRewards(address(this));
+        claimed = mfd.unstakeAndClaim(amount, rewardTokens);
+        stakingToken.transfer(msg.sender, amount);
+    }
+}
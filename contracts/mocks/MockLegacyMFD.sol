@@ -0,0 +1,18 @@
+// SPDX-License-Identifier: MIT
+pragma solidity >=0.8.12;
+
+// the reward data getter of a MultiFeeDistribution deployed before the storage packing,
+// which returns three words and has no notifyReward or rewardTokenIndex
+contract MockLegacyMFD {
+    struct RewardData {
+        uint256 amount;
+        uint256 lastTimeUpdated;
+        uint256 rewardPerToken;
+    }
+
+    mapping(address => RewardData) public rewardData;
+
+    function setLastTimeUpdated(address rewardToken, uint256 lastTimeUpdated) external {
+        rewardData[rewardToken].lastTimeUpdated = lastTimeUpdated;
+    }
+}
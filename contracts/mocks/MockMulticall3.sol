@@ -0,0 +1,32 @@
+// SPDX-License-Identifier: MIT
+pragma solidity >=0.8.12;
+
+// the aggregate3 subset of Multicall3 (0xcA11bde05977b3631167028862bE2a173976CA11),
+// deployed on local chains where the canonical contract does not exist
+contract MockMulticall3 {
+    struct Call3 {
+        address target;
+        bool allowFailure;
+        bytes callData;
+    }
+
+    struct Result {
+        bool success;
+        bytes returnData;
+    }
+
+    function aggregate3(Call3[] calldata calls) external payable returns (Result[] memory returnData) {
+        uint256 length = calls.length;
+        returnData = new Result[](length);
+        for (uint256 i; i < length; i++) {
+            Call3 calldata calli = calls[i];
+            (bool success, bytes memory data) = calli.target.call(calli.callData);
+            require(success || calli.allowFailure, "Multicall3: call failed");
+            returnData[i] = Result(success, data);
+        }
+    }
+
+    function getBlockNumber() external view returns (uint256) {
+        return block.number;
+    }
+}
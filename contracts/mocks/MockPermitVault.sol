@@ -0,0 +1,11 @@
+// SPDX-License-Identifier: MIT
+pragma solidity >=0.8.12;
+
+import {ERC20Permit} from "@openzeppelin/contracts/token/ERC20/extensions/ERC20Permit.sol";
+
+import {MockVault} from "./MockVault.sol";
+
+// MockVault variant whose shares support EIP-2612 permits
+contract MockPermitVault is MockVault, ERC20Permit {
+    constructor(uint256 initialSupply) MockVault(initialSupply) ERC20Permit("Gold") {}
+}
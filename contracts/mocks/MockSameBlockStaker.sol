@@ -0,0 +1,33 @@
+// SPDX-License-Identifier: MIT
+pragma solidity >=0.8.12;
+
+import {IERC20} from "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+
+import {MultiFeeDistribution} from "../MultiFeeDistribution.sol";
+
+// stakes or claims for several users within a single transaction, i.e. in the same block,
+// and reports the gas of every call
+contract MockSameBlockStaker {
+    event StakeGas(address indexed user, uint256 gasUsed);
+    event ClaimGas(address indexed user, uint256 gasUsed);
+
+    function stakeFor(MultiFeeDistribution mfd, address[] calldata users, uint256 amount) external {
+        IERC20 stakingToken = IERC20(mfd.stakingToken());
+        stakingToken.transferFrom(msg.sender, address(this), amount * users.length);
+        stakingToken.approve(address(mfd), amount * users.length);
+
+        for (uint i; i < users.length; i++) {
+            uint256 gasBefore = gasleft();
+            mfd.stake(amount, users[i]);
+            emit StakeGas(users[i], gasBefore - gasleft());
+        }
+    }
+
+    function claimFor(MultiFeeDistribution mfd, address[] calldata users, address[] calldata rewardTokens) external {
+        for (uint i; i < users.length; i++) {
+            uint256 gasBefore = gasleft();
+            mfd.getReward(users[i], rewardTokens);
+            emit ClaimGas(users[i], gasBefore - gasleft());
+        }
+    }
+}
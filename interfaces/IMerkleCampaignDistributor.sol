@@ -0,0 +1,52 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+interface IMerkleCampaignDistributor {
+    event CampaignCreated(uint256 indexed campaignId, address indexed rewardToken, bytes32 merkleRoot, uint256 amount, uint256 deadline);
+    event Claimed(uint256 indexed campaignId, uint256 index, address indexed account, uint256 amount);
+    event UnclaimedWithdrawn(uint256 indexed campaignId, address indexed recipient, uint256 amount);
+
+    /// @notice Creates a campaign paying `amount` of `rewardToken` to the leaves of `merkleRoot`
+    /// @dev Every leaf is keccak256(abi.encodePacked(index, account, amount)), pairs are hashed sorted
+    /// @param rewardToken The address of the reward token
+    /// @param merkleRoot The root of the entitlement tree
+    /// @param amount The sum of all entitlements, pulled from the sender
+    /// @param deadline The time after which unclaimed rewards can be withdrawn (timestamp)
+    /// @return campaignId The id of the new campaign
+    function createCampaign(address rewardToken, bytes32 merkleRoot, uint256 amount, uint256 deadline) external returns (uint256 campaignId);
+
+    /// @notice Pays the entitlement of a leaf to its account
+    /// @param campaignId The id of the campaign
+    /// @param index The index of the leaf
+    /// @param account The account of the leaf
+    /// @param amount The amount of the leaf
+    /// @param merkleProof The proof of the leaf against the campaign root
+    function claim(uint256 campaignId, uint256 index, address account, uint256 amount, bytes32[] calldata merkleProof) external;
+
+    /// @notice Checks if the leaf at an index of a campaign was claimed
+    function isClaimed(uint256 campaignId, uint256 index) external view returns (bool);
+
+    /// @notice Returns the parameters of a campaign
+    /// (rewardToken, merkleRoot, deadline, remainingAmount)
+    function getCampaign(uint256 campaignId) external view returns (address rewardToken, bytes32 merkleRoot,
+        uint256 deadline, uint256 remainingAmount);
+
+    /// @notice Returns the number of campaigns
+    function campaignsLength() external view returns (uint256);
+
+    /// @notice Withdraws the unclaimed rewards of a campaign after its deadline
+    function withdrawUnclaimed(uint256 campaignId, address recipient) external;
+
+    /// @notice Returns the MFD whose stake history the entitlements are computed from
+    function mfd() external view returns (address);
+
+    /// @notice Checks if the caller has the campaign manager role
+    /// @param user The address of the user to check
+    function isCampaignManager(address user) external view returns (bool);
+
+    /// @notice Grants the campaign manager role to an address
+    function grantCampaignManagerRole(address account) external;
+
+    function CAMPAIGN_MANAGER_ROLE() external view returns (bytes32);
+
+}
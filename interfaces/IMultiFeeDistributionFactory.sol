@@ -10,7 +10,12 @@ interface IMultiFeeDistributionFactory {
   function bytecodeHash() external view returns (bytes32);
   function cachedDeployData() external view returns (bytes memory);
   function vaultToStaker(address ichiVault) external view returns (address staker);
+  function predictStakerAddress(address ichiVault) external view returns (address staker);
+  function stakerImplementation() external view returns (address);
+  function predictStakerCloneAddress(address ichiVault) external view returns (address staker);
 
   // stateful functions
   function deployStaker(address ichiVault) external returns (address staker);
+  function deployStakers(address[] calldata ichiVaults) external returns (address[] memory stakers);
+  function deployStakerClone(address ichiVault) external returns (address staker);
 }
@@ -0,0 +1,69 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+interface IMultiTokenCampaignDistributor {
+    event Initialized(address indexed mfd);
+    event CampaignSet(address indexed sender, address indexed rewardToken, uint256 startTime, uint256 endTime, uint256 amount, uint256 actualAmount);
+    event RewardsDistributed(address indexed sender, address indexed mfd, address indexed rewardToken, uint256 amount);
+    event WithdrawTokens(address indexed sender, address indexed token, address indexed recipient, uint256 tokenBalance);
+
+    /// @notice Initializes the MultiTokenCampaignDistributor
+    /// @dev This should only be called once, right after contract creation
+    /// @param mfd The address of the MFD
+    function initialize(address mfd, address owner) external;
+
+    /// @notice Checks if the distribution of at least one reward token is enabled
+    function distributionEnabled() external view returns (bool);
+
+    /// @notice Checks if the distribution of a reward token is enabled
+    /// @param rewardToken The address of the reward token
+    function tokenDistributionEnabled(address rewardToken) external view returns (bool);
+
+    /// @notice Distributes the due share of every reward token to MFD
+    function distributeRewards() external;
+
+    /// @notice Sets a new campaign or resets the current campaign of a reward token with new values
+    /// @param rewardToken The address of the reward token
+    /// @param startTime The start time of the campaign (timestamp)
+    /// @param endTime The end time of the campaign (timestamp)
+    /// @param amount The total amount of rewards for the campaign
+    function setCampaign(address rewardToken, uint256 startTime, uint256 endTime, uint256 amount) external;
+
+    /// @notice Returns the current campaign parameters of a reward token
+    /// (startTime, endTime, amount, remainingAmount, isActive)
+    function getCampaign(address rewardToken) external view returns (uint256 startTime, uint256 endTime,
+        uint256 amount, uint256 remainingAmount, bool isActive);
+
+    /// @notice Returns the last distribution timestamp of a reward token
+    function lastDistribution(address rewardToken) external view returns (uint256);
+
+    /// @notice Returns the reward token at an index of the campaign list
+    function rewardTokens(uint256 index) external view returns (address);
+
+    /// @notice Returns the number of reward tokens with a campaign
+    function rewardTokensLength() external view returns (uint256);
+
+    /// @notice Checks if the caller has the campaign manager role
+    /// @param user The address of the user to check
+    function isCampaignManager(address user) external view returns (bool);
+
+    /// @notice Checks if the caller has the distributor role
+    /// @param user The address of the user to check
+    function isDistributor(address user) external view returns (bool);
+
+    /// @notice Returns the MFD address linked to this distributor
+    function mfd() external view returns (address);
+
+    /// @notice Grants the campaign manager role to an address
+    function grantCampaignManagerRole(address account) external;
+
+    /// @notice Grants the distributor role to an address
+    function grantDistributorRole(address account) external;
+
+    /// @notice Withdraws tokens from the contract
+    function withdrawTokens(address _token, address _recipient) external;
+
+    function CAMPAIGN_MANAGER_ROLE() external view returns (bytes32);
+    function DISTRIBUTOR_ROLE() external view returns (bytes32);
+
+}
@@ -4,6 +4,9 @@ pragma solidity ^0.8.0;
 interface IRewardCampaignDistributorFactory {
     event DeployRewardCampaignDistributorFactory(address indexed owner, address indexed distributorImplementation);
     event RewardCampaignDistributorCreated(address indexed distributor, address indexed mfd, address indexed rewardToken);
+    event MultiTokenCampaignDistributorCreated(address indexed distributor, address indexed mfd);
+    event DistributeAll(address indexed sender, address indexed mfd, uint256 distributed);
+    event DistributionFailed(address indexed mfd, address indexed distributor, bytes reason);
 
     /// @notice Deploy a new RewardCampaignDistributor
     /// @param mfd MFD address
@@ -11,6 +14,18 @@ interface IRewardCampaignDistributorFactory {
     /// @return distributor The address of the newly created distributor
     function createRewardCampaignDistributor(address mfd, address rewardToken) external returns (address distributor);
 
+    /// @notice Deploy a new MultiTokenCampaignDistributor, at most one per MFD
+    /// @param mfd MFD address
+    /// @return distributor The address of the newly created distributor
+    function createMultiTokenCampaignDistributor(address mfd) external returns (address distributor);
+
+    /// @notice Distribute rewards for every enabled distributor of an MFD in one transaction
+    /// @dev Distributors that are not enabled, that the caller may not distribute for, or whose distribution fails are skipped.
+    ///      Failures emit DistributionFailed, a distribution running out of gas reverts with OOG
+    /// @param mfd MFD address
+    /// @return distributed The number of distributors that distributed rewards
+    function distributeAll(address mfd) external returns (uint256 distributed);
+
     /// @notice Retrieve all distributors
     function allDistributors(uint256 index) external view returns (address);
 
@@ -26,6 +41,16 @@ interface IRewardCampaignDistributorFactory {
     /// @notice Returns the total number of distributors created by the factory
     function allDistributorsLength() external view returns (uint256);
 
+    /// @notice Retrieve all multi-token distributors
+    function allMultiTokenDistributors(uint256 index) external view returns (address);
+
+    /// @notice Retrieve the multi-token distributor of an MFD
+    /// @param mfd MFD address
+    function getMultiTokenDistributor(address mfd) external view returns (address);
+
+    /// @notice Returns the total number of multi-token distributors created by the factory
+    function allMultiTokenDistributorsLength() external view returns (uint256);
+
     /// @notice Returns the number of distributors created for a specific MFD
     /// @param mfd MFD address
     function allDistributorsForMFDLength(address mfd) external view returns (uint256);
@@ -0,0 +1,78 @@
+"""
+Helpers for reading claimable rewards and user reward-per-token for large user lists.
+
+The batched MultiFeeDistribution views answer many users per `eth_call`. Nodes cap the gas of
+an `eth_call` (50M by default on geth), so user lists are split into chunks that fit the cap,
+and a chunk that still fails is halved and retried. All chunks are read at the same block.
+"""
+
+from brownie import web3
+from brownie.exceptions import VirtualMachineError
+
+# geth's default RPCGasCap
+CALL_GAS_LIMIT = 50_000_000
+
+# rough upper bounds: a cold userData read per user, plus cold claimable and
+# user reward-per-token reads per user and reward token
+GAS_PER_USER = 10_000
+GAS_PER_CELL = 10_000
+
+
+def chunk_size_for(token_count, gas_limit=CALL_GAS_LIMIT):
+    return max(1, gas_limit // (GAS_PER_USER + GAS_PER_CELL * max(token_count, 1)))
+
+
+def _chunked_call(view, users, tokens, chunk_size, block_identifier):
+    start = 0
+    while start < len(users):
+        chunk = users[start : start + chunk_size]
+        try:
+            result = view(chunk, tokens, block_identifier=block_identifier)
+        except (ValueError, VirtualMachineError):
+            if chunk_size == 1:
+                raise
+            chunk_size = max(1, chunk_size // 2)
+            continue
+        yield chunk, result
+        start += len(chunk)
+
+
+def claimable_rewards_for_many(multi, users, tokens=(), chunk_size=None, block_identifier=None):
+    """
+    Claimable rewards of every user as `{user: {token: amount}}`.
+
+    `tokens` defaults to all active reward tokens.
+    """
+    if block_identifier is None:
+        block_identifier = web3.eth.block_number
+    tokens = list(tokens)
+    if not tokens:
+        (tokens, _) = multi.claimableRewardsForMany([], [], block_identifier=block_identifier)
+        tokens = list(tokens)
+    if chunk_size is None:
+        chunk_size = chunk_size_for(len(tokens))
+
+    claimable = {}
+    for chunk, (_, amounts) in _chunked_call(
+        multi.claimableRewardsForMany, list(users), tokens, chunk_size, block_identifier
+    ):
+        for user, user_amounts in zip(chunk, amounts):
+            claimable[user] = dict(zip(tokens, user_amounts))
+    return claimable
+
+
+def user_reward_per_token_for_many(multi, users, tokens, chunk_size=None, block_identifier=None):
+    """User reward-per-token of every user for the given tokens as `{user: {token: value}}`."""
+    if block_identifier is None:
+        block_identifier = web3.eth.block_number
+    tokens = list(tokens)
+    if chunk_size is None:
+        chunk_size = chunk_size_for(len(tokens))
+
+    values = {}
+    for chunk, result in _chunked_call(
+        multi.getUserRewardPerTokenForMany, list(users), tokens, chunk_size, block_identifier
+    ):
+        for user, user_values in zip(chunk, result):
+            values[user] = dict(zip(tokens, user_values))
+    return values
@@ -1,31 +1,332 @@
-from brownie import MultiFeeDistribution, accounts
-from brownie.network.gas.strategies import GasNowScalingStrategy
+"""
+Deploy the staking and campaign contracts from a declarative manifest.
+
+The manifest is a JSON file:
+
+    {
+        "ichi_vault_factory": "0x...",
+        "owner": "0x...",
+        "stakers": [{"vault": "0x...", "clone": false}],
+        "distributors": [{"vault": "0x...", "reward_token": "0x..."}],
+        "multi_token_distributors": [{"vault": "0x..."}]
+    }
+
+Only `ichi_vault_factory` is required. `clone` deploys the staker of a vault as a minimal proxy.
+Distributors refer to the staker of their vault, which must be listed in `stakers` or already
+be deployed by the factory. If `owner` is set, the staker factory is handed over before the
+stakers are deployed, so that they are owned by `owner` as well, and the distributor factory
+once its distributors exist. The distributors themselves stay administered by the deployer.
+
+Deployment runs in stages: implementations, factories, stakers, distributors. The transactions
+of a stage do not depend on each other, so they are sent back to back with explicit nonces and
+confirmed together. Fees are priced from the `eth_feeHistory` of recent blocks.
+
+Every transaction hash and every deployed address is written to a state file as soon as it is
+known. Running the script again after a failure picks up from that file: confirmed steps are
+skipped, transactions still in flight are awaited, and dropped or reverted ones are sent again.
+Stakers and distributors that the factories already know are recorded without a transaction.
+"""
+
+import json
+import os
+
+from brownie import (
+    MultiFeeDistributionClone,
+    MultiFeeDistributionFactory,
+    MultiTokenCampaignDistributor,
+    RewardCampaignDistributor,
+    RewardCampaignDistributorFactory,
+    accounts,
+    chain,
+    web3,
+)
+from brownie.exceptions import VirtualMachineError
+from web3.exceptions import TransactionNotFound
+
+try:
+    from web3.exceptions import Web3RPCError
+
+    RPC_ERRORS = (ValueError, Web3RPCError)
+except ImportError:
+    RPC_ERRORS = (ValueError,)
+
+ZERO_ADDRESS = "0x" + "00" * 20
+
+MANIFEST_PATH = "deployment.json"
+STATE_PATH = "deployment-state.json"
+
+# brownie account id of the deployer
+DEPLOYER_ACCOUNT = "deployer"
+
+# blocks of fee history to price transactions from
+FEE_HISTORY_BLOCKS = 20
+
+# reward percentile of each block used for the priority fee, the median of the blocks is used
+PRIORITY_FEE_PERCENTILE = 50
+
+# the max fee covers the base fee doubling, i.e. six full blocks in a row
+BASE_FEE_MULTIPLIER = 2
+
+
+class DeploymentError(Exception):
+    pass
+
+
+def eip1559_fees(blocks=FEE_HISTORY_BLOCKS, percentile=PRIORITY_FEE_PERCENTILE):
+    """
+    Fee parameters for the next transactions, from the fee history of the last `blocks` blocks.
+
+    Chains without EIP-1559 get a legacy `gas_price` instead.
+    """
+    try:
+        history = web3.eth.fee_history(blocks, "latest", [percentile])
+    except RPC_ERRORS:
+        history = {}
+    base_fees = history.get("baseFeePerGas") or []
+    if not base_fees or not base_fees[-1]:
+        return {"gas_price": web3.eth.gas_price}
+
+    # the last base fee is the one of the next block
+    rewards = sorted(reward[0] for reward in history.get("reward") or [] if reward)
+    priority_fee = rewards[len(rewards) // 2] if rewards else 0
+    return {
+        "max_fee": base_fees[-1] * BASE_FEE_MULTIPLIER + priority_fee,
+        "priority_fee": priority_fee,
+    }
+
+
+def _staker_step(vault):
+    return f"staker:{vault}"
+
+
+class Deployment:
+    def __init__(self, manifest, account, state_path=STATE_PATH):
+        self.manifest = manifest
+        self.account = account
+        self.state_path = state_path
+
+        if os.path.exists(state_path):
+            with open(state_path) as fp:
+                self.state = json.load(fp)
+            if self.state["chain_id"] != chain.id:
+                raise DeploymentError(f"{state_path} belongs to chain {self.state['chain_id']}")
+            if self.state["deployer"] != account.address:
+                raise DeploymentError(f"{state_path} belongs to deployer {self.state['deployer']}")
+        else:
+            self.state = {"chain_id": chain.id, "deployer": account.address, "steps": {}}
+            self._save()
 
-# the address that will be used to deploy the contract
-# can be loaded via a keystore or private key, for more info see
-# https://eth-brownie.readthedocs.io/en/stable/account-management.html
-DEPLOYER = accounts.add()
+    @property
+    def steps(self):
+        return self.state["steps"]
 
-# the address that owns the contract and can call all restricted functions
-OWNER = DEPLOYER
+    def address(self, step_id):
+        """Address a confirmed step deployed or registered, None otherwise."""
+        return self.steps.get(step_id, {}).get("address")
 
-# the address of the Curve LP token for your pool
-STAKING_TOKEN_ADDRESS = "0x"
+    def run(self):
+        """Deploy everything in the manifest that is not deployed yet and return the addresses."""
+        self._stage(
+            [
+                (
+                    "implementation:MultiFeeDistributionClone",
+                    self._deploy(MultiFeeDistributionClone),
+                ),
+                (
+                    "implementation:RewardCampaignDistributor",
+                    self._deploy(RewardCampaignDistributor),
+                ),
+                (
+                    "implementation:MultiTokenCampaignDistributor",
+                    self._deploy(MultiTokenCampaignDistributor),
+                ),
+            ]
+        )
+        self._stage(
+            [
+                (
+                    "factory:MultiFeeDistributionFactory",
+                    self._deploy(
+                        MultiFeeDistributionFactory,
+                        self.manifest["ichi_vault_factory"],
+                        self.address("implementation:MultiFeeDistributionClone"),
+                    ),
+                ),
+                (
+                    "factory:RewardCampaignDistributorFactory",
+                    self._deploy(
+                        RewardCampaignDistributorFactory,
+                        self.address("implementation:RewardCampaignDistributor"),
+                        self.address("implementation:MultiTokenCampaignDistributor"),
+                    ),
+                ),
+            ]
+        )
+        mfd_factory = MultiFeeDistributionFactory.at(
+            self.address("factory:MultiFeeDistributionFactory")
+        )
+        distributor_factory = RewardCampaignDistributorFactory.at(
+            self.address("factory:RewardCampaignDistributorFactory")
+        )
 
-gas_strategy = GasNowScalingStrategy("standard", "fast")
+        self._stage(self._ownership_steps(mfd_factory))
+        self._stage(
+            [self._staker(mfd_factory, staker) for staker in self.manifest.get("stakers", [])]
+        )
+        self._stage(
+            [
+                self._distributor(mfd_factory, distributor_factory, distributor)
+                for distributor in self.manifest.get("distributors", [])
+            ]
+            + [
+                self._multi_token_distributor(mfd_factory, distributor_factory, distributor)
+                for distributor in self.manifest.get("multi_token_distributors", [])
+            ]
+        )
+        self._stage(self._ownership_steps(distributor_factory))
+
+        return {
+            step_id: step["address"] for step_id, step in self.steps.items() if "address" in step
+        }
+
+    # a step is a `(step_id, (send, result))` pair: `send(tx_params)` sends the transaction and
+    # `result(tx)` returns what to record once it is confirmed. `send` is None for a step that is
+    # already done on chain, whose `result(None)` returns the known address
+
+    def _deploy(self, container, *args):
+        def send(params):
+            return container.deploy(*args, params)
+
+        return (send, lambda tx: tx.contract_address)
+
+    def _ownership_steps(self, factory):
+        owner = self.manifest.get("owner")
+        if not owner or factory.owner() == owner:
+            return []
+
+        def send(params):
+            return factory.transferOwnership(owner, params)
+
+        return [(f"owner:{factory.address}", (send, lambda tx: owner))]
+
+    def _staker(self, factory, staker):
+        vault = staker["vault"]
+        existing = factory.vaultToStaker(vault)
+        if existing != ZERO_ADDRESS:
+            return (_staker_step(vault), (None, lambda tx: existing))
+
+        deploy_fn = factory.deployStakerClone if staker.get("clone") else factory.deployStaker
+
+        def send(params):
+            return deploy_fn(vault, params)
+
+        return (_staker_step(vault), (send, lambda tx: tx.events["StakerCreated"]["ichiVault"]))
+
+    def _mfd(self, factory, vault):
+        mfd = self.address(_staker_step(vault)) or factory.vaultToStaker(vault)
+        if mfd == ZERO_ADDRESS:
+            raise DeploymentError(f"vault {vault} has no staker")
+        return mfd
+
+    def _distributor(self, mfd_factory, factory, distributor):
+        mfd = self._mfd(mfd_factory, distributor["vault"])
+        token = distributor["reward_token"]
+        step_id = f"distributor:{distributor['vault']}:{token}"
+        existing = factory.getDistributor(mfd, token)
+        if existing != ZERO_ADDRESS:
+            return (step_id, (None, lambda tx: existing))
+
+        def send(params):
+            return factory.createRewardCampaignDistributor(mfd, token, params)
+
+        def result(tx):
+            return tx.events["RewardCampaignDistributorCreated"]["distributor"]
+
+        return (step_id, (send, result))
+
+    def _multi_token_distributor(self, mfd_factory, factory, distributor):
+        mfd = self._mfd(mfd_factory, distributor["vault"])
+        step_id = f"multi_token_distributor:{distributor['vault']}"
+        existing = factory.getMultiTokenDistributor(mfd)
+        if existing != ZERO_ADDRESS:
+            return (step_id, (None, lambda tx: existing))
+
+        def send(params):
+            return factory.createMultiTokenCampaignDistributor(mfd, params)
+
+        def result(tx):
+            return tx.events["MultiTokenCampaignDistributorCreated"]["distributor"]
+
+        return (step_id, (send, result))
+
+    def _stage(self, steps):
+        """Send every step that is not confirmed yet, then wait for all of them."""
+        steps = [(step_id, fns) for step_id, fns in steps if not self.address(step_id)]
+        if not steps:
+            return
+
+        params = {**eip1559_fees(), "from": self.account, "required_confs": 0}
+        nonce = web3.eth.get_transaction_count(self.account.address, "pending")
+        in_flight = []
+        for step_id, (send, result) in steps:
+            if send is None:
+                self._record(step_id, address=result(None))
+                continue
+            tx = self._recover(step_id)
+            if tx is None:
+                tx = send({**params, "nonce": nonce})
+                self._record(step_id, tx=tx.txid, nonce=nonce)
+                nonce += 1
+            in_flight.append((step_id, tx, result))
+
+        failed = []
+        for step_id, tx, result in in_flight:
+            try:
+                tx.wait(1)
+            except VirtualMachineError:
+                pass
+            if tx.status != 1:
+                failed.append(f"{step_id} ({tx.txid})")
+                continue
+            self._record(step_id, address=result(tx))
+
+        if failed:
+            raise DeploymentError(f"reverted: {', '.join(failed)}")
+
+    def _recover(self, step_id):
+        """The transaction of a step sent by an earlier run, if it is mined or still pending."""
+        txid = self.steps.get(step_id, {}).get("tx")
+        if txid is None:
+            return None
+        try:
+            receipt = web3.eth.get_transaction_receipt(txid)
+        except TransactionNotFound:
+            receipt = None
+        if receipt is None:
+            try:
+                web3.eth.get_transaction(txid)
+            except TransactionNotFound:
+                # dropped or replaced, send it again
+                return None
+        elif receipt["status"] != 1:
+            return None
+        return chain.get_transaction(txid)
+
+    def _record(self, step_id, **fields):
+        self.steps.setdefault(step_id, {}).update(fields)
+        self._save()
+
+    def _save(self):
+        # replace the file in one step, so an interrupted write cannot corrupt the state
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as fp:
+            json.dump(self.state, fp, indent=2)
+        os.replace(tmp_path, self.state_path)
 
 
 def main():
-    multi_fee_distribution = MultiFeeDistribution.deploy(
-        OWNER, STAKING_TOKEN_ADDRESS, {"from": DEPLOYER, "gas_price": gas_strategy}
-    )
-
-    print(
-        f"""Success!
-MultiFeeDistribution deployed to: {multi_fee_distribution}
-Owner: {OWNER}
-Please verify the source code here: https://etherscan.io/verifyContract?a={multi_fee_distribution}
-Compiler version: 0.5.17
-Optimization: ON
-"""
-    )
+    with open(MANIFEST_PATH) as fp:
+        manifest = json.load(fp)
+    deployment = Deployment(manifest, accounts.load(DEPLOYER_ACCOUNT))
+    for step_id, address in deployment.run().items():
+        print(f"{step_id}: {address}")
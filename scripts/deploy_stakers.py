@@ -0,0 +1,84 @@
+"""
+Deploy MultiFeeDistribution stakers for many ICHI vaults through the factory.
+
+Staker addresses are CREATE2 addresses derived from the vault, so they are known before
+deployment. `plan` reads the staker of every vault from the factory's `predictStakerAddress` view
+and marks the vaults that already have one in `vaultToStaker`. `deploy` sends the remaining vaults
+to `deployStakers` in batches, and checks every created staker against its prediction.
+Transactions are priced with `eip1559_fees`.
+"""
+
+from brownie import MultiFeeDistributionFactory, accounts
+from eth_utils import to_checksum_address
+
+from scripts.deploy import eip1559_fees
+
+ZERO_ADDRESS = "0x" + "00" * 20
+
+# address of the MultiFeeDistributionFactory
+FACTORY_ADDRESS = "0x"
+
+# ICHI vaults to deploy stakers for
+VAULT_ADDRESSES = []
+
+# brownie account id that sends the deployments, it does not need to own the factory
+DEPLOYER_ACCOUNT = "deployer"
+
+# a staker deployment costs several million gas, keep a batch well below the block gas limit
+STAKERS_PER_TX = 4
+
+
+def plan(factory, vaults):
+    """
+    Predicted staker of every vault, in order and without duplicates.
+
+    Returns a list of `{"vault", "staker", "deployed"}` dicts, where `deployed` tells whether the
+    vault already has a staker in `vaultToStaker`.
+    """
+    entries = []
+    for vault in dict.fromkeys(to_checksum_address(str(v)) for v in vaults):
+        existing = factory.vaultToStaker(vault)
+        entries.append(
+            {
+                "vault": vault,
+                "staker": factory.predictStakerAddress(vault),
+                "deployed": existing != ZERO_ADDRESS,
+            }
+        )
+    return entries
+
+
+def deploy(factory, vaults, sender, batch_size=STAKERS_PER_TX, tx_params=None):
+    """
+    Deploy the stakers of the vaults that have none yet and return them as `{vault: staker}`.
+
+    Vaults that already have a staker are skipped. A batch fails as a whole, so the vaults of
+    batches sent before a failure keep their stakers and are skipped when the call is repeated.
+    """
+    pending = [entry for entry in plan(factory, vaults) if not entry["deployed"]]
+    params = {**eip1559_fees(), **(tx_params or {}), "from": sender}
+
+    deployed = {}
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start : start + batch_size]
+        tx = factory.deployStakers([entry["vault"] for entry in batch], params)
+        created = [event["ichiVault"] for event in tx.events["StakerCreated"]]
+        for entry, staker in zip(batch, created):
+            if staker != entry["staker"]:
+                raise ValueError(
+                    f"staker of {entry['vault']} deployed to {staker}, expected {entry['staker']}"
+                )
+            deployed[entry["vault"]] = staker
+    return deployed
+
+
+def main():
+    factory = MultiFeeDistributionFactory.at(FACTORY_ADDRESS)
+    entries = plan(factory, VAULT_ADDRESSES)
+    for entry in entries:
+        status = "already deployed" if entry["deployed"] else "to deploy"
+        print(f"{entry['vault']} -> {entry['staker']} ({status})")
+
+    deployer = accounts.load(DEPLOYER_ACCOUNT)
+    deployed = deploy(factory, VAULT_ADDRESSES, deployer)
+    print(f"Success! Deployed {len(deployed)} stakers, skipped {len(entries) - len(deployed)}")
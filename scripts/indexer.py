@@ -0,0 +1,305 @@
+"""
+Streaming event indexer for MultiFeeDistribution stakers and reward campaign distributors.
+
+Logs are fetched with `eth_getLogs` in block-range chunks. A chunk that the node rejects (too
+many results, timeouts) is halved and retried, and the range grows again while chunks come back
+small. Each chunk is written to a SQLite store in a single transaction together with the
+checkpoint, so an interrupted run resumes from the last committed block without gaps or
+duplicates.
+
+Stakers and distributors are discovered from the `StakerCreated`,
+`RewardCampaignDistributorCreated` and `MultiTokenCampaignDistributorCreated` logs of the
+watched factories, so watching the two factories is enough to index every contract they deploy.
+"""
+
+import json
+import sqlite3
+
+import eth_event
+from brownie import (
+    MultiFeeDistribution,
+    MultiFeeDistributionFactory,
+    MultiTokenCampaignDistributor,
+    RewardCampaignDistributor,
+    RewardCampaignDistributorFactory,
+    web3,
+)
+from requests.exceptions import Timeout
+
+try:
+    from web3.exceptions import Web3RPCError
+
+    RPC_ERRORS = (ValueError, Timeout, Web3RPCError)
+except ImportError:
+    RPC_ERRORS = (ValueError, Timeout)
+
+# factories to index when run as a script, and the block they were deployed at
+MFD_FACTORY_ADDRESS = "0x"
+DISTRIBUTOR_FACTORY_ADDRESS = "0x"
+START_BLOCK = 0
+DB_PATH = "events.db"
+
+MFD_FACTORY = "mfd_factory"
+DISTRIBUTOR_FACTORY = "distributor_factory"
+MFD = "mfd"
+DISTRIBUTOR = "distributor"
+MULTI_TOKEN_DISTRIBUTOR = "multi_token_distributor"
+
+INDEXED_EVENTS = {
+    MFD_FACTORY: ["StakerCreated"],
+    DISTRIBUTOR_FACTORY: [
+        "RewardCampaignDistributorCreated",
+        "MultiTokenCampaignDistributorCreated",
+    ],
+    MFD: ["Stake", "Unstake", "RewardPaid", "Recovered"],
+    DISTRIBUTOR: ["CampaignSet", "RewardsDistributed"],
+    MULTI_TOKEN_DISTRIBUTOR: ["CampaignSet", "RewardsDistributed"],
+}
+
+# factory event -> (argument holding the new contract, kind of the new contract)
+DISCOVERY = {
+    "StakerCreated": ("ichiVault", MFD),
+    "RewardCampaignDistributorCreated": ("distributor", DISTRIBUTOR),
+    "MultiTokenCampaignDistributorCreated": ("distributor", MULTI_TOKEN_DISTRIBUTOR),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoint (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    block INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS contracts (
+    address TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    block INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    block INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    tx_hash TEXT NOT NULL,
+    address TEXT NOT NULL,
+    name TEXT NOT NULL,
+    args TEXT NOT NULL,
+    PRIMARY KEY (block, log_index)
+);
+CREATE INDEX IF NOT EXISTS events_by_name ON events (name, address);
+"""
+
+
+def _topic_map():
+    containers = {
+        MFD_FACTORY: MultiFeeDistributionFactory,
+        DISTRIBUTOR_FACTORY: RewardCampaignDistributorFactory,
+        MFD: MultiFeeDistribution,
+        DISTRIBUTOR: RewardCampaignDistributor,
+        MULTI_TOKEN_DISTRIBUTOR: MultiTokenCampaignDistributor,
+    }
+    abi = []
+    for kind, names in INDEXED_EVENTS.items():
+        abi += [
+            item
+            for item in containers[kind].abi
+            if item["type"] == "event" and item["name"] in names
+        ]
+    return eth_event.get_topic_map(abi)
+
+
+def _hex(value):
+    return value if isinstance(value, str) else "0x" + bytes(value).hex()
+
+
+class EventIndexer:
+    """
+    Index the logs of the watched factories and of every contract they deploy into `db_path`.
+
+    `start_block` only applies to a new store; an existing store resumes from its checkpoint.
+    Blocks younger than `confirmations` are left for the next run.
+    """
+
+    def __init__(
+        self,
+        db_path,
+        start_block=0,
+        chunk_size=2_000,
+        min_chunk_size=1,
+        max_chunk_size=100_000,
+        target_logs=5_000,
+        confirmations=0,
+    ):
+        self.db = sqlite3.connect(db_path)
+        self.db.executescript(SCHEMA)
+        self.db.execute(
+            "INSERT OR IGNORE INTO checkpoint (id, block) VALUES (0, ?)", (start_block - 1,)
+        )
+        self.db.commit()
+
+        self.chunk_size = chunk_size
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.target_logs = target_logs
+        self.confirmations = confirmations
+        self.topic_map = _topic_map()
+
+    def close(self):
+        self.db.close()
+
+    @property
+    def checkpoint(self):
+        """Last block whose logs are fully stored."""
+        return self.db.execute("SELECT block FROM checkpoint").fetchone()[0]
+
+    def contracts(self, kind=None):
+        """Watched addresses, optionally restricted to one kind."""
+        query = "SELECT address, kind FROM contracts"
+        rows = self.db.execute(query).fetchall()
+        return {address: k for address, k in rows if kind is None or k == kind}
+
+    def watch(self, address, kind, block=None):
+        """Start indexing `address`, a contract of the given kind, from `block` on."""
+        if kind not in INDEXED_EVENTS:
+            raise ValueError(f"unknown contract kind: {kind}")
+        if block is None:
+            block = self.checkpoint + 1
+        self.db.execute(
+            "INSERT OR IGNORE INTO contracts (address, kind, block) VALUES (?, ?, ?)",
+            (str(address), kind, block),
+        )
+        self.db.commit()
+
+    def events(self, name=None, address=None):
+        """Stored events in chain order, as dicts."""
+        query = "SELECT block, log_index, tx_hash, address, name, args FROM events"
+        conditions, params = [], []
+        if name is not None:
+            conditions.append("name = ?")
+            params.append(name)
+        if address is not None:
+            conditions.append("address = ?")
+            params.append(str(address))
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY block, log_index"
+        for row in self.db.execute(query, params):
+            yield self._row_to_event(row)
+
+    def run(self, to_block=None):
+        """Index up to `to_block` (default: the confirmed head) and return the new event count."""
+        return sum(len(chunk) for chunk in self.stream(to_block))
+
+    def stream(self, to_block=None):
+        """
+        Index up to `to_block`, yielding the decoded events of each chunk once it is committed.
+        """
+        if to_block is None:
+            to_block = web3.eth.block_number - self.confirmations
+
+        from_block = self.checkpoint + 1
+        while from_block <= to_block:
+            end_block = min(from_block + self.chunk_size - 1, to_block)
+            try:
+                (events, new_contracts) = self._fetch_chunk(from_block, end_block)
+            except RPC_ERRORS:
+                if self.chunk_size <= self.min_chunk_size:
+                    raise
+                self.chunk_size = max(self.min_chunk_size, self.chunk_size // 2)
+                continue
+
+            self._commit_chunk(events, new_contracts, end_block)
+            yield events
+
+            if len(events) < self.target_logs // 2:
+                self.chunk_size = min(self.max_chunk_size, self.chunk_size * 2)
+            from_block = end_block + 1
+
+    def _get_logs(self, addresses, from_block, to_block):
+        if not addresses:
+            return []
+        return web3.eth.get_logs(
+            {
+                "fromBlock": from_block,
+                "toBlock": to_block,
+                "address": list(addresses),
+                "topics": [list(self.topic_map)],
+            }
+        )
+
+    def _fetch_chunk(self, from_block, to_block):
+        watched = self.contracts()
+        logs = self._get_logs(watched, from_block, to_block)
+
+        # a contract deployed within the chunk missed the first query, so its logs are fetched
+        # from its deployment block on, until no further contracts are discovered
+        events, new_contracts = {}, {}
+        while logs:
+            discovered = {}
+            for log in logs:
+                event = self._decode(log)
+                events[(event["block"], event["log_index"])] = event
+                if event["name"] in DISCOVERY:
+                    arg, kind = DISCOVERY[event["name"]]
+                    address = event["args"][arg]
+                    if address not in watched and address not in discovered:
+                        discovered[address] = (kind, event["block"])
+
+            for address, (kind, _) in discovered.items():
+                watched[address] = kind
+            new_contracts.update(discovered)
+            first_block = min((block for _, block in discovered.values()), default=None)
+            logs = self._get_logs(discovered, first_block, to_block) if discovered else []
+
+        return [events[key] for key in sorted(events)], new_contracts
+
+    def _decode(self, log):
+        decoded = eth_event.decode_log(log, self.topic_map)
+        return {
+            "block": log["blockNumber"],
+            "log_index": log["logIndex"],
+            "tx_hash": _hex(log["transactionHash"]),
+            "address": log["address"],
+            "name": decoded["name"],
+            "args": {item["name"]: item["value"] for item in decoded["data"]},
+        }
+
+    def _commit_chunk(self, events, new_contracts, end_block):
+        with self.db:
+            self.db.executemany(
+                "INSERT OR IGNORE INTO contracts (address, kind, block) VALUES (?, ?, ?)",
+                [(address, kind, block) for address, (kind, block) in new_contracts.items()],
+            )
+            self.db.executemany(
+                "INSERT OR IGNORE INTO events (block, log_index, tx_hash, address, name, args) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        e["block"],
+                        e["log_index"],
+                        e["tx_hash"],
+                        e["address"],
+                        e["name"],
+                        json.dumps(e["args"]),
+                    )
+                    for e in events
+                ],
+            )
+            self.db.execute("UPDATE checkpoint SET block = ? WHERE id = 0", (end_block,))
+
+    @staticmethod
+    def _row_to_event(row):
+        (block, log_index, tx_hash, address, name, args) = row
+        return {
+            "block": block,
+            "log_index": log_index,
+            "tx_hash": tx_hash,
+            "address": address,
+            "name": name,
+            "args": json.loads(args),
+        }
+
+
+def main():
+    indexer = EventIndexer(DB_PATH, start_block=START_BLOCK, confirmations=12)
+    indexer.watch(MFD_FACTORY_ADDRESS, MFD_FACTORY)
+    indexer.watch(DISTRIBUTOR_FACTORY_ADDRESS, DISTRIBUTOR_FACTORY)
+    for events in indexer.stream():
+        print(f"indexed up to block {indexer.checkpoint}: {len(events)} events")
+    indexer.close()
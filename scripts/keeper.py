@@ -0,0 +1,223 @@
+"""
+Keeper that calls `distributeRewards()` on every RewardCampaignDistributor and
+MultiTokenCampaignDistributor of a factory.
+
+Each round the keeper picks up distributors created since the last round, then reads
+`distributionEnabled()`, `getCampaign()` and `lastDistribution()` of every distributor
+concurrently, per reward token for multi-token distributors. Reads go through a bounded thread
+pool, so at most `max_connections` RPC requests are in flight. A campaign is due once its
+distribution is enabled and `cadence` seconds have passed since its last distribution, measured
+in chain time, and a distributor is due once any of its campaigns is. Due distributions are
+simulated first and then sent concurrently, with nonces assigned by the keeper. A send that fails
+is retried with exponential backoff after reading the nonce from the node again.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from brownie import (
+    MultiTokenCampaignDistributor,
+    RewardCampaignDistributor,
+    RewardCampaignDistributorFactory,
+    accounts,
+    web3,
+)
+from brownie.exceptions import VirtualMachineError
+from requests.exceptions import Timeout
+
+# address of the RewardCampaignDistributorFactory
+FACTORY_ADDRESS = "0x"
+
+# brownie account id of the keeper, which needs the distributor role on every distributor
+KEEPER_ACCOUNT = "keeper"
+
+# minimum time between two distributions of a distributor, in seconds
+CADENCE = 86400
+
+# time between two rounds, in seconds
+POLL_INTERVAL = 300
+
+RPC_ERRORS = (ValueError, Timeout, VirtualMachineError)
+
+
+class Keeper:
+    def __init__(
+        self,
+        factory,
+        account,
+        cadence=CADENCE,
+        max_connections=8,
+        max_retries=3,
+        retry_delay=5,
+        tx_params=None,
+    ):
+        self.factory = factory
+        self.account = account
+        self.cadence = cadence
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.tx_params = tx_params or {}
+
+        self.distributors = []
+        self.multi_token_distributors = []
+        self.nonce = None
+        self._nonce_lock = None
+        self._pool = ThreadPoolExecutor(max_workers=max_connections)
+
+    def close(self):
+        self._pool.shutdown()
+
+    async def _call(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, partial(fn, *args, **kwargs))
+
+    async def _new_distributors(self, known, length_fn, address_fn, container):
+        length = await self._call(length_fn)
+        addresses = await asyncio.gather(
+            *(self._call(address_fn, i) for i in range(len(known), length))
+        )
+        known += await asyncio.gather(*(self._call(container.at, address) for address in addresses))
+        return known
+
+    async def refresh_distributors(self):
+        """Add distributors created since the last refresh and return all of them."""
+        factory = self.factory
+        await asyncio.gather(
+            self._new_distributors(
+                self.distributors,
+                factory.allDistributorsLength,
+                factory.allDistributors,
+                RewardCampaignDistributor,
+            ),
+            self._new_distributors(
+                self.multi_token_distributors,
+                factory.allMultiTokenDistributorsLength,
+                factory.allMultiTokenDistributors,
+                MultiTokenCampaignDistributor,
+            ),
+        )
+        return self.distributors + self.multi_token_distributors
+
+    async def poll(self, distributor):
+        """
+        `(enabled, campaign, last_distribution)` of every campaign of a distributor, one per
+        reward token for multi-token distributors.
+        """
+        if distributor in self.multi_token_distributors:
+            length = await self._call(distributor.rewardTokensLength)
+            tokens = await asyncio.gather(
+                *(self._call(distributor.rewardTokens, i) for i in range(length))
+            )
+            campaigns = await asyncio.gather(
+                *(
+                    asyncio.gather(
+                        self._call(distributor.tokenDistributionEnabled, token),
+                        self._call(distributor.getCampaign, token),
+                        self._call(distributor.lastDistribution, token),
+                    )
+                    for token in tokens
+                )
+            )
+        else:
+            campaigns = [
+                await asyncio.gather(
+                    self._call(distributor.distributionEnabled),
+                    self._call(distributor.getCampaign),
+                    self._call(distributor.lastDistribution),
+                )
+            ]
+        return {"distributor": distributor, "campaigns": [tuple(c) for c in campaigns]}
+
+    def is_due(self, status, timestamp):
+        return any(
+            self._is_campaign_due(enabled, campaign, last_distribution, timestamp)
+            for (enabled, campaign, last_distribution) in status["campaigns"]
+        )
+
+    def _is_campaign_due(self, enabled, campaign, last_distribution, timestamp):
+        if not enabled:
+            return False
+        (start_time, end_time, _, remaining_amount, is_active) = campaign
+        if not is_active or remaining_amount == 0:
+            return False
+        # the final share is sent as soon as the campaign has ended
+        if timestamp >= end_time:
+            return True
+        return timestamp >= max(last_distribution, start_time) + self.cadence
+
+    async def _send(self, distributor):
+        async with self._nonce_lock:
+            if self.nonce is None:
+                self.nonce = await self._call(
+                    web3.eth.get_transaction_count, self.account.address, "pending"
+                )
+            params = {**self.tx_params, "from": self.account, "nonce": self.nonce}
+            try:
+                tx = await self._call(
+                    distributor.distributeRewards, {**params, "required_confs": 0}
+                )
+            except RPC_ERRORS:
+                # the nonce is either still free or was taken by a transaction sent from
+                # elsewhere, so it is read again from the node before the next send
+                self.nonce = None
+                raise
+            self.nonce += 1
+            return tx
+
+    async def distribute(self, distributor):
+        """
+        Send `distributeRewards()` and wait for it to be mined, retrying with exponential backoff.
+
+        Returns the transaction, or None if the distribution would revert or every attempt failed.
+        """
+        try:
+            await self._call(distributor.distributeRewards.call, {"from": self.account})
+        except RPC_ERRORS:
+            return None
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+            try:
+                tx = await self._send(distributor)
+                await self._call(tx.wait, 1)
+            except RPC_ERRORS:
+                continue
+            if tx.status == 1:
+                return tx
+        return None
+
+    async def run_once(self):
+        """Run a single round and return the transactions of the distributions it sent."""
+        # created per round, as every asyncio.run has its own event loop
+        self._nonce_lock = asyncio.Lock()
+
+        distributors = await self.refresh_distributors()
+        (statuses, block) = await asyncio.gather(
+            asyncio.gather(*(self.poll(d) for d in distributors)),
+            self._call(web3.eth.get_block, "latest"),
+        )
+        due = [s["distributor"] for s in statuses if self.is_due(s, block["timestamp"])]
+        txs = await asyncio.gather(*(self.distribute(d) for d in due))
+        return [tx for tx in txs if tx is not None]
+
+    async def run(self, poll_interval=POLL_INTERVAL, rounds=None):
+        completed = 0
+        while rounds is None or completed < rounds:
+            for tx in await self.run_once():
+                for event in tx.events["RewardsDistributed"]:
+                    print(f"distributed {event['amount']} via {tx.receiver}")
+            completed += 1
+            if rounds is None or completed < rounds:
+                await asyncio.sleep(poll_interval)
+
+
+def main():
+    keeper = Keeper(
+        RewardCampaignDistributorFactory.at(FACTORY_ADDRESS), accounts.load(KEEPER_ACCOUNT)
+    )
+    try:
+        asyncio.run(keeper.run())
+    finally:
+        keeper.close()
@@ -0,0 +1,187 @@
+"""
+Build the Merkle root of a MerkleCampaignDistributor campaign from the stake history of a staker.
+
+The entitlement of a user is their share of the stake time of the campaign window: the amount
+staked multiplied by the seconds it stayed staked between `start` and `end`, summed over the
+`Stake` and `Unstake` events of the staker. The campaign amount is split pro rata, rounding
+down, and users with nothing due are left out of the tree.
+
+History comes either from the store of an `EventIndexer` watching the staker or, for short
+ranges, straight from `eth_getLogs`. It has to begin at the deployment of the staker, as the
+balances at `start` are rebuilt from it. Block timestamps are fetched once per block.
+
+Leaves are `keccak256(abi.encodePacked(index, account, amount))` in account order and pairs are
+hashed sorted, matching OpenZeppelin's `MerkleProof`. Every level of the tree is kept, so the
+proofs of all leaves are read off it without hashing again. Hashing is the only cost that grows
+with the leaf count, about two hashes per leaf.
+
+The output is a JSON file with the root, the total and the claim of every account:
+
+    {
+        "merkleRoot": "0x...",
+        "total": 1000,
+        "claims": {"0x...": {"index": 0, "amount": 10, "proof": ["0x..."]}}
+    }
+"""
+
+import json
+
+from brownie import MultiFeeDistribution, web3
+from eth_hash.auto import keccak
+from eth_utils import to_checksum_address
+
+# staker and campaign window when run as a script
+MFD_ADDRESS = "0x"
+START_TIME = 0
+END_TIME = 0
+CAMPAIGN_AMOUNT = 0
+OUTPUT_PATH = "merkle-campaign.json"
+
+
+def stake_events(multi, from_block=0, to_block=None):
+    """`Stake` and `Unstake` events of a staker from `eth_getLogs`, in the format of the indexer."""
+    events = []
+    for name in ("Stake", "Unstake"):
+        for log in multi.events.get_sequence(from_block, to_block, name):
+            events.append(
+                {
+                    "block": log["blockNumber"],
+                    "log_index": log["logIndex"],
+                    "address": multi.address,
+                    "name": name,
+                    "args": dict(log["args"]),
+                }
+            )
+    return sorted(events, key=lambda e: (e["block"], e["log_index"]))
+
+
+class BlockTimes:
+    """Block number to timestamp, fetching each block once."""
+
+    def __init__(self):
+        self.cache = {}
+
+    def __call__(self, block):
+        if block not in self.cache:
+            self.cache[block] = web3.eth.get_block(block)["timestamp"]
+        return self.cache[block]
+
+
+def stake_weights(events, start, end, block_time):
+    """
+    Stake time of every user between `start` and `end`, from their `Stake` and `Unstake`
+    events in chain order.
+    """
+    balances = {}
+    since = {}
+    weights = {}
+    checksummed = {}
+    for event in events:
+        time = min(max(block_time(event["block"]), start), end)
+        args = event["args"]
+        user = checksummed.get(args["user"])
+        if user is None:
+            user = checksummed[args["user"]] = to_checksum_address(args["user"])
+        if event["name"] == "Stake":
+            delta = int(args["amount"])
+        elif event["name"] == "Unstake":
+            delta = -int(args["receivedAmount"])
+        else:
+            continue
+
+        balance = balances.get(user, 0)
+        weights[user] = weights.get(user, 0) + balance * (time - since.get(user, start))
+        since[user] = time
+        balances[user] = balance + delta
+
+    for user, balance in balances.items():
+        weights[user] = weights.get(user, 0) + balance * (end - since.get(user, start))
+    return {user: weight for user, weight in weights.items() if weight > 0}
+
+
+def allocate(weights, amount):
+    """Split `amount` pro rata to `weights`, rounding down, and drop users with nothing due."""
+    total = sum(weights.values())
+    if total == 0:
+        return {}
+    shares = {user: amount * weight // total for user, weight in weights.items()}
+    return {user: share for user, share in shares.items() if share > 0}
+
+
+def leaf(index, account, amount):
+    return keccak(
+        index.to_bytes(32, "big") + bytes.fromhex(account[2:]) + amount.to_bytes(32, "big")
+    )
+
+
+def hash_pair(a, b):
+    return keccak(a + b) if a < b else keccak(b + a)
+
+
+class MerkleTree:
+    """Sorted-pair Merkle tree over 32-byte leaves. An unpaired last node moves up unchanged."""
+
+    def __init__(self, leaves):
+        if not leaves:
+            raise ValueError("a Merkle tree needs at least one leaf")
+        self.levels = [list(leaves)]
+        level = self.levels[0]
+        while len(level) > 1:
+            parents = [hash_pair(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                parents.append(level[-1])
+            self.levels.append(parents)
+            level = parents
+
+    @property
+    def root(self):
+        return self.levels[-1][0]
+
+    def proof(self, index):
+        proof = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                proof.append(level[sibling])
+            index //= 2
+        return proof
+
+
+def verify(proof, root, node):
+    """Same check as `MerkleProof.verify`, to validate proofs off-chain."""
+    for sibling in proof:
+        node = hash_pair(node, sibling)
+    return node == root
+
+
+def build_campaign(amounts):
+    """
+    Root, total and claims of a campaign paying `amounts` (account -> amount), keyed by the
+    accounts as given. Checksumming costs a hash per account, callers pass them checksummed.
+    """
+    accounts = sorted(amounts, key=str.lower)
+    tree = MerkleTree([leaf(i, account, amounts[account]) for i, account in enumerate(accounts)])
+    return {
+        "merkleRoot": "0x" + tree.root.hex(),
+        "total": sum(amounts.values()),
+        "claims": {
+            account: {
+                "index": i,
+                "amount": amounts[account],
+                "proof": ["0x" + node.hex() for node in tree.proof(i)],
+            }
+            for i, account in enumerate(accounts)
+        },
+    }
+
+
+def main():
+    multi = MultiFeeDistribution.at(MFD_ADDRESS)
+    weights = stake_weights(stake_events(multi), START_TIME, END_TIME, BlockTimes())
+    campaign = build_campaign(allocate(weights, CAMPAIGN_AMOUNT))
+    with open(OUTPUT_PATH, "w") as fp:
+        json.dump(campaign, fp, indent=2)
+    print(
+        f"{len(campaign['claims'])} claims of {campaign['total']} in total, "
+        f"root {campaign['merkleRoot']}"
+    )
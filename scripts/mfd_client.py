@@ -0,0 +1,211 @@
+"""
+Read the full state of a MultiFeeDistribution through Multicall3.
+
+Reading a staker one getter at a time costs a round-trip per reward token, user and pair of
+both. `MFDClient` packs the getters into `aggregate3` calls instead: a first round reads the
+totals, the collection settings, the active and retired reward token lists and the user data,
+and a second round reads the per-token and per-user-and-token values. Every call of a snapshot
+is pinned to the same block, so the result is a consistent view even while new blocks arrive.
+
+On mainnet and most L2s Multicall3 lives at `MULTICALL3_ADDRESS`. On local chains deploy
+`MockMulticall3` and pass it as `multicall`.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List
+
+from brownie import Contract, MultiFeeDistribution, web3
+
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+ZERO_ADDRESS = "0x" + "00" * 20
+
+MULTICALL3_ABI = [
+    {
+        "name": "aggregate3",
+        "type": "function",
+        "stateMutability": "payable",
+        "inputs": [
+            {
+                "name": "calls",
+                "type": "tuple[]",
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"},
+                ],
+            }
+        ],
+        "outputs": [
+            {
+                "name": "returnData",
+                "type": "tuple[]",
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"},
+                ],
+            }
+        ],
+    }
+]
+
+# calls per aggregate3, well within the gas cap of an eth_call for these getters
+MAX_CALLS = 500
+
+
+@dataclass(frozen=True)
+class RewardState:
+    token: str
+    amount: int
+    last_time_updated: int
+    retired_index: int
+    reward_per_token: int
+
+
+@dataclass(frozen=True)
+class RewardStreamState:
+    token: str
+    reward_rate: int
+    period_finish: int
+    last_update_time: int
+    reserve: int
+
+
+@dataclass(frozen=True)
+class UserState:
+    user: str
+    token_amount: int
+    last_time_updated: int
+    retired_rewards_settled: int
+    # reward token -> settled but unclaimed amount
+    claimable: Dict[str, int]
+    # reward token -> reward per token at the last settlement
+    reward_per_token: Dict[str, int]
+    # retired reward token -> amount getReward would pay, settled or not
+    claimable_retired: Dict[str, int]
+
+
+@dataclass(frozen=True)
+class MFDSnapshot:
+    address: str
+    block: int
+    total_stakes: int
+    last_collection_block: int
+    last_collection_time: int
+    collection_interval: int
+    active_reward_streams: int
+    reward_tokens: List[str]
+    retired_reward_tokens: List[str]
+    # active and retired reward tokens
+    rewards: Dict[str, RewardState]
+    # active reward tokens, a token that was never streamed has all fields zero
+    streams: Dict[str, RewardStreamState]
+    users: Dict[str, UserState]
+
+
+class MFDClient:
+    """Batched reads of one MultiFeeDistribution, each snapshot pinned to a single block."""
+
+    def __init__(self, multi, multicall=MULTICALL3_ADDRESS, max_calls=MAX_CALLS):
+        if isinstance(multi, str):
+            multi = MultiFeeDistribution.at(multi)
+        if isinstance(multicall, str):
+            multicall = Contract.from_abi("Multicall3", multicall, MULTICALL3_ABI)
+        self.multi = multi
+        self.multicall = multicall
+        self.max_calls = max_calls
+        self.rpc_calls = 0
+
+    def aggregate(self, calls, block_identifier):
+        """
+        Run `(getter, args)` pairs of the staker at `block_identifier` and return their
+        decoded results, using as few `eth_call`s as `max_calls` allows.
+        """
+        encoded = [(self.multi.address, False, fn.encode_input(*args)) for fn, args in calls]
+        results = []
+        for start in range(0, len(encoded), self.max_calls):
+            chunk = encoded[start : start + self.max_calls]
+            results += self.multicall.aggregate3.call(chunk, block_identifier=block_identifier)
+            self.rpc_calls += 1
+        return [fn.decode_output(data) for (fn, _), (_, data) in zip(calls, results)]
+
+    def snapshot(self, users=(), block_identifier=None):
+        """Staker state and the state of every user in `users`, read at one block."""
+        if block_identifier is None:
+            block_identifier = web3.eth.block_number
+        multi = self.multi
+        users = list(dict.fromkeys(str(user) for user in users))
+
+        (
+            total_stakes,
+            last_collection_block,
+            last_collection_time,
+            collection_interval,
+            active_reward_streams,
+            (reward_tokens, _),
+            (retired_reward_tokens, _),
+            *user_results,
+        ) = self.aggregate(
+            [
+                (multi.totalStakes, ()),
+                (multi.lastCollectionBlock, ()),
+                (multi.lastCollectionTime, ()),
+                (multi.collectionInterval, ()),
+                (multi.activeRewardStreams, ()),
+                (multi.claimableRewardsForMany, ([], [])),
+                (multi.claimableRetiredRewards, (ZERO_ADDRESS,)),
+            ]
+            + [(multi.userData, (user,)) for user in users]
+            + [(multi.claimableRetiredRewards, (user,)) for user in users],
+            block_identifier,
+        )
+        reward_tokens = [str(token) for token in reward_tokens]
+        retired_reward_tokens = [str(token) for token in retired_reward_tokens]
+        all_tokens = reward_tokens + retired_reward_tokens
+        (user_data, claimable_retired) = (user_results[: len(users)], user_results[len(users) :])
+
+        pairs = [(user, token) for user in users for token in reward_tokens]
+        results = self.aggregate(
+            [(multi.rewardData, (token,)) for token in all_tokens]
+            + [(multi.rewardStreams, (token,)) for token in reward_tokens]
+            + [(multi.claimable, (token, user)) for user, token in pairs]
+            + [(multi.getUserRewardPerToken, (user, token)) for user, token in pairs],
+            block_identifier,
+        )
+        offset = 0
+        sections = []
+        for size in (len(all_tokens), len(reward_tokens), len(pairs), len(pairs)):
+            sections.append(results[offset : offset + size])
+            offset += size
+        (reward_data, stream_data, claimable, reward_per_token) = sections
+
+        rewards = {token: RewardState(token, *data) for token, data in zip(all_tokens, reward_data)}
+        streams = {
+            token: RewardStreamState(token, *data)
+            for token, data in zip(reward_tokens, stream_data)
+        }
+        user_states = {}
+        for idx, (user, data) in enumerate(zip(users, user_data)):
+            cells = slice(idx * len(reward_tokens), (idx + 1) * len(reward_tokens))
+            (_, retired_amounts) = claimable_retired[idx]
+            user_states[user] = UserState(
+                user,
+                *data,
+                claimable=dict(zip(reward_tokens, claimable[cells])),
+                reward_per_token=dict(zip(reward_tokens, reward_per_token[cells])),
+                claimable_retired=dict(zip(retired_reward_tokens, retired_amounts)),
+            )
+
+        return MFDSnapshot(
+            address=multi.address,
+            block=block_identifier,
+            total_stakes=total_stakes,
+            last_collection_block=last_collection_block,
+            last_collection_time=last_collection_time,
+            collection_interval=collection_interval,
+            active_reward_streams=active_reward_streams,
+            reward_tokens=reward_tokens,
+            retired_reward_tokens=retired_reward_tokens,
+            rewards=rewards,
+            streams=streams,
+            users=user_states,
+        )
@@ -0,0 +1,207 @@
+"""
+Off-chain replay of MultiFeeDistribution reward accounting.
+
+Mirrors `_updateReward`, `_calculateClaimable` and `_earned` exactly, including the 1e50
+rewardPerToken scaling and the integer truncation of every division, so emission changes
+can be tested against months of stake, unstake and inject events without a local chain.
+Every event is assumed to land in its own block, so the per-block collection dedup never applies.
+
+State is kept in numpy arrays of python ints (dtype=object) so that values never overflow,
+with reward tokens along one axis and users along the other.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+PRECISION = 10 ** 50
+
+# user rows allocated up front, doubled whenever they run out
+INITIAL_USERS = 64
+
+# kind is one of "stake", "unstake", "inject", "claim" or "update"
+# stake/unstake: (kind, user, amount); inject: (kind, token, amount);
+# claim: (kind, user, tokens or None for all reward tokens); update: (kind,)
+Event = namedtuple("Event", ["kind", "target", "amount"], defaults=(None, None))
+
+
+def _zeros(*shape):
+    return np.zeros(shape, dtype=object)
+
+
+class MFDSimulator:
+    def __init__(self, reward_tokens):
+        self.reward_tokens = list(reward_tokens)
+        self._token_index = {token: i for i, token in enumerate(self.reward_tokens)}
+        n_tokens = len(self.reward_tokens)
+
+        self.total_stakes = 0
+        # rewardData[token].rewardPerToken / .amount and the MFD balance of each token
+        self.reward_per_token = _zeros(n_tokens)
+        self.accounted = _zeros(n_tokens)
+        self.balances = _zeros(n_tokens)
+
+        self.users = []
+        self._user_index = {}
+        # per-user rows are allocated ahead and doubled when full, so adding users stays linear
+        # userData[user].tokenAmount / .rewardPerToken[token] and claimable[token][user]
+        self._token_amounts = _zeros(INITIAL_USERS)
+        self._user_reward_per_token = _zeros(INITIAL_USERS, n_tokens)
+        self._claimable = _zeros(INITIAL_USERS, n_tokens)
+        # total amount paid out per user and token
+        self._paid = _zeros(INITIAL_USERS, n_tokens)
+
+    # views over the rows of known users, writes go to the underlying arrays
+
+    @property
+    def token_amounts(self):
+        return self._token_amounts[: len(self.users)]
+
+    @property
+    def user_reward_per_token(self):
+        return self._user_reward_per_token[: len(self.users)]
+
+    @property
+    def claimable(self):
+        return self._claimable[: len(self.users)]
+
+    @property
+    def paid(self):
+        return self._paid[: len(self.users)]
+
+    def _grow(self):
+        capacity = 2 * len(self._token_amounts)
+        for name in ("_token_amounts", "_user_reward_per_token", "_claimable", "_paid"):
+            rows = getattr(self, name)
+            grown = _zeros(capacity, *rows.shape[1:])
+            grown[: len(rows)] = rows
+            setattr(self, name, grown)
+
+    def _user(self, user):
+        index = self._user_index.get(user)
+        if index is None:
+            index = len(self.users)
+            if index == len(self._token_amounts):
+                self._grow()
+            self.users.append(user)
+            self._user_index[user] = index
+        return index
+
+    def _users(self, users):
+        return np.array([self._user(user) for user in users], dtype=np.int64)
+
+    # _updateReward
+    def update(self):
+        if self.total_stakes == 0:
+            return
+        diff = self.balances - self.accounted
+        self.reward_per_token = self.reward_per_token + diff * PRECISION // self.total_stakes
+        self.accounted = self.balances.copy()
+
+    # _calculateClaimable for every reward token, for each of the given user indices
+    def _settle(self, indices):
+        if len(indices) == 0:
+            return
+        indices = np.unique(indices)
+        amounts = self.token_amounts[indices][:, None]
+        earned = (self.reward_per_token[None, :] - self.user_reward_per_token[indices]) * amounts
+        self.claimable[indices] += earned // PRECISION
+        self.user_reward_per_token[indices] = self.reward_per_token[None, :]
+
+    def inject(self, token, amount):
+        self.balances[self._token_index[token]] += amount
+
+    def stake(self, user, amount):
+        self.replay([Event("stake", user, amount)])
+
+    def unstake(self, user, amount):
+        self.replay([Event("unstake", user, amount)])
+
+    def claim(self, user, tokens=None):
+        index = self._user(user)
+        before = self.paid[index].copy()
+        self.replay([Event("claim", user, tokens)])
+        return list(self.paid[index] - before)
+
+    def claimable_rewards(self, user):
+        """Mirror of `claimableRewards(account)`, i.e. `claimable + _earned / 1e50`."""
+        index = self._user(user)
+        amount = self.token_amounts[index]
+        earned = (self.reward_per_token - self.user_reward_per_token[index]) * amount
+        return list(self.claimable[index] + earned // PRECISION)
+
+    def claimable_matrix(self):
+        """`claimableRewards` for every known user at once, shape (users, reward tokens)."""
+        amounts = self.token_amounts[:, None]
+        earned = (self.reward_per_token[None, :] - self.user_reward_per_token) * amounts
+        return self.claimable + earned // PRECISION
+
+    def replay(self, events):
+        """
+        Apply a stream of events in contract order.
+
+        Between two injects every stake, unstake and claim sees the same accumulators, since only
+        the first `_updateReward` of the run finds a balance difference. Such runs are settled
+        as one batch. While nothing is staked, `_updateReward` is a no-op and the next balance
+        change decides which update credits the pending rewards, so events are applied one by one.
+        """
+        batch = []
+        for event in events:
+            event = Event(*event)
+            if event.kind == "inject":
+                self._apply_batch(batch)
+                batch = []
+                self.inject(event.target, event.amount)
+            elif self.total_stakes == 0:
+                self._apply_batch(batch)
+                batch = []
+                self._apply_batch([event])
+            else:
+                batch.append(event)
+        self._apply_batch(batch)
+
+    def _apply_batch(self, batch):
+        if not batch:
+            return
+        self.update()
+        settled = self._users(e.target for e in batch if e.kind in ("stake", "unstake"))
+        self._settle(settled)
+
+        for event in batch:
+            if event.kind == "stake":
+                if event.amount == 0:
+                    raise ValueError("InvalidAmount")
+                index = self._user(event.target)
+                self.token_amounts[index] += event.amount
+                self.total_stakes += event.amount
+            elif event.kind == "unstake":
+                index = self._user(event.target)
+                if event.amount == 0 or self.token_amounts[index] < event.amount:
+                    raise ValueError("InvalidAmount")
+                self.token_amounts[index] -= event.amount
+                self.total_stakes -= event.amount
+            elif event.kind == "claim":
+                self._pay(self._user(event.target), event.amount)
+            elif event.kind != "update":
+                raise ValueError(f"unknown event kind: {event.kind}")
+
+    # _payRewards
+    def _pay(self, index, tokens):
+        if tokens is None:
+            columns = np.arange(len(self.reward_tokens))
+        else:
+            columns = np.array([self._token_index[token] for token in tokens], dtype=np.int64)
+        self._settle_tokens(index, columns)
+
+        rewards = self.claimable[index, columns]
+        self.claimable[index, columns] = 0
+        self.accounted[columns] -= rewards
+        self.balances[columns] -= rewards
+        self.paid[index, columns] += rewards
+
+    def _settle_tokens(self, index, columns):
+        amount = self.token_amounts[index]
+        user_reward_per_token = self.user_reward_per_token[index, columns]
+        earned = (self.reward_per_token[columns] - user_reward_per_token) * amount
+        self.claimable[index, columns] += earned // PRECISION
+        self.user_reward_per_token[index, columns] = self.reward_per_token[columns]
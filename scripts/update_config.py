@@ -1,27 +1,141 @@
-from brownie import Contract, MultiFeeDistribution, accounts
-from brownie.network.gas.strategies import GasNowScalingStrategy
+"""
+Bring the managers, reward tokens and distributors of stakers in line with a config file.
 
-# address of the MultiFeeDistribution contract
-MULTIREWARDS_CONTRACT_ADDRESS = "0x"
-REWARDTOKEN_CONTRACT_ADDRESS = "0x"
+The config is a JSON file:
 
-# address that owns `Rewards`
-OWNER = accounts.add()
-# address that is permitted to fund the contract
-REWARD_ADMIN = accounts.add()
+    {
+        "distributor_factory": "0x...",
+        "stakers": {
+            "0x...": {
+                "managers": ["0x..."],
+                "removed_managers": ["0x..."],
+                "reward_tokens": ["0x..."],
+                "distributors": ["0x..."]
+            }
+        }
+    }
 
-# duration of the rewards period, in seconds - we recommend keeping this as 30 days
-REWARDS_DURATION = 30 * 86400
+`managers` must be managers and `removed_managers` must not be; other accounts are left alone,
+as the contract cannot list its managers. `reward_tokens` are the active rewards of the staker,
+missing ones are added with a single `addRewards`. Active rewards that are not listed are only
+retired with `prune`, as a retired token can never be added again. `distributors` lists the
+reward tokens that need a RewardCampaignDistributor from `distributor_factory`.
 
+`plan` reads the on-chain state and returns only the transactions that change something, with
+all additions and removals of managers and all new rewards of a staker batched into one
+transaction each. Managers are updated first, so a sender who becomes a manager can add rewards
+in the same run.
+"""
 
-gas_strategy = GasNowScalingStrategy("standard", "fast")
+import json
+from dataclasses import dataclass
+from typing import Any, Tuple
+
+from brownie import MultiFeeDistribution, RewardCampaignDistributorFactory, accounts
+from eth_utils import to_checksum_address
+
+from scripts.deploy import eip1559_fees
+
+ZERO_ADDRESS = "0x" + "00" * 20
+
+CONFIG_PATH = "rewards.json"
+
+# brownie account id of the sender, which must own the stakers and the distributor factory
+# and be or become a manager of every staker
+ADMIN_ACCOUNT = "admin"
+
+# retire active rewards that are missing from the config
+PRUNE = False
+
+
+@dataclass(frozen=True)
+class Action:
+    description: str
+    fn: Any
+    args: Tuple
+
+    def send(self, tx_params):
+        return self.fn(*self.args, tx_params)
+
+
+def _addresses(values):
+    return [to_checksum_address(str(value)) for value in values]
+
+
+def plan_staker(multi, config, distributor_factory=None, prune=False):
+    """The transactions that bring a single staker in line with its config."""
+    actions = []
+    managers = _addresses(config.get("managers", []))
+    removed = _addresses(config.get("removed_managers", []))
+
+    missing = [account for account in managers if not multi.managers(account)]
+    if missing:
+        actions.append(Action(f"{multi}: add managers {missing}", multi.setManagers, (missing,)))
+    stale = [account for account in removed if multi.managers(account)]
+    if stale:
+        actions.append(Action(f"{multi}: remove managers {stale}", multi.removeManagers, (stale,)))
+
+    if "reward_tokens" in config:
+        desired = list(dict.fromkeys(_addresses(config["reward_tokens"])))
+        (active, _) = multi.claimableRewards(ZERO_ADDRESS)
+        active = _addresses(active)
+
+        new = [token for token in desired if token not in active]
+        for token in new:
+            if multi.rewardData(token)["retiredIndex"] != 0:
+                raise ValueError(f"{token} is a retired reward of {multi} and cannot be added")
+        if new:
+            actions.append(Action(f"{multi}: add rewards {new}", multi.addRewards, (new,)))
+        if prune:
+            for token in active:
+                if token not in desired:
+                    actions.append(
+                        Action(f"{multi}: retire reward {token}", multi.retireReward, (token,))
+                    )
+
+    for token in _addresses(config.get("distributors", [])):
+        if distributor_factory is None:
+            raise ValueError("distributors are configured without a distributor_factory")
+        if distributor_factory.getDistributor(multi, token) == ZERO_ADDRESS:
+            actions.append(
+                Action(
+                    f"{multi}: create distributor of {token}",
+                    distributor_factory.createRewardCampaignDistributor,
+                    (multi.address, token),
+                )
+            )
+    return actions
+
+
+def plan(config, prune=False):
+    """The transactions that bring every staker of the config in line with it."""
+    distributor_factory = None
+    if config.get("distributor_factory"):
+        distributor_factory = RewardCampaignDistributorFactory.at(config["distributor_factory"])
+
+    actions = []
+    for address, staker_config in config.get("stakers", {}).items():
+        multi = MultiFeeDistribution.at(address)
+        actions += plan_staker(multi, staker_config, distributor_factory, prune)
+    return actions
+
+
+def apply(actions, sender, tx_params=None):
+    """Send the planned transactions in order and return their receipts."""
+    params = {**eip1559_fees(), **(tx_params or {}), "from": sender}
+    return [action.send(params) for action in actions]
 
 
 def main():
-    multi = MultiFeeDistribution.at(MULTIREWARDS_CONTRACT_ADDRESS)
-    reward = Contract(REWARDTOKEN_CONTRACT_ADDRESS)
+    with open(CONFIG_PATH) as fp:
+        config = json.load(fp)
 
-    # Adding a new reward
-    multi.addReward(reward, REWARD_ADMIN, REWARDS_DURATION, {"from": OWNER})
+    actions = plan(config, prune=PRUNE)
+    if not actions:
+        print("Nothing to do, the on-chain configuration matches")
+        return
+    for action in actions:
+        print(action.description)
 
-    print(f"Success! New reward token will be distributed over {REWARDS_DURATION/86400:.1f} days.")
+    apply(actions, accounts.load(ADMIN_ACCOUNT))
+    print(f"Success! Sent {len(actions)} transactions")
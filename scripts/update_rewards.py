@@ -1,23 +1,18 @@
 from brownie import Contract, MultiFeeDistribution, accounts
-from brownie.network.gas.strategies import GasNowScalingStrategy
 
-# address of the StakingRewards contract
+from scripts.deploy import eip1559_fees
+
+# address of the MultiFeeDistribution contract
 MULTIREWARDS_CONTRACT_ADDRESS = "0x"
 REWARDTOKEN_CONTRACT_ADDRESS = "0x"
 
-# address that owns `StakingRewards`
-OWNER = accounts.add()
-# address that is permitted to fund the contract
+# address that funds the contract
 REWARD_ADMIN = accounts.add()
 
 # amount to add as a reward
 REWARDS_AMOUNT = 10 ** 19
 
 
-gas_strategy = GasNowScalingStrategy("standard", "fast")
-
-# NOTE: this script can be deleted as the notify rewards functionality is not needed for the Gamma staking contract
-
 def main():
     multi = MultiFeeDistribution.at(MULTIREWARDS_CONTRACT_ADDRESS)
     reward = Contract(REWARDTOKEN_CONTRACT_ADDRESS)
@@ -26,17 +21,17 @@ def main():
     if REWARDS_AMOUNT < 10 ** reward.decimals():
         raise ValueError("Reward amount is less than 1 token - are you sure this is correct?")
 
+    # only active reward tokens are distributed, anything else would have to be recovered
+    if multi.rewardTokenIndex(reward) == 0:
+        raise ValueError("Reward token is not an active reward of the contract")
+
     # ensure the reward admin has sufficient balance of the reward token
     if reward.balanceOf(REWARD_ADMIN) < REWARDS_AMOUNT:
         raise ValueError("Rewards admin has insufficient balance to fund the contract")
 
-    # ensure the reward contract has sufficient allowance to transfer the reward token
-    if reward.allowance(REWARD_ADMIN, multi) < REWARDS_AMOUNT:
-        reward.approve(multi, 2 ** 256 - 1, {"from": REWARD_ADMIN, "gas_price": gas_strategy})
-
-    # update the reward amount
-    multi.notifyRewardAmount(
-        reward, REWARDS_AMOUNT, {"from": REWARD_ADMIN, "gas_price": gas_strategy}
-    )
+    # push the reward and credit it to the stakers without waiting for the next interaction
+    tx_params = {**eip1559_fees(), "from": REWARD_ADMIN}
+    reward.transfer(multi, REWARDS_AMOUNT, tx_params)
+    multi.notifyReward(reward, tx_params)
 
     print(f"Success! {REWARDS_AMOUNT/10**reward.decimals():.2f} {reward.symbol()} has been added")
@@ -4,6 +4,7 @@ pragma solidity ^0.8.0;
 import "../lib/forge-std/src/Test.sol";
 import "../contracts/RewardCampaignDistributorFactory.sol";
 import "../contracts/RewardCampaignDistributor.sol";
+import "../contracts/MultiTokenCampaignDistributor.sol";
 import "@openzeppelin/contracts/token/ERC20/ERC20.sol";
 import "../lib/forge-std/src/console.sol";  // Add this for logging
 
@@ -24,7 +25,10 @@ contract RewardCampaignDistributorTest is Test {
         vm.createSelectFork(arbitrumForkUrl);
 
         // Continue with your setup
-        factory = new RewardCampaignDistributorFactory(address(new RewardCampaignDistributor()));
+        factory = new RewardCampaignDistributorFactory(
+            address(new RewardCampaignDistributor()),
+            address(new MultiTokenCampaignDistributor())
+        );
     }
 
     function testCreateRewardCampaignDistributor() public {
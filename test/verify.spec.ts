@@ -10,16 +10,20 @@ describe("Verify All Contracts via Etherscan", async function () {
   const requisiteData: {
     ICHI_VAULT_FACTORY?: string;
     MULTI_FEE_DISTRIBUTION_FACTORY?: string;
+    MULTI_FEE_DISTRIBUTION_CLONE_IMPLEMENTATION?: string;
     MULTI_FEE_DISTRIBUTION?: string;
     REWARD_CAMPAIGN_DISTRIBUTOR_FACTORY?: string;
     REWARD_CAMPAIGN_DISTRIBUTOR_IMPLEMENTATION?: string;
+    MULTI_TOKEN_CAMPAIGN_DISTRIBUTOR_IMPLEMENTATION?: string;
     REWARD_CAMPAIGN_DISTRIBUTOR?: string;
   } = {
     ICHI_VAULT_FACTORY: "",
     MULTI_FEE_DISTRIBUTION_FACTORY: "",
+    MULTI_FEE_DISTRIBUTION_CLONE_IMPLEMENTATION: "",
     MULTI_FEE_DISTRIBUTION: "",
     REWARD_CAMPAIGN_DISTRIBUTOR_FACTORY: "",
     REWARD_CAMPAIGN_DISTRIBUTOR_IMPLEMENTATION: "",
+    MULTI_TOKEN_CAMPAIGN_DISTRIBUTOR_IMPLEMENTATION: "",
     REWARD_CAMPAIGN_DISTRIBUTOR: "",
   };
 
@@ -39,6 +43,7 @@ describe("Verify All Contracts via Etherscan", async function () {
     const {
       ICHI_VAULT_FACTORY,
       MULTI_FEE_DISTRIBUTION_FACTORY,
+      MULTI_FEE_DISTRIBUTION_CLONE_IMPLEMENTATION,
       MULTI_FEE_DISTRIBUTION,
     } = requisiteData;
 
@@ -52,6 +57,11 @@ describe("Verify All Contracts via Etherscan", async function () {
       throw new Error(`Undefined MULTI_FEE_DISTRIBUTION_FACTORY`);
     }
 
+    // - - - - - Validate MULTI_FEE_DISTRIBUTION_CLONE_IMPLEMENTATION - - - - -
+    if (!MULTI_FEE_DISTRIBUTION_CLONE_IMPLEMENTATION) {
+      throw new Error(`Undefined MULTI_FEE_DISTRIBUTION_CLONE_IMPLEMENTATION`);
+    }
+
   });
 
   after(async () => {
@@ -76,6 +86,7 @@ describe("Verify All Contracts via Etherscan", async function () {
     const {
       MULTI_FEE_DISTRIBUTION_FACTORY,
       ICHI_VAULT_FACTORY,
+      MULTI_FEE_DISTRIBUTION_CLONE_IMPLEMENTATION,
     } = requisiteData;
 
     await run("verify:verify", {
@@ -83,11 +94,25 @@ describe("Verify All Contracts via Etherscan", async function () {
       address: MULTI_FEE_DISTRIBUTION_FACTORY,
       constructorArguments: [
         ICHI_VAULT_FACTORY,
+        MULTI_FEE_DISTRIBUTION_CLONE_IMPLEMENTATION,
       ],
     });
 
   });
 
+  it("should verify MultiFeeDistributionClone Implementation", async () => {
+
+    const {
+      MULTI_FEE_DISTRIBUTION_CLONE_IMPLEMENTATION
+    } = requisiteData;
+
+    await run("verify:verify", {
+      contract: "contracts/MultiFeeDistributionClone.sol:MultiFeeDistributionClone",
+      address: MULTI_FEE_DISTRIBUTION_CLONE_IMPLEMENTATION,
+    });
+
+  });
+
   it("should verify MultiFeeDistribution", async () => {
 
     const {
@@ -108,6 +133,7 @@ describe("Verify All Contracts via Etherscan", async function () {
     const {
       REWARD_CAMPAIGN_DISTRIBUTOR_FACTORY,
       REWARD_CAMPAIGN_DISTRIBUTOR_IMPLEMENTATION,
+      MULTI_TOKEN_CAMPAIGN_DISTRIBUTOR_IMPLEMENTATION,
     } = requisiteData;
 
     await run("verify:verify", {
@@ -115,6 +141,7 @@ describe("Verify All Contracts via Etherscan", async function () {
       address: REWARD_CAMPAIGN_DISTRIBUTOR_FACTORY,
       constructorArguments: [
         REWARD_CAMPAIGN_DISTRIBUTOR_IMPLEMENTATION,
+        MULTI_TOKEN_CAMPAIGN_DISTRIBUTOR_IMPLEMENTATION,
       ],
     });
 
@@ -135,6 +162,21 @@ describe("Verify All Contracts via Etherscan", async function () {
 
   });
 
+  it("should verify MultiTokenCampaignDistributor Implementation", async () => {
+
+    const {
+      MULTI_TOKEN_CAMPAIGN_DISTRIBUTOR_IMPLEMENTATION
+    } = requisiteData;
+
+    if (MULTI_TOKEN_CAMPAIGN_DISTRIBUTOR_IMPLEMENTATION) {
+      await run("verify:verify", {
+        contract: "contracts/MultiTokenCampaignDistributor.sol:MultiTokenCampaignDistributor",
+        address: MULTI_TOKEN_CAMPAIGN_DISTRIBUTOR_IMPLEMENTATION,
+      });
+    }
+
+  });
+
   it("should verify RewardCampaignDistributor", async () => {
 
     const {
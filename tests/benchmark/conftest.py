@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+BASELINE_PATH = Path(__file__).parent / "gas_baseline.json"
+
+# allowed gas increase over the baseline before a measurement counts as a regression
+THRESHOLD = float(os.getenv("GAS_REGRESSION_THRESHOLD", "0.05"))
+
+# set to rewrite the baseline with the measured values instead of checking against it
+UPDATE_BASELINE = os.getenv("GAS_BASELINE_UPDATE", "") not in ("", "0")
+
+# measurements of this process, plus those reported by the workers on the xdist controller
+RESULTS = {}
+
+
+class GasRecorder:
+    def __init__(self, baseline):
+        self.baseline = baseline
+        self.regressions = []
+
+    def record(self, name, gas_used):
+        RESULTS[name] = gas_used
+        if UPDATE_BASELINE:
+            return
+        expected = self.baseline.get(name)
+        # measurements without a baseline yet are added to it at the end of the session
+        if expected is None:
+            return
+        if gas_used > expected * (1 + THRESHOLD):
+            self.regressions.append(f"{name}: {gas_used} gas, baseline {expected}")
+
+    def check(self):
+        regressions, self.regressions = self.regressions, []
+        assert not regressions, f"gas regressed by more than {THRESHOLD:.0%}: {regressions}"
+
+
+def load_baseline():
+    return json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+
+
+@pytest.fixture(scope="session")
+def gas_recorder():
+    return GasRecorder(load_baseline())
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if hasattr(config, "workerinput"):
+        # xdist worker, hand the measurements to the controller which writes the baseline
+        config.workeroutput["gas_results"] = json.dumps(RESULTS)
+    else:
+        baseline = load_baseline()
+        new_results = {k: v for k, v in RESULTS.items() if k not in baseline}
+        if not UPDATE_BASELINE and not new_results:
+            return
+        merged = {**baseline, **(RESULTS if UPDATE_BASELINE else new_results)}
+        BASELINE_PATH.write_text(json.dumps(dict(sorted(merged.items())), indent=2) + "\n")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    RESULTS.update(json.loads(getattr(node, "workeroutput", {}).get("gas_results", "{}")))
@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+
+import pytest
+from utils import add_reward_tokens, gas_increments, inject_rewards
+
+TOKEN_COUNTS = [2, 4, 6, 8, 10]
+
+
+def claim_gas(multi, mvault, alice, token_count):
+    tokens = add_reward_tokens(multi, mvault, token_count, alice)
+
+    amount = 10 ** 18
+    mvault.approve(multi, amount, {"from": alice})
+    multi.stake(amount, alice, {"from": alice})
+
+    inject_rewards(mvault, tokens, 10 ** 18, alice)
+    tx = multi.getAllRewards({"from": alice})
+    assert len(tx.events["RewardPaid"]) == token_count
+    return tx.gas_used
+
+
+# getAllRewards should collect from the vault and settle every token once,
+# so each extra reward token adds a constant amount of gas to a claim
+def test_claim_gas_grows_linearly(multi, mvault, alice, chain):
+    gas_used = []
+    for token_count in TOKEN_COUNTS:
+        gas_used.append(claim_gas(multi, mvault, alice, token_count))
+        chain.revert()
+
+    increments = gas_increments(gas_used)
+    print(dict(zip(TOKEN_COUNTS, gas_used)))
+
+    # a quadratic claim path would make every increment larger than the previous one
+    assert max(increments) - min(increments) <= min(increments) * 0.1
+
+
+@pytest.mark.parametrize("token_count", TOKEN_COUNTS)
+def test_claim_collects_once(multi, mvault, alice, token_count):
+    tokens = add_reward_tokens(multi, mvault, token_count, alice)
+
+    amount = 10 ** 18
+    mvault.approve(multi, amount, {"from": alice})
+    multi.stake(amount, alice, {"from": alice})
+
+    inject_rewards(mvault, tokens, 10 ** 18, alice)
+    tx = multi.getAllRewards({"from": alice})
+
+    # every reward token leaves the vault exactly once per claim
+    vault_transfers = [
+        e for e in tx.events["Transfer"] if e.address in tokens and e["_from"] == mvault
+    ]
+    assert len(vault_transfers) == token_count
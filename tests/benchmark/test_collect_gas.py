@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+
+import pytest
+from utils import add_reward_tokens, inject_rewards, staker_address
+
+
+# Only the first claim of a block collects the vault and scans the reward balances, later
+# claims in the same block skip both.
+@pytest.mark.parametrize("token_count", [1, 10])
+def test_same_block_claims_skip_collection(
+    multi, mvault, MockSameBlockStaker, gas_recorder, alice, token_count
+):
+    tokens = add_reward_tokens(multi, mvault, token_count, alice)
+    mvault.approve(multi, 10 ** 18, {"from": alice})
+    multi.stake(10 ** 18, alice, {"from": alice})
+    inject_rewards(mvault, tokens, 10 ** 18, alice)
+
+    staker = MockSameBlockStaker.deploy({"from": alice})
+    users = [staker_address(i) for i in range(4)]
+    tx = staker.claimFor(multi, users, tokens, {"from": alice})
+
+    vault_transfers = [e for e in tx.events["Transfer"] if e["_from"] == mvault]
+    assert len(vault_transfers) == token_count
+    assert multi.lastCollectionBlock() == tx.block_number
+
+    gas_used = [e["gasUsed"] for e in tx.events["ClaimGas"]]
+    saved = gas_used[0] - max(gas_used[1:])
+    print(f"{token_count} reward tokens: first claim {gas_used[0]} gas, later claims save {saved}")
+    gas_recorder.record(f"claim[tokens={token_count},same_block]", max(gas_used[1:]))
+    gas_recorder.check()
+
+    # at least the balanceOf of every reward token is skipped
+    assert saved > token_count * 2_600
+
+
+# Stakes and unstakes ignore the collection interval but still collect only once per block
+@pytest.mark.parametrize("token_count", [1, 10])
+def test_same_block_stakes_skip_collection(
+    multi, mvault, MockSameBlockStaker, gas_recorder, alice, token_count
+):
+    tokens = add_reward_tokens(multi, mvault, token_count, alice)
+    mvault.approve(multi, 10 ** 18, {"from": alice})
+    multi.stake(10 ** 18, alice, {"from": alice})
+    inject_rewards(mvault, tokens, 10 ** 18, alice)
+
+    staker = MockSameBlockStaker.deploy({"from": alice})
+    users = [staker_address(i) for i in range(4)]
+    mvault.approve(staker, 4 * 10 ** 17, {"from": alice})
+    tx = staker.stakeFor(multi, users, 10 ** 17, {"from": alice})
+
+    vault_transfers = [e for e in tx.events["Transfer"] if e["_from"] == mvault]
+    assert len(vault_transfers) == token_count
+    assert multi.lastCollectionBlock() == tx.block_number
+
+    gas_used = [e["gasUsed"] for e in tx.events["StakeGas"]]
+    saved = gas_used[0] - max(gas_used[1:])
+    print(f"{token_count} reward tokens: first stake {gas_used[0]} gas, later stakes save {saved}")
+    gas_recorder.record(f"stake[tokens={token_count},same_block]", max(gas_used[1:]))
+    gas_recorder.check()
+
+    assert saved > token_count * 2_600
@@ -0,0 +1,35 @@
+#!/usr/bin/python3
+
+
+def new_vault(multifactory, MockVault, alice):
+    vault = MockVault.deploy(10 ** 18, {"from": alice})
+    vault.setIchiVaultFactory(multifactory.ichiFactory(), {"from": alice})
+    return vault
+
+
+# A clone deploys a minimal proxy instead of the full bytecode and skips the cachedDeployData
+# round-trip, at the price of a storage read of the staking token in every later transaction
+def test_deploy_gas(multifactory, MockVault, gas_recorder, alice):
+    full_tx = multifactory.deployStaker(new_vault(multifactory, MockVault, alice), {"from": alice})
+    clone_tx = multifactory.deployStakerClone(
+        new_vault(multifactory, MockVault, alice), {"from": alice}
+    )
+
+    print(f"deployStaker: {full_tx.gas_used} gas, deployStakerClone: {clone_tx.gas_used} gas")
+    gas_recorder.record("deployStaker", full_tx.gas_used)
+    gas_recorder.record("deployStakerClone", clone_tx.gas_used)
+    gas_recorder.check()
+
+    assert clone_tx.gas_used * 5 < full_tx.gas_used
+
+
+# The staking token read a clone pays for on every stake
+def test_clone_stake_gas(multi, mvault, clone_multi, clone_vault, gas_recorder, bob):
+    gas_used = {}
+    for name, staker, vault in (("full", multi, mvault), ("clone", clone_multi, clone_vault)):
+        vault.approve(staker, 10 ** 18, {"from": bob})
+        gas_used[name] = staker.stake(10 ** 18, bob, {"from": bob}).gas_used
+        gas_recorder.record(f"stake[{name}]", gas_used[name])
+
+    print(f"stake: {gas_used['full']} gas, from a clone: {gas_used['clone']} gas")
+    gas_recorder.check()
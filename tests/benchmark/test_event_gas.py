@@ -0,0 +1,44 @@
+#!/usr/bin/python3
+
+from utils import add_reward_tokens, inject_rewards
+from web3 import Web3
+
+ACCUMULATOR_EVENTS = [
+    Web3.keccak(text="RewardUpdated(address,uint256,uint256)"),
+    Web3.keccak(text="UserRewardUpdated(address,address,uint256,uint256)"),
+]
+
+
+def log_gas(log):
+    return 375 + 375 * len(log["topics"]) + 8 * len(Web3.toBytes(hexstr=str(log["data"])))
+
+
+# Gas spent on the accumulator events: RewardUpdated is emitted once per reward that arrived and
+# UserRewardUpdated once per reward a user is settled on, so both scale with the reward tokens
+def test_accumulator_event_overhead(multi, mvault, gas_recorder, alice, bob):
+    token_count = 10
+    tokens = add_reward_tokens(multi, mvault, token_count, alice)
+
+    amount = 10 ** 18
+    mvault._mint_for_testing(bob, 2 * amount)
+    mvault.approve(multi, 2 * amount, {"from": bob})
+    multi.stake(amount, bob, {"from": bob})
+    inject_rewards(mvault, tokens, 10 ** 18, alice)
+    multi.updateReward({"from": alice})
+    inject_rewards(mvault, tokens, 10 ** 18, alice)
+
+    tx = multi.stake(amount, bob, {"from": bob})
+    topics = [Web3.toBytes(hexstr=str(topic)) for topic in ACCUMULATOR_EVENTS]
+    logs = [
+        log
+        for log in tx.logs
+        if log["address"] == multi.address and Web3.toBytes(log["topics"][0]) in topics
+    ]
+    assert len(logs) == 2 * token_count
+
+    overhead = sum(log_gas(log) for log in logs)
+    print(f"stake with {token_count} reward tokens: {tx.gas_used} gas, events {overhead} gas")
+    gas_recorder.record(f"stake[tokens={token_count},events]", overhead)
+    gas_recorder.check()
+
+    assert overhead < tx.gas_used * 0.1
@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+
+import pytest
+from utils import add_reward_tokens, add_stakers, create_distributor, inject_rewards
+
+TOKEN_COUNTS = [1, 10, 50]
+STAKER_COUNTS = [1, 100, 1000]
+
+
+# Measure the hot MultiFeeDistribution paths across reward token and staker counts.
+# Results are checked against gas_baseline.json, which GAS_BASELINE_UPDATE=1 regenerates;
+# GAS_REGRESSION_THRESHOLD sets the allowed increase.
+@pytest.mark.parametrize("staker_count", STAKER_COUNTS)
+@pytest.mark.parametrize("token_count", TOKEN_COUNTS)
+def test_gas_sweep(
+    multi,
+    mvault,
+    distributor_factory,
+    RewardCampaignDistributor,
+    gas_recorder,
+    alice,
+    bob,
+    chain,
+    token_count,
+    staker_count,
+):
+    tokens = add_reward_tokens(multi, mvault, token_count, alice)
+    # bob is the measured staker
+    add_stakers(multi, mvault, staker_count - 1, alice)
+    distributor = create_distributor(
+        distributor_factory, RewardCampaignDistributor, multi, tokens[0], alice, chain
+    )
+    amount = 10 ** 18
+    mvault.approve(multi, amount, {"from": bob})
+
+    def measure(name, tx):
+        gas_recorder.record(f"{name}[tokens={token_count},stakers={staker_count}]", tx.gas_used)
+
+    inject_rewards(mvault, tokens, 10 ** 18, alice)
+    measure("stake", multi.stake(amount, bob, {"from": bob}))
+
+    # the distributor requires the MFD to have updated in an earlier block
+    multi.updateReward({"from": alice})
+    chain.sleep(3600)
+    measure("distributeRewards", distributor.distributeRewards({"from": alice}))
+
+    inject_rewards(mvault, tokens, 10 ** 18, alice)
+    measure("updateReward", multi.updateReward({"from": bob}))
+
+    inject_rewards(mvault, tokens, 10 ** 18, alice)
+    measure("getReward", multi.getReward(bob, [tokens[0]], {"from": bob}))
+
+    inject_rewards(mvault, tokens, 10 ** 18, alice)
+    measure("getAllRewards", multi.getAllRewards({"from": bob}))
+
+    inject_rewards(mvault, tokens, 10 ** 18, alice)
+    measure("unstake", multi.unstake(amount // 2, {"from": bob}))
+
+    gas_recorder.check()
@@ -0,0 +1,46 @@
+#!/usr/bin/python3
+
+
+# stake, unstake and getAllRewards gas on the unitary fixtures, cold and warm, checked against the
+# baseline like the sweep
+def test_storage_gas(multi, mvault, reward_token, slow_token, gas_recorder, alice, bob, issue):
+    amount = 10 ** 18
+    mvault.approve(multi, 2 * amount, {"from": bob})
+
+    gas_used = {}
+    gas_used["stake (first)"] = multi.stake(amount, bob, {"from": bob}).gas_used
+
+    reward_token.transfer(mvault, 10 ** 17, {"from": alice})
+    slow_token.transfer(mvault, 10 ** 17, {"from": alice})
+    gas_used["stake (existing staker)"] = multi.stake(amount, bob, {"from": bob}).gas_used
+
+    reward_token.transfer(mvault, 10 ** 17, {"from": alice})
+    slow_token.transfer(mvault, 10 ** 17, {"from": alice})
+    tx = multi.getAllRewards({"from": bob})
+    assert len(tx.events["RewardPaid"]) == 2
+    gas_used["getAllRewards"] = tx.gas_used
+
+    gas_used["unstake (partial)"] = multi.unstake(amount, {"from": bob}).gas_used
+    gas_used["unstake (full)"] = multi.unstake(amount, {"from": bob}).gas_used
+
+    for name, gas in gas_used.items():
+        print(f"{name:>24}: {gas}")
+        gas_recorder.record(f"storage[{name}]", gas)
+    gas_recorder.check()
+
+
+# Both RewardData.amount/lastTimeUpdated and UserData.tokenAmount/lastTimeUpdated share a slot
+def test_packed_fields_round_trip(multi, mvault, reward_token, bob, issue, chain):
+    amount = 10 ** 18
+    mvault.approve(multi, amount, {"from": bob})
+    stake_tx = multi.stake(amount, bob, {"from": bob})
+    chain.mine(timedelta=60)
+    update_tx = multi.updateReward({"from": bob})
+
+    user = multi.userData(bob)
+    assert user["tokenAmount"] == amount
+    assert user["lastTimeUpdated"] == chain[stake_tx.block_number].timestamp
+
+    reward = multi.rewardData(reward_token)
+    assert reward["amount"] == reward_token.balanceOf(multi)
+    assert reward["lastTimeUpdated"] == chain[update_tx.block_number].timestamp
@@ -0,0 +1,52 @@
+from brownie_tokens.template import ERC20
+
+
+def add_reward_tokens(multi, mvault, count, account):
+    multi.setManagers([account], {"from": account})
+    tokens = []
+    for _ in range(count):
+        token = ERC20()
+        token._mint_for_testing(account, 10 ** 24, {"from": account})
+        multi.addReward(token, {"from": account})
+        tokens.append(token)
+
+    mvault.setFarmingContract(multi, {"from": account})
+    mvault.setRewardTokens(tokens, {"from": account})
+    return tokens
+
+
+def inject_rewards(mvault, tokens, amount, account):
+    for token in tokens:
+        token.transfer(mvault, amount, {"from": account})
+
+
+def gas_increments(gas_used):
+    return [after - before for before, after in zip(gas_used, gas_used[1:])]
+
+
+def staker_address(index):
+    return "0x" + f"{index + 1:040x}"
+
+
+# stake a small amount on behalf of `count` synthetic addresses
+def add_stakers(multi, mvault, count, account, amount=10 ** 15):
+    mvault.approve(multi, count * amount, {"from": account})
+    for index in range(count):
+        multi.stake(amount, staker_address(index), {"from": account})
+
+
+def create_distributor(
+    distributor_factory, RewardCampaignDistributor, multi, token, account, chain
+):
+    tx = distributor_factory.createRewardCampaignDistributor(multi, token, {"from": account})
+    distributor = RewardCampaignDistributor.at(
+        tx.events["RewardCampaignDistributorCreated"]["distributor"]
+    )
+    distributor.grantCampaignManagerRole(account, {"from": account})
+    distributor.grantDistributorRole(account, {"from": account})
+
+    amount = 10 ** 20
+    token.approve(distributor, amount, {"from": account})
+    now = chain.time()
+    distributor.setCampaign(now, now + 30 * 86400, amount, {"from": account})
+    return distributor
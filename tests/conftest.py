@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 
 import pytest
+from brownie import project
 from brownie_tokens.template import ERC20
 from brownie.network.contract import Contract
 from eth_utils import to_hex
@@ -17,36 +18,88 @@ def number_to_address(number: int) -> str:
 
 mockIVFactoryAddress = number_to_address(123)
 
-# Reset
-@pytest.fixture(scope="function", autouse=True)
-def isolate(fn_isolation):
-    pass
-
-@pytest.fixture(scope="module")
-def multifactory(MultiFeeDistributionFactory, alice, bob):
-    _mrFactory = MultiFeeDistributionFactory.deploy(mockIVFactoryAddress, {"from": alice})
-    assert _mrFactory.owner() == alice
-    return _mrFactory
+# Contracts shared by every test, deployed by deploy_base
+class BaseDeployment:
+    def __init__(self, deploy, chain):
+        self.deploy = deploy
+        (self.multifactory, self.mvault, self.multi, self.distributor_factory) = deploy()
+        self.height = chain.height
+        chain.snapshot()
+
+    def restore(self, chain):
+        chain.revert()
+        if chain.height == self.height:
+            return
+        # @given and state_machine take their own snapshot, which replaced the base one. The
+        # deployment is replayed from the reset chain, landing on the same addresses.
+        chain.reset()
+        contracts = self.deploy()
+        expected = (self.multifactory, self.mvault, self.multi, self.distributor_factory)
+        if [c.address for c in contracts] != [c.address for c in expected]:
+            pytest.fail("replaying the base deployment did not restore the shared contracts")
+        chain.snapshot()
+
+
+def deploy_base(contracts, accounts):
+    alice = accounts[0]
+    implementation = contracts.MultiFeeDistributionClone.deploy({"from": alice})
+    multifactory = contracts.MultiFeeDistributionFactory.deploy(
+        mockIVFactoryAddress, implementation, {"from": alice}
+    )
+
+    # each of the 6 account gets an equal share
+    mvault = contracts.MockVault.deploy(6 * 10 ** 19, {"from": alice})
+    mvault.setIchiVaultFactory(mockIVFactoryAddress)
+    for idx in range(1, 5):
+        mvault.transfer(accounts[idx], 10 ** 19, {"from": alice})
 
-# Instantiate MultiFeeDistribution contract and approve the base token for transfers
-@pytest.fixture(scope="module")
-def multi(multifactory, MultiFeeDistribution, mvault, alice, bob):
     tx = multifactory.deployStaker(mvault, {"from": alice})
-    stakerAddress = tx.events["StakerCreated"].values()[1]
-    _mr = MultiFeeDistribution.at(stakerAddress)
+    multi = contracts.MultiFeeDistribution.at(tx.events["StakerCreated"].values()[1])
+    mvault.approve(multi, 10 ** 19, {"from": alice})
 
-    assert _mr.owner() == alice
+    distributor_factory = contracts.RewardCampaignDistributorFactory.deploy(
+        contracts.RewardCampaignDistributor.deploy({"from": alice}),
+        contracts.MultiTokenCampaignDistributor.deploy({"from": alice}),
+        {"from": alice},
+    )
+    return (multifactory, mvault, multi, distributor_factory)
 
-    mvault.approve(_mr, 10 ** 19, {"from": alice})
-    return _mr
 
+# Deploy the shared contracts once per session, i.e. once per xdist worker, and snapshot the
+# result. Every test reverts to that snapshot when it finishes, so only the fixtures below may be
+# session scoped, anything else deployed in a test is gone before the next one.
+@pytest.fixture(scope="session")
+def base_deployment(accounts, chain):
+    (contracts,) = project.get_loaded_projects()
+    return BaseDeployment(lambda: deploy_base(contracts, accounts), chain)
 
-# Instantiate MockVault staking token contract, this basically serves the purpose of the base token(i.e. base_token) fixture
-@pytest.fixture(scope="module")
-def mvault(MockVault, multifactory, accounts, alice):
-    totalSupply = 6 * 10 ** 19 # each of the 6 account gets an equal share
-    _mv = MockVault.deploy(totalSupply, {"from": alice})
 
+@pytest.fixture(autouse=True)
+def isolate(base_deployment, chain):
+    yield
+    base_deployment.restore(chain)
+
+
+@pytest.fixture(scope="session")
+def multifactory(base_deployment, alice):
+    assert base_deployment.multifactory.owner() == alice
+    return base_deployment.multifactory
+
+
+# MultiFeeDistribution deployed as a minimal proxy, interchangeable with the multi fixture
+@pytest.fixture
+def clone_multi(multifactory, MultiFeeDistributionClone, clone_vault, alice):
+    tx = multifactory.deployStakerClone(clone_vault, {"from": alice})
+    _mr = MultiFeeDistributionClone.at(tx.events["StakerCreated"].values()[1])
+
+    clone_vault.approve(_mr, 10 ** 19, {"from": alice})
+    return _mr
+
+
+# Staking token of clone_multi, distributed like mvault
+@pytest.fixture
+def clone_vault(MockVault, accounts, alice):
+    _mv = MockVault.deploy(6 * 10 ** 19, {"from": alice})
     _mv.setIchiVaultFactory(mockIVFactoryAddress)
 
     for idx in range(1, 5):
@@ -54,9 +107,59 @@ def mvault(MockVault, multifactory, accounts, alice):
 
     return _mv
 
+# MultiFeeDistribution staker of mvault, which has approved it for 10 ** 19 from alice
+@pytest.fixture(scope="session")
+def multi(base_deployment, alice):
+    assert base_deployment.multi.owner() == alice
+    return base_deployment.multi
+
+
+# Instantiate MockVault staking token contract, this basically serves the purpose of the base
+# token(i.e. base_token) fixture. Accounts 1 to 4 hold 10 ** 19 each, alice the rest.
+@pytest.fixture(scope="session")
+def mvault(base_deployment):
+    return base_deployment.mvault
+
+
+# MockVault variant supporting EIP-2612 permits, used to test stakeWithPermit
+@pytest.fixture
+def mpermitvault(MockPermitVault, alice):
+    _mv = MockPermitVault.deploy(6 * 10 ** 19, {"from": alice})
+    _mv.setIchiVaultFactory(mockIVFactoryAddress)
+    return _mv
+
+
+@pytest.fixture
+def permit_multi(multifactory, MultiFeeDistribution, mpermitvault, alice):
+    tx = multifactory.deployStaker(mpermitvault, {"from": alice})
+    stakerAddress = tx.events["StakerCreated"].values()[1]
+    return MultiFeeDistribution.at(stakerAddress)
+
+
+@pytest.fixture(scope="session")
+def distributor_factory(base_deployment):
+    return base_deployment.distributor_factory
+
+
+# Alice runs a 30 day campaign of $RWD1 for the stakers of multi
+@pytest.fixture
+def distributor(distributor_factory, RewardCampaignDistributor, multi, reward_token, alice, chain):
+    tx = distributor_factory.createRewardCampaignDistributor(multi, reward_token, {"from": alice})
+    _distributor = RewardCampaignDistributor.at(
+        tx.events["RewardCampaignDistributorCreated"]["distributor"]
+    )
+    _distributor.grantCampaignManagerRole(alice, {"from": alice})
+    _distributor.grantDistributorRole(alice, {"from": alice})
+
+    amount = 10 ** 18
+    reward_token.approve(_distributor, amount, {"from": alice})
+    now = chain.time()
+    _distributor.setCampaign(now, now + 30 * 86400, amount, {"from": alice})
+    return _distributor
+
 
 # Instantiate base token and provide 5 addresses a balance
-@pytest.fixture(scope="module")
+@pytest.fixture
 def base_token(accounts, alice):
     token = ERC20()
     token._mint_for_testing(alice, 10 ** 18, {"from": alice})
@@ -66,7 +169,7 @@ def base_token(accounts, alice):
 
 
 # Alice creates a reward token $RWD1 for Bob
-@pytest.fixture(scope="module")
+@pytest.fixture
 def reward_token(multi, accounts, alice, bob):
     _token = ERC20()
     _token._mint_for_testing(alice, 10 ** 19, {"from": alice})
@@ -77,7 +180,7 @@ def reward_token(multi, accounts, alice, bob):
 
 
 # Alice creates a reward token $RWD1 for Bob
-@pytest.fixture(scope="module")
+@pytest.fixture
 def slow_token(multi, accounts, alice):
     slow_token = ERC20()
     amount = 10 ** 19
@@ -86,7 +189,7 @@ def slow_token(multi, accounts, alice):
     multi.addReward(slow_token, {"from": alice})
     return slow_token
 
-@pytest.fixture(scope="module")
+@pytest.fixture
 def issue_slow_token(multi, mvault, slow_token, alice, bob, chain):
     rewardAmount = 10 ** 18 # the initial staker will get this amount in it's entirely
     slow_token.transfer(mvault, rewardAmount, {"from": alice})
@@ -97,7 +200,7 @@ def issue_slow_token(multi, mvault, slow_token, alice, bob, chain):
     return init_amount
 
 # Alice creates a reward token $RWD2 for Charlie
-@pytest.fixture(scope="module")
+@pytest.fixture
 def reward_token2(multi, accounts, alice, charlie):
     _token = ERC20()
     _token._mint_for_testing(alice, 10 ** 18, {"from": alice})
@@ -107,7 +210,7 @@ def reward_token2(multi, accounts, alice, charlie):
 
 
 # Set a reward
-@pytest.fixture(scope="module")
+@pytest.fixture
 def issue(multi, mvault, reward_token, alice, bob, chain):
     rewardAmount = 10 ** 18 # the initial staker will get this amount in it's entirely
     reward_token.transfer(mvault, rewardAmount, {"from": alice})
@@ -118,7 +221,7 @@ def issue(multi, mvault, reward_token, alice, bob, chain):
 
 
 # Set a reward
-@pytest.fixture(scope="module")
+@pytest.fixture
 def bob_token(multi, reward_token, alice, bob, chain):
     multi.setRewardsDistributor(reward_token, bob, {"from": alice})
     reward_token.approve(multi, 10 ** 18, {"from": bob})
@@ -127,7 +230,7 @@ def bob_token(multi, reward_token, alice, bob, chain):
 
 
 # Transfer a random token by err
-@pytest.fixture(scope="module")
+@pytest.fixture
 def err_token(multi, reward_token, alice, bob, chain):
     err_token = ERC20()
     amount = 10 ** 18
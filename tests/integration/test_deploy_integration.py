@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+
+import json
+
+import pytest
+from brownie import ZERO_ADDRESS, web3
+from brownie.exceptions import VirtualMachineError
+from scripts.deploy import Deployment, DeploymentError, eip1559_fees
+
+ICHI_VAULT_FACTORY = "0x" + "12" * 20
+
+
+@pytest.fixture
+def vaults(MockVault, alice):
+    deployed = [MockVault.deploy(10 ** 18, {"from": alice}) for _ in range(2)]
+    for vault in deployed:
+        vault.setIchiVaultFactory(ICHI_VAULT_FACTORY, {"from": alice})
+    return [vault.address for vault in deployed]
+
+
+def manifest(vaults, reward_token, **kwargs):
+    return {
+        "ichi_vault_factory": ICHI_VAULT_FACTORY,
+        "stakers": [{"vault": vaults[0]}, {"vault": vaults[1], "clone": True}],
+        "distributors": [{"vault": vaults[0], "reward_token": reward_token.address}],
+        "multi_token_distributors": [{"vault": vaults[1]}],
+        **kwargs,
+    }
+
+
+def test_deploys_manifest(
+    vaults,
+    reward_token,
+    MultiFeeDistributionFactory,
+    RewardCampaignDistributorFactory,
+    MultiFeeDistribution,
+    MultiFeeDistributionClone,
+    alice,
+    bob,
+    tmp_path,
+):
+    state_path = tmp_path / "state.json"
+    addresses = Deployment(
+        manifest(vaults, reward_token, owner=bob.address), alice, state_path
+    ).run()
+
+    mfd_factory = MultiFeeDistributionFactory.at(addresses["factory:MultiFeeDistributionFactory"])
+    factory = RewardCampaignDistributorFactory.at(
+        addresses["factory:RewardCampaignDistributorFactory"]
+    )
+    assert mfd_factory.owner() == bob
+    assert factory.owner() == bob
+
+    staker = MultiFeeDistribution.at(addresses[f"staker:{vaults[0]}"])
+    clone = MultiFeeDistributionClone.at(addresses[f"staker:{vaults[1]}"])
+    assert mfd_factory.vaultToStaker(vaults[0]) == staker
+    assert clone.address == mfd_factory.predictStakerCloneAddress(vaults[1])
+    assert staker.owner() == bob
+    assert clone.owner() == bob
+
+    distributor = addresses[f"distributor:{vaults[0]}:{reward_token.address}"]
+    assert factory.getDistributor(staker, reward_token) == distributor
+    assert (
+        factory.getMultiTokenDistributor(clone) == addresses[f"multi_token_distributor:{vaults[1]}"]
+    )
+
+    state = json.loads(state_path.read_text())
+    assert state["deployer"] == alice.address
+    assert all("address" in step for step in state["steps"].values())
+
+
+# A failed run is resumed without resending the transactions that already went through
+def test_resumes_after_failure(
+    vaults, reward_token, RewardCampaignDistributorFactory, alice, tmp_path
+):
+    state_path = tmp_path / "state.json"
+    broken = manifest(vaults, reward_token)
+    broken["distributors"].append({"vault": vaults[1], "reward_token": ZERO_ADDRESS})
+
+    with pytest.raises((DeploymentError, VirtualMachineError)):
+        Deployment(broken, alice, state_path).run()
+    failed = json.loads(state_path.read_text())["steps"]
+    assert "address" not in failed.get(f"distributor:{vaults[1]}:{ZERO_ADDRESS}", {})
+
+    fixed = manifest(vaults, reward_token)
+    fixed["distributors"].append({"vault": vaults[1], "reward_token": reward_token.address})
+    addresses = Deployment(fixed, alice, state_path).run()
+    resumed = json.loads(state_path.read_text())["steps"]
+
+    for step_id, step in failed.items():
+        if "address" in step:
+            assert resumed[step_id] == step
+        elif "tx" in step and web3.eth.get_transaction_receipt(step["tx"])["status"] == 1:
+            assert resumed[step_id]["tx"] == step["tx"]
+    factory = RewardCampaignDistributorFactory.at(
+        addresses["factory:RewardCampaignDistributorFactory"]
+    )
+    assert factory.allDistributorsLength() == 2
+    assert factory.getMultiTokenDistributor(addresses[f"staker:{vaults[1]}"]) != ZERO_ADDRESS
+
+
+def test_eip1559_fees(monkeypatch):
+    history = {"baseFeePerGas": [10, 12, 14], "reward": [[3], [1], [2]]}
+    monkeypatch.setattr(web3.eth, "fee_history", lambda *args: history)
+    assert eip1559_fees() == {"max_fee": 2 * 14 + 2, "priority_fee": 2}
+
+    def unsupported(*args):
+        raise ValueError("the method eth_feeHistory does not exist")
+
+    monkeypatch.setattr(web3.eth, "fee_history", unsupported)
+    assert eip1559_fees() == {"gas_price": web3.eth.gas_price}
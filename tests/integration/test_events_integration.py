@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 
 from brownie.test import given, strategy
+from brownie_tokens.template import ERC20
 from utils import earned, injectReward
 
 # NOTE: this test case doesn't make sense in the context of the Gamma staking contract since there is no notify reward function
@@ -77,3 +78,66 @@ def test_recovered_fires(multi, alice, err_token, amount):
     tx = multi.recoverERC20(err_token, amount, {"from": alice})
     assert tx.events["Recovered"].values()[0] == err_token
     assert tx.events["Recovered"].values()[1] == amount
+
+
+# Does the RewardAdded event fire?
+def test_reward_added_fires(multi, alice):
+    token = ERC20()
+    multi.setManagers([alice], {"from": alice})
+    tx = multi.addReward(token, {"from": alice})
+    assert tx.events["RewardAdded"]["rewardToken"] == token
+
+
+# Can rewardData, userData and claimable be rebuilt from the MFD logs alone?
+def test_state_rebuilt_from_logs(multi, mvault, reward_token, slow_token, alice, bob, charlie):
+    users = [bob, charlie]
+    tokens = [reward_token, slow_token]
+    for user in users:
+        mvault.approve(multi, 10 ** 19, {"from": user})
+
+    txs = [
+        multi.stake(10 ** 18, bob, {"from": bob}),
+        reward_token.transfer(multi, 10 ** 16, {"from": alice}),
+        multi.stake(3 * 10 ** 18, charlie, {"from": charlie}),
+        slow_token.transfer(multi, 7 * 10 ** 15, {"from": alice}),
+        multi.getReward(bob, [slow_token], {"from": bob}),
+        reward_token.transfer(multi, 10 ** 15 + 3, {"from": alice}),
+        multi.unstake(10 ** 18, {"from": charlie}),
+        slow_token.transfer(multi, 10 ** 15 + 1, {"from": alice}),
+        multi.getAllRewards({"from": charlie}),
+        multi.stake(10 ** 17, bob, {"from": bob}),
+    ]
+
+    reward_per_token = {}
+    amount = {}
+    token_amount = {}
+    user_reward_per_token = {}
+    claimable = {}
+    for tx in txs:
+        for event in tx.events:
+            if event.address != multi:
+                continue
+            if event.name == "RewardUpdated":
+                reward_per_token[event["rewardToken"]] = event["rewardPerToken"]
+                amount[event["rewardToken"]] = event["amount"]
+            elif event.name == "UserRewardUpdated":
+                key = (event["user"], event["rewardToken"])
+                user_reward_per_token[key] = event["rewardPerToken"]
+                claimable[key] = event["claimable"]
+            elif event.name == "RewardPaid":
+                claimable[(event["user"], event["rewardToken"])] = 0
+                amount[event["rewardToken"]] -= event["reward"]
+            elif event.name == "Stake":
+                token_amount[event["user"]] = token_amount.get(event["user"], 0) + event["amount"]
+            elif event.name == "Unstake":
+                token_amount[event["user"]] -= event["receivedAmount"]
+
+    for token in tokens:
+        assert multi.rewardData(token)["rewardPerToken"] == reward_per_token[token.address]
+        assert multi.rewardData(token)["amount"] == amount[token.address]
+    for user in users:
+        assert multi.userData(user)["tokenAmount"] == token_amount[user.address]
+        for token in tokens:
+            key = (user.address, token.address)
+            assert multi.getUserRewardPerToken(user, token) == user_reward_per_token.get(key, 0)
+            assert multi.claimable(token, user) == claimable.get(key, 0)
@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+
+import pytest
+from brownie import web3
+from scripts.indexer import DISTRIBUTOR, DISTRIBUTOR_FACTORY, MFD, MFD_FACTORY, EventIndexer
+
+
+# Stakes, a recovery, a distributor campaign and a claim, across a staker and a distributor
+@pytest.fixture
+def activity(multi, mvault, distributor, err_token, alice, bob, chain):
+    multi.stake(10 ** 18, alice, {"from": alice})
+    mvault.approve(multi, 10 ** 18, {"from": bob})
+    multi.stake(10 ** 18, bob, {"from": bob})
+    multi.recoverERC20(err_token, 10 ** 18, {"from": alice})
+
+    chain.sleep(3600)
+    chain.mine()
+    distributor.distributeRewards({"from": alice})
+
+    multi.getAllRewards({"from": bob})
+    multi.unstake(10 ** 17, {"from": bob})
+
+
+def new_indexer(path, multifactory, distributor_factory, **kwargs):
+    indexer = EventIndexer(path, **kwargs)
+    indexer.watch(multifactory, MFD_FACTORY)
+    indexer.watch(distributor_factory, DISTRIBUTOR_FACTORY)
+    return indexer
+
+
+def summary(events):
+    return [(e["block"], e["log_index"], e["address"], e["name"], e["args"]) for e in events]
+
+
+# Watching the factories is enough to index every staker and distributor they deploy
+def test_indexes_discovered_contracts(
+    multifactory, multi, distributor_factory, activity, reward_token, alice, bob, tmp_path
+):
+    indexer = new_indexer(tmp_path / "events.db", multifactory, distributor_factory)
+    indexer.run()
+
+    assert indexer.checkpoint == web3.eth.block_number
+    assert indexer.contracts(MFD) == {multi.address: MFD}
+    (distributor,) = indexer.contracts(DISTRIBUTOR)
+    assert distributor == distributor_factory.getDistributor(multi, reward_token)
+
+    stakes = [(e["args"]["user"], e["args"]["amount"]) for e in indexer.events("Stake")]
+    assert stakes == [(alice.address, 10 ** 18), (bob.address, 10 ** 18)]
+    assert [e["args"]["receivedAmount"] for e in indexer.events("Unstake")] == [10 ** 17]
+    assert [e["args"]["amount"] for e in indexer.events("Recovered")] == [10 ** 18]
+    assert len(list(indexer.events("CampaignSet", distributor))) == 1
+
+    (distributed,) = indexer.events("RewardsDistributed")
+    assert distributed["args"]["mfd"] == multi.address
+    paid = {e["args"]["rewardToken"]: e["args"]["reward"] for e in indexer.events("RewardPaid")}
+    assert paid[reward_token.address] > 0
+
+
+# An indexer restarted part way through ends with the same store as a single run
+def test_resumes_from_checkpoint(multifactory, distributor_factory, activity, tmp_path):
+    head = web3.eth.block_number
+    reference = new_indexer(tmp_path / "reference.db", multifactory, distributor_factory)
+    reference.run(head)
+
+    path = tmp_path / "events.db"
+    indexer = new_indexer(path, multifactory, distributor_factory, chunk_size=1, max_chunk_size=2)
+    for _ in indexer.stream(head):
+        if indexer.checkpoint >= head - 5:
+            break
+    indexer.close()
+
+    indexer = EventIndexer(path)
+    assert indexer.checkpoint < head
+    indexer.run(head)
+
+    assert indexer.checkpoint == head
+    assert summary(indexer.events()) == summary(reference.events())
+
+
+# Ranges the node rejects are split until they succeed
+def test_shrinks_chunk_on_rpc_error(
+    multifactory, distributor_factory, activity, tmp_path, monkeypatch
+):
+    reference = new_indexer(tmp_path / "reference.db", multifactory, distributor_factory)
+    reference.run()
+
+    indexer = new_indexer(tmp_path / "events.db", multifactory, distributor_factory)
+    get_logs = indexer._get_logs
+    requested = []
+
+    def limited_get_logs(addresses, from_block, to_block):
+        requested.append(to_block - from_block + 1)
+        if to_block - from_block >= 4:
+            raise ValueError("query returned more than 10000 results")
+        return get_logs(addresses, from_block, to_block)
+
+    monkeypatch.setattr(indexer, "_get_logs", limited_get_logs)
+    indexer.run()
+
+    assert requested[0] > 4
+    assert indexer.chunk_size <= 8
+    assert summary(indexer.events()) == summary(reference.events())
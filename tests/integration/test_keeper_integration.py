@@ -0,0 +1,168 @@
+#!/usr/bin/python3
+
+import asyncio
+
+import pytest
+from scripts.keeper import Keeper
+
+CADENCE = 3600
+
+
+@pytest.fixture
+def keeper(distributor_factory, distributor, multi, alice):
+    # the distributors require the MFD to have updated in an earlier block
+    multi.stake(10 ** 18, alice, {"from": alice})
+    multi.stake(10 ** 18, alice, {"from": alice})
+
+    _keeper = Keeper(distributor_factory, alice, cadence=CADENCE, max_connections=4, retry_delay=0)
+    yield _keeper
+    _keeper.close()
+
+
+def run_once(keeper):
+    return asyncio.run(keeper.run_once())
+
+
+def add_distributor(distributor_factory, RewardCampaignDistributor, multi, token, alice, chain):
+    tx = distributor_factory.createRewardCampaignDistributor(multi, token, {"from": alice})
+    distributor = RewardCampaignDistributor.at(
+        tx.events["RewardCampaignDistributorCreated"]["distributor"]
+    )
+    distributor.grantCampaignManagerRole(alice, {"from": alice})
+    distributor.grantDistributorRole(alice, {"from": alice})
+    token.approve(distributor, 10 ** 18, {"from": alice})
+    now = chain.time()
+    distributor.setCampaign(now, now + 30 * 86400, 10 ** 18, {"from": alice})
+    return distributor
+
+
+def add_multi_token_distributor(
+    distributor_factory, MultiTokenCampaignDistributor, multi, tokens, alice, chain
+):
+    tx = distributor_factory.createMultiTokenCampaignDistributor(multi, {"from": alice})
+    distributor = MultiTokenCampaignDistributor.at(
+        tx.events["MultiTokenCampaignDistributorCreated"]["distributor"]
+    )
+    distributor.grantCampaignManagerRole(alice, {"from": alice})
+    distributor.grantDistributorRole(alice, {"from": alice})
+    now = chain.time()
+    for token in tokens:
+        token.approve(distributor, 10 ** 18, {"from": alice})
+        distributor.setCampaign(token, now, now + 30 * 86400, 10 ** 18, {"from": alice})
+    return distributor
+
+
+# Distributions are sent once per cadence
+def test_distributes_on_cadence(keeper, distributor, alice, chain):
+    assert run_once(keeper) == []
+    assert keeper.distributors == [distributor]
+
+    chain.sleep(CADENCE)
+    chain.mine()
+    (tx,) = run_once(keeper)
+    assert tx.receiver == distributor
+    assert tx.events["RewardsDistributed"]["amount"] > 0
+    assert distributor.lastDistribution() == tx.timestamp
+    assert keeper.nonce == alice.nonce
+
+    assert run_once(keeper) == []
+
+
+# Distributors created after the keeper started are picked up and sent in the same round
+def test_distributes_new_distributors(
+    keeper,
+    distributor_factory,
+    RewardCampaignDistributor,
+    distributor,
+    multi,
+    reward_token2,
+    alice,
+    chain,
+):
+    run_once(keeper)
+    second = add_distributor(
+        distributor_factory, RewardCampaignDistributor, multi, reward_token2, alice, chain
+    )
+    multi.updateReward({"from": alice})
+
+    chain.sleep(CADENCE)
+    chain.mine()
+    txs = run_once(keeper)
+    assert keeper.distributors == [distributor, second]
+    assert {tx.receiver for tx in txs} == {distributor.address, second.address}
+    assert sorted(tx.nonce for tx in txs) == [alice.nonce - 2, alice.nonce - 1]
+
+
+# Multi-token distributors are driven like the others, with one transaction for all their tokens
+def test_distributes_multi_token_distributors(
+    keeper,
+    distributor_factory,
+    MultiTokenCampaignDistributor,
+    distributor,
+    multi,
+    reward_token2,
+    slow_token,
+    alice,
+    chain,
+):
+    # tokens the single-token distributor does not notify, as the MFD takes a token once a block
+    multi_token = add_multi_token_distributor(
+        distributor_factory,
+        MultiTokenCampaignDistributor,
+        multi,
+        [reward_token2, slow_token],
+        alice,
+        chain,
+    )
+    multi.updateReward({"from": alice})
+
+    chain.sleep(CADENCE)
+    chain.mine()
+    txs = run_once(keeper)
+    assert keeper.multi_token_distributors == [multi_token]
+    assert {tx.receiver for tx in txs} == {distributor.address, multi_token.address}
+
+    (tx,) = [tx for tx in txs if tx.receiver == multi_token]
+    tokens = {event["rewardToken"] for event in tx.events["RewardsDistributed"]}
+    assert tokens == {reward_token2.address, slow_token.address}
+    for token in (reward_token2, slow_token):
+        assert multi_token.lastDistribution(token) == tx.timestamp
+
+    assert run_once(keeper) == []
+
+
+# A nonce used by another transaction of the keeper account is detected and the send retried
+def test_resyncs_nonce(keeper, distributor, alice, bob, chain):
+    chain.sleep(CADENCE)
+    chain.mine()
+    run_once(keeper)
+
+    alice.transfer(bob, 1)
+    chain.sleep(CADENCE)
+    chain.mine()
+    (tx,) = run_once(keeper)
+    assert tx.nonce == alice.nonce - 1
+    assert keeper.nonce == alice.nonce
+
+
+# The remainder of a campaign is sent as soon as it ends, regardless of the cadence
+def test_distributes_campaign_end(keeper, distributor, reward_token, chain):
+    (_, end_time, _, _, _) = distributor.getCampaign()
+    chain.sleep(end_time - chain.time() + 1)
+    chain.mine()
+    run_once(keeper)
+    assert reward_token.balanceOf(distributor) == 0
+
+    chain.sleep(CADENCE)
+    chain.mine()
+    assert run_once(keeper) == []
+
+
+# Distributors the keeper may not distribute for are skipped
+def test_skips_reverting_distribution(keeper, distributor, bob, chain):
+    keeper.account = bob
+    nonce = bob.nonce
+    chain.sleep(CADENCE)
+    chain.mine()
+    assert run_once(keeper) == []
+    assert bob.nonce == nonce
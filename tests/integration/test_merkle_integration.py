@@ -0,0 +1,159 @@
+#!/usr/bin/python3
+
+import brownie
+import pytest
+from brownie_tokens.template import ERC20
+from scripts.merkle_rewards import BlockTimes, allocate, build_campaign, stake_events, stake_weights
+
+DAY = 86400
+CAMPAIGN_AMOUNT = 10 ** 18
+
+
+@pytest.fixture
+def merkle_distributor(MerkleCampaignDistributor, multi, alice):
+    _distributor = MerkleCampaignDistributor.deploy(multi, alice, {"from": alice})
+    _distributor.grantCampaignManagerRole(alice, {"from": alice})
+    return _distributor
+
+
+@pytest.fixture
+def long_tail_token(alice):
+    token = ERC20()
+    token._mint_for_testing(alice, 2 * CAMPAIGN_AMOUNT, {"from": alice})
+    return token
+
+
+# Alice, Bob and Charlie stake at different times, Alice leaves halfway
+@pytest.fixture
+def history(multi, mvault, alice, bob, charlie, chain):
+    for account in (bob, charlie):
+        mvault.approve(multi, 10 ** 19, {"from": account})
+
+    stakes = [
+        multi.stake(2 * 10 ** 18, alice, {"from": alice}),
+        multi.stake(10 ** 18, bob, {"from": bob}),
+    ]
+    chain.sleep(DAY)
+    stakes.append(multi.stake(10 ** 18, charlie, {"from": charlie}))
+    chain.sleep(DAY)
+    unstake = multi.unstake(2 * 10 ** 18, {"from": alice})
+    chain.sleep(DAY)
+    chain.mine()
+    end = chain.time()
+
+    (alice_in, bob_in, charlie_in) = (tx.timestamp for tx in stakes)
+    start = alice_in
+    expected = {
+        alice.address: 2 * 10 ** 18 * (unstake.timestamp - alice_in),
+        bob.address: 10 ** 18 * (end - bob_in),
+        charlie.address: 10 ** 18 * (end - charlie_in),
+    }
+    return (start, end, expected)
+
+
+def new_campaign(distributor, token, campaign, alice, chain):
+    token.approve(distributor, campaign["total"], {"from": alice})
+    tx = distributor.createCampaign(
+        token, campaign["merkleRoot"], campaign["total"], chain.time() + 30 * DAY, {"from": alice}
+    )
+    return tx.return_value
+
+
+# The entitlements built from the stake history are paid out in full through their proofs
+def test_claims_from_stake_history(
+    multi, merkle_distributor, long_tail_token, history, alice, bob, chain
+):
+    (start, end, expected) = history
+    weights = stake_weights(stake_events(multi), start, end, BlockTimes())
+    assert weights == expected
+
+    campaign = build_campaign(allocate(weights, CAMPAIGN_AMOUNT))
+    assert campaign["total"] <= CAMPAIGN_AMOUNT
+    campaign_id = new_campaign(merkle_distributor, long_tail_token, campaign, alice, chain)
+
+    for account, claim in campaign["claims"].items():
+        before = long_tail_token.balanceOf(account)
+        # anyone can claim on behalf of an account
+        merkle_distributor.claim(
+            campaign_id, claim["index"], account, claim["amount"], claim["proof"], {"from": bob}
+        )
+        assert long_tail_token.balanceOf(account) == before + claim["amount"]
+        assert merkle_distributor.isClaimed(campaign_id, claim["index"])
+
+    assert merkle_distributor.getCampaign(campaign_id)["remainingAmount"] == 0
+    assert long_tail_token.balanceOf(merkle_distributor) == 0
+
+
+def test_rejects_double_and_forged_claims(
+    multi, merkle_distributor, long_tail_token, history, alice, bob, charlie, chain
+):
+    (start, end, _) = history
+    weights = stake_weights(stake_events(multi), start, end, BlockTimes())
+    campaign = build_campaign(allocate(weights, CAMPAIGN_AMOUNT))
+    campaign_id = new_campaign(merkle_distributor, long_tail_token, campaign, alice, chain)
+
+    claim = campaign["claims"][bob.address]
+    with brownie.reverts("IPF"):
+        merkle_distributor.claim(
+            campaign_id, claim["index"], bob, claim["amount"] + 1, claim["proof"], {"from": bob}
+        )
+    with brownie.reverts("IPF"):
+        merkle_distributor.claim(
+            campaign_id, claim["index"], charlie, claim["amount"], claim["proof"], {"from": charlie}
+        )
+
+    merkle_distributor.claim(
+        campaign_id, claim["index"], bob, claim["amount"], claim["proof"], {"from": bob}
+    )
+    with brownie.reverts("ACL"):
+        merkle_distributor.claim(
+            campaign_id, claim["index"], bob, claim["amount"], claim["proof"], {"from": bob}
+        )
+
+
+# Campaigns of the same token are funded and claimed independently
+def test_campaigns_are_independent(
+    multi, merkle_distributor, long_tail_token, history, alice, bob, chain
+):
+    (start, end, _) = history
+    weights = stake_weights(stake_events(multi), start, end, BlockTimes())
+    campaigns = [
+        build_campaign(allocate(weights, CAMPAIGN_AMOUNT // 2)),
+        build_campaign(allocate(weights, CAMPAIGN_AMOUNT // 4)),
+    ]
+    ids = [new_campaign(merkle_distributor, long_tail_token, c, alice, chain) for c in campaigns]
+    assert merkle_distributor.campaignsLength() == 2
+
+    for campaign_id, campaign in zip(ids, campaigns):
+        claim = campaign["claims"][bob.address]
+        merkle_distributor.claim(
+            campaign_id, claim["index"], bob, claim["amount"], claim["proof"], {"from": bob}
+        )
+        assert not merkle_distributor.isClaimed(1 - campaign_id, claim["index"])
+    assert long_tail_token.balanceOf(bob) == sum(
+        c["claims"][bob.address]["amount"] for c in campaigns
+    )
+
+
+def test_withdraw_unclaimed(multi, merkle_distributor, long_tail_token, history, alice, bob, chain):
+    (start, end, _) = history
+    weights = stake_weights(stake_events(multi), start, end, BlockTimes())
+    campaign = build_campaign(allocate(weights, CAMPAIGN_AMOUNT))
+    campaign_id = new_campaign(merkle_distributor, long_tail_token, campaign, alice, chain)
+
+    with brownie.reverts("CNE"):
+        merkle_distributor.withdrawUnclaimed(campaign_id, alice, {"from": alice})
+    with brownie.reverts("RNM"):
+        merkle_distributor.withdrawUnclaimed(campaign_id, bob, {"from": bob})
+
+    chain.sleep(31 * DAY)
+    before = long_tail_token.balanceOf(alice)
+    merkle_distributor.withdrawUnclaimed(campaign_id, alice, {"from": alice})
+    assert long_tail_token.balanceOf(alice) == before + campaign["total"]
+
+    # nothing is left to claim from a withdrawn campaign
+    claim = campaign["claims"][bob.address]
+    with brownie.reverts():
+        merkle_distributor.claim(
+            campaign_id, claim["index"], bob, claim["amount"], claim["proof"], {"from": bob}
+        )
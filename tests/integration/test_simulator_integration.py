@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+
+import random
+
+from brownie.test import given, strategy
+from hypothesis import settings
+from scripts.simulator import Event, MFDSimulator
+
+
+def random_events(rnd, users, tokens, stakes, count):
+    for _ in range(count):
+        kind = rnd.choice(["stake", "stake", "unstake", "inject", "inject", "claim", "update"])
+        user = rnd.choice(users)
+        if kind == "stake":
+            amount = rnd.randint(1, 10 ** rnd.randint(1, 18))
+            stakes[user] += amount
+            yield Event("stake", user, amount)
+        elif kind == "unstake" and stakes[user] > 0:
+            amount = rnd.randint(1, stakes[user])
+            stakes[user] -= amount
+            yield Event("unstake", user, amount)
+        elif kind == "inject":
+            yield Event("inject", rnd.choice(tokens), rnd.randint(1, 10 ** rnd.randint(1, 15)))
+        elif kind == "claim":
+            yield Event("claim", user, rnd.choice([None, tokens[:1], tokens[::-1]]))
+        elif kind == "update":
+            yield Event("update")
+
+
+def apply_on_chain(multi, event, funder):
+    if event.kind == "stake":
+        return multi.stake(event.amount, event.target, {"from": event.target})
+    if event.kind == "unstake":
+        return multi.unstake(event.amount, {"from": event.target})
+    if event.kind == "inject":
+        return event.target.transfer(multi, event.amount, {"from": funder})
+    if event.kind == "claim":
+        if event.amount is None:
+            return multi.getAllRewards({"from": event.target})
+        return multi.getReward(event.target, event.amount, {"from": event.target})
+    return multi.updateReward({"from": funder})
+
+
+# The simulator reproduces the contract state for randomized stake/unstake/inject/claim sequences
+@given(seed=strategy("uint32"))
+@settings(max_examples=5)
+def test_simulator_matches_contract(
+    multi, mvault, reward_token, reward_token2, alice, bob, charlie, manager1, seed
+):
+    users = [bob, charlie, manager1]
+    tokens = [reward_token, reward_token2]
+    for user in users:
+        mvault.approve(multi, 10 ** 19, {"from": user})
+
+    rnd = random.Random(seed)
+    events = list(random_events(rnd, users, tokens, {user: 0 for user in users}, 40))
+
+    paid = {}
+    for event in events:
+        tx = apply_on_chain(multi, event, alice)
+        for e in tx.events["RewardPaid"] if "RewardPaid" in tx.events else []:
+            key = (e["user"], e["rewardToken"])
+            paid[key] = paid.get(key, 0) + e["reward"]
+
+    sim = MFDSimulator([str(token) for token in tokens])
+    sim.replay(Event(e.kind, _address(e.target), _tokens(e)) for e in events)
+
+    assert multi.totalStakes() == sim.total_stakes
+    for i, token in enumerate(tokens):
+        reward = multi.rewardData(token)
+        assert reward["rewardPerToken"] == sim.reward_per_token[i]
+        assert reward["amount"] == sim.accounted[i]
+
+    for user in users:
+        index = sim._user(str(user))
+        assert multi.userData(user)["tokenAmount"] == sim.token_amounts[index]
+        assert list(multi.claimableRewards(user)[1]) == sim.claimable_rewards(str(user))
+        for i, token in enumerate(tokens):
+            assert multi.claimable(token, user) == sim.claimable[index, i]
+            assert multi.getUserRewardPerToken(user, token) == sim.user_reward_per_token[index, i]
+            assert paid.get((user, token), 0) == sim.paid[index, i]
+
+
+def _address(target):
+    return str(target) if target is not None else None
+
+
+def _tokens(event):
+    if event.kind == "claim" and event.amount is not None:
+        return [str(token) for token in event.amount]
+    return event.amount
@@ -14,10 +14,7 @@ def earned(multi, account, token):
 
 
 def exit(multi, account):
-    amount = multi.userData(account)["tokenAmount"]
-    unstakeTx = multi.unstake(amount, {"from": account})
-    getAllRewardsTx = multi.getAllRewards({"from": account})
-    return [unstakeTx, getAllRewardsTx]
+    return multi.exit({"from": account})
 
 
 def injectReward(mvault, farmingContract, rewardToken, amount, account):
@@ -26,3 +26,33 @@ def test_reward_per_token_zero_supply(multi, alice):
     multi.setManagers([alice], {"from": alice})
     multi.addReward(token, {"from": alice})
     assert multi.rewardData(token)["rewardPerToken"] == 0
+
+
+# Several rewards are added in one transaction, in order
+def test_add_rewards(multi, alice):
+    tokens = [ERC20() for _ in range(3)]
+    multi.setManagers([alice], {"from": alice})
+    tx = multi.addRewards(tokens, {"from": alice})
+
+    assert [e["rewardToken"] for e in tx.events["RewardAdded"]] == tokens
+    for idx, token in enumerate(tokens):
+        assert multi.rewardTokens(idx) == token
+        assert multi.rewardTokenIndex(token) == idx + 1
+
+
+def test_add_rewards_only_manager(multi, bob):
+    with brownie.reverts(withCustomError('InsufficientPermission()')):
+        multi.addRewards([ERC20()], {"from": bob})
+
+
+# A duplicate within the batch, or of an existing reward, reverts the whole batch
+def test_add_rewards_duplicate(multi, alice):
+    (token, other) = (ERC20(), ERC20())
+    multi.setManagers([alice], {"from": alice})
+    with brownie.reverts(withCustomError('ActiveReward()')):
+        multi.addRewards([token, other, token], {"from": alice})
+
+    multi.addReward(token, {"from": alice})
+    with brownie.reverts(withCustomError('ActiveReward()')):
+        multi.addRewards([other, token], {"from": alice})
+    assert multi.rewardTokenIndex(other) == 0
@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+
+from scripts.batch_views import claimable_rewards_for_many, user_reward_per_token_for_many
+
+
+def stake_and_accrue(multi, mvault, reward_token, slow_token, alice, users):
+    for idx, user in enumerate(users):
+        amount = (idx + 1) * 10 ** 17
+        mvault.approve(multi, amount, {"from": user})
+        multi.stake(amount, user, {"from": user})
+    reward_token.transfer(mvault, 10 ** 17, {"from": alice})
+    slow_token.transfer(multi, 10 ** 17, {"from": alice})
+    multi.updateReward({"from": alice})
+
+
+# The batched view matches claimableRewards for every account
+def test_claimable_rewards_for_many(
+    multi, mvault, reward_token, slow_token, alice, bob, charlie, manager1, issue
+):
+    users = [bob, charlie, manager1]
+    stake_and_accrue(multi, mvault, reward_token, slow_token, alice, users)
+
+    (tokens, amounts) = multi.claimableRewardsForMany(users + [alice], [])
+    assert list(tokens) == [reward_token, slow_token]
+    for user, user_amounts in zip(users, amounts):
+        assert list(user_amounts) == list(multi.claimableRewards(user)[1])
+        assert all(amount > 0 for amount in user_amounts)
+    assert list(amounts[3]) == [0, 0]
+
+    (tokens, amounts) = multi.claimableRewardsForMany(users, [slow_token])
+    assert list(tokens) == [slow_token]
+    assert [list(a) for a in amounts] == [[multi.claimableRewards(u)[1][1]] for u in users]
+
+
+# The batched view matches getUserRewardPerToken for every user and token
+def test_user_reward_per_token_for_many(
+    multi, mvault, reward_token, slow_token, alice, bob, charlie, issue
+):
+    users = [bob, charlie]
+    stake_and_accrue(multi, mvault, reward_token, slow_token, alice, users)
+    multi.stake(10 ** 17, bob, {"from": bob})
+
+    tokens = [reward_token, slow_token]
+    values = multi.getUserRewardPerTokenForMany(users, tokens)
+    for user, user_values in zip(users, values):
+        assert list(user_values) == [multi.getUserRewardPerToken(user, t) for t in tokens]
+    assert values[0][0] > 0
+
+
+# The python helpers chunk the user list and merge the results
+def test_chunked_helpers(
+    multi, mvault, reward_token, slow_token, alice, bob, charlie, manager1, accounts, issue
+):
+    users = [bob, charlie, manager1]
+    stake_and_accrue(multi, mvault, reward_token, slow_token, alice, users)
+    users = users + list(accounts[5:])
+
+    claimable = claimable_rewards_for_many(multi, users, chunk_size=2)
+    assert list(claimable) == users
+    for user in users:
+        expected = dict(zip(*multi.claimableRewards(user)))
+        assert claimable[user] == expected
+
+    values = user_reward_per_token_for_many(multi, users, [reward_token], chunk_size=3)
+    for user in users:
+        assert values[user] == {reward_token: multi.getUserRewardPerToken(user, reward_token)}
@@ -0,0 +1,51 @@
+#!/usr/bin/python3
+
+import brownie
+from utils import withCustomError
+
+
+def test_deploy_staker_clone(multifactory, clone_multi, clone_vault, alice):
+    assert clone_multi.address == multifactory.predictStakerCloneAddress(clone_vault)
+    assert multifactory.vaultToStaker(clone_vault) == clone_multi
+    assert clone_multi.stakingToken() == clone_vault
+    assert clone_multi.owner() == alice
+
+
+def test_cannot_deploy_both_variants(multifactory, clone_multi, clone_vault, alice):
+    with brownie.reverts("ALREADY_DEPLOYED"):
+        multifactory.deployStaker(clone_vault, {"from": alice})
+    with brownie.reverts("ALREADY_DEPLOYED"):
+        multifactory.deployStakerClone(clone_vault, {"from": alice})
+
+
+def test_cannot_initialize_twice(
+    multifactory, MultiFeeDistributionClone, clone_multi, clone_vault, bob
+):
+    with brownie.reverts("Initializable: contract is already initialized"):
+        clone_multi.initialize(clone_vault, bob, {"from": bob})
+
+    implementation = MultiFeeDistributionClone.at(multifactory.stakerImplementation())
+    with brownie.reverts("Initializable: contract is already initialized"):
+        implementation.initialize(clone_vault, bob, {"from": bob})
+
+
+# A clone stakes, collects and pays rewards like the CREATE2 deployed staker
+def test_clone_rewards(clone_multi, clone_vault, reward_token, alice, bob):
+    clone_multi.setManagers([alice], {"from": alice})
+    clone_multi.addReward(reward_token, {"from": alice})
+    clone_vault.setFarmingContract(clone_multi, {"from": alice})
+    clone_vault.setRewardTokens([reward_token], {"from": alice})
+
+    clone_multi.stake(10 ** 18, alice, {"from": alice})
+    reward_token.transfer(clone_vault, 10 ** 17, {"from": alice})
+    clone_multi.updateReward({"from": alice})
+
+    balance = reward_token.balanceOf(alice)
+    clone_multi.getAllRewards({"from": alice})
+    assert reward_token.balanceOf(alice) - balance == 10 ** 17
+
+    clone_multi.unstake(10 ** 18, {"from": alice})
+    assert clone_multi.totalStakes() == 0
+
+    with brownie.reverts(withCustomError("IsStakingToken()")):
+        clone_multi.recoverERC20(clone_vault, 1, {"from": alice})
@@ -0,0 +1,164 @@
+#!/usr/bin/python3
+
+import brownie
+from utils import withCustomError
+
+
+# Every update records the block it collected in
+def test_last_collection_block(multi, mvault, reward_token, issue, alice):
+    assert multi.lastCollectionBlock() == 0
+
+    tx = multi.stake(10 ** 18, alice, {"from": alice})
+    assert multi.lastCollectionBlock() == tx.block_number
+
+    tx = multi.updateReward({"from": alice})
+    assert multi.lastCollectionBlock() == tx.block_number
+
+
+# The first stake of a block collects, so rewards collected before a staker joined in the same
+# block still go to the existing staker only. Later stakes in the block skip the collection.
+def test_same_block_stakers_do_not_share_prior_rewards(
+    multi, mvault, reward_token, issue, MockSameBlockStaker, alice, bob, charlie
+):
+    multi.stake(10 ** 18, alice, {"from": alice})
+    reward_token.transfer(mvault, 10 ** 18, {"from": alice})
+
+    staker = MockSameBlockStaker.deploy({"from": alice})
+    mvault.approve(staker, 2 * 10 ** 18, {"from": alice})
+    tx = staker.stakeFor(multi, [bob, charlie], 10 ** 18, {"from": alice})
+    assert len([e for e in tx.events["Transfer"] if e["_from"] == mvault]) == 1
+    assert multi.userData(bob)["tokenAmount"] == 10 ** 18
+    assert multi.userData(charlie)["tokenAmount"] == 10 ** 18
+
+    reward_token.transfer(mvault, 3 * 10 ** 18, {"from": alice})
+    multi.updateReward({"from": alice})
+
+    (_, [alice_amount]) = multi.claimableRewards(alice)
+    (_, [bob_amount]) = multi.claimableRewards(bob)
+    (_, [charlie_amount]) = multi.claimableRewards(charlie)
+    assert bob_amount == charlie_amount == 10 ** 18
+    assert alice_amount == 3 * 10 ** 18
+
+
+def collected(tx, mvault):
+    return "Transfer" in tx.events and any(
+        e["_from"] == mvault and e["_value"] for e in tx.events["Transfer"]
+    )
+
+
+def test_only_owner_sets_collection_interval(multi, bob):
+    with brownie.reverts("Ownable: caller is not the owner"):
+        multi.setCollectionInterval(3600, {"from": bob})
+
+
+def test_set_collection_interval(multi, alice):
+    tx = multi.setCollectionInterval(3600, {"from": alice})
+    assert multi.collectionInterval() == 3600
+    assert tx.events["CollectionIntervalUpdated"]["collectionInterval"] == 3600
+
+    max_interval = multi.MAX_COLLECTION_INTERVAL()
+    multi.setCollectionInterval(max_interval, {"from": alice})
+    assert multi.collectionInterval() == max_interval
+
+    with brownie.reverts(withCustomError("InvalidInterval()")):
+        multi.setCollectionInterval(max_interval + 1, {"from": alice})
+
+
+# Claims within the interval skip the collection, the first one at the boundary collects
+def test_collection_interval_boundary(multi, mvault, reward_token, issue, alice, chain):
+    interval = 3600
+    multi.setCollectionInterval(interval, {"from": alice})
+    first = multi.stake(10 ** 18, alice, {"from": alice})
+    assert collected(first, mvault)
+    assert multi.lastCollectionTime() == first.timestamp
+    boundary = first.timestamp + interval
+
+    reward_token.transfer(mvault, 10 ** 18, {"from": alice})
+    chain.mine(timestamp=boundary - 1)
+    tx = multi.getAllRewards({"from": alice})
+    assert tx.timestamp == boundary - 1
+    assert not collected(tx, mvault)
+    assert multi.lastCollectionTime() == first.timestamp
+
+    chain.mine(timestamp=boundary)
+    tx = multi.getAllRewards({"from": alice})
+    assert tx.timestamp == boundary
+    assert collected(tx, mvault)
+    assert multi.lastCollectionTime() == boundary
+
+
+# Stakes and unstakes collect within the interval, a new staker settles against the accumulators
+# of its block
+def test_balance_changes_always_collect(multi, mvault, reward_token, issue, alice, bob, chain):
+    multi.setCollectionInterval(3600, {"from": alice})
+    multi.stake(10 ** 18, alice, {"from": alice})
+    mvault.approve(multi, 10 ** 19, {"from": bob})
+
+    reward_token.transfer(mvault, 10 ** 18, {"from": alice})
+    chain.sleep(60)
+    tx = multi.stake(10 ** 18, bob, {"from": bob})
+    assert collected(tx, mvault)
+    assert multi.lastCollectionTime() == tx.timestamp
+    (_, [bob_amount]) = multi.claimableRewards(bob)
+    assert bob_amount == 0
+
+    reward_token.transfer(mvault, 10 ** 18, {"from": alice})
+    chain.sleep(60)
+    tx = multi.unstake(10 ** 18, {"from": bob})
+    assert collected(tx, mvault)
+    (_, [bob_amount]) = multi.claimableRewards(bob)
+    assert bob_amount == 10 ** 18 // 2
+
+
+# Staking, forcing a collection and unstaking in one transaction earns nothing of what accrued
+# during the interval, from the vault or from a stream
+def test_stake_update_unstake_earns_nothing(
+    multi, mvault, reward_token, issue, MockIntervalAttacker, alice, bob, chain
+):
+    multi.setCollectionInterval(3600, {"from": alice})
+    multi.stake(10 ** 18, alice, {"from": alice})
+    reward_token.approve(multi, 10 ** 18, {"from": alice})
+    multi.fundRewardStream(reward_token, 10 ** 18, 7200, {"from": alice})
+
+    reward_token.transfer(mvault, 10 ** 18, {"from": alice})
+    chain.sleep(1800)
+
+    attacker = MockIntervalAttacker.deploy({"from": bob})
+    mvault.approve(attacker, 10 ** 19, {"from": bob})
+    tx = attacker.attack(multi, 10 ** 19, {"from": bob})
+
+    assert list(tx.return_value) == [0]
+    assert reward_token.balanceOf(attacker) == 0
+    assert mvault.balanceOf(bob) == 10 ** 19
+    # the vault rewards and the stream accrual went to alice alone
+    (_, [alice_amount]) = multi.claimableRewards(alice)
+    assert alice_amount >= 2 * 10 ** 18
+
+
+# Claims within the interval pay what was collected up to the last collection
+def test_claim_within_interval(multi, mvault, reward_token, issue, alice, chain):
+    multi.setCollectionInterval(3600, {"from": alice})
+    multi.stake(10 ** 18, alice, {"from": alice})
+    multi.updateReward({"from": alice})
+    (_, [collected_amount]) = multi.claimableRewards(alice)
+    assert collected_amount == 10 ** 18
+
+    reward_token.transfer(mvault, 10 ** 18, {"from": alice})
+    chain.sleep(60)
+    tx = multi.getAllRewards({"from": alice})
+    assert tx.events["RewardPaid"]["reward"] == collected_amount
+    assert reward_token.balanceOf(mvault) == 10 ** 18
+
+
+# updateReward collects within the interval
+def test_update_reward_forces_collection(multi, mvault, reward_token, issue, alice, bob, chain):
+    multi.setCollectionInterval(3600, {"from": alice})
+    multi.stake(10 ** 18, alice, {"from": alice})
+
+    reward_token.transfer(mvault, 10 ** 18, {"from": alice})
+    chain.sleep(60)
+    tx = multi.updateReward({"from": bob})
+    assert collected(tx, mvault)
+    assert tx.events["RewardsCollected"]["caller"] == bob
+    assert multi.lastCollectionTime() == tx.timestamp
+    assert reward_token.balanceOf(mvault) == 0
@@ -0,0 +1,36 @@
+#!/usr/bin/python3
+
+import pytest
+from scripts.deploy_stakers import deploy, plan
+
+
+@pytest.fixture
+def vaults(multifactory, MockVault, alice):
+    deployed = [MockVault.deploy(10 ** 18, {"from": alice}) for _ in range(5)]
+    for vault in deployed:
+        vault.setIchiVaultFactory(multifactory.ichiFactory(), {"from": alice})
+    return deployed
+
+
+# Vaults with a staker are planned as deployed, duplicates are dropped
+def test_plan(multifactory, vaults, alice):
+    multifactory.deployStaker(vaults[1], {"from": alice})
+
+    entries = plan(multifactory, vaults + [vaults[0]])
+
+    assert [e["vault"] for e in entries] == [v.address for v in vaults]
+    assert [e["deployed"] for e in entries] == [False, True, False, False, False]
+    assert entries[1]["staker"] == multifactory.vaultToStaker(vaults[1])
+
+
+def test_deploy_skips_existing(multifactory, vaults, alice):
+    multifactory.deployStaker(vaults[2], {"from": alice})
+    predicted = {e["vault"]: e["staker"] for e in plan(multifactory, vaults)}
+
+    deployed = deploy(multifactory, vaults, alice, batch_size=2)
+
+    assert deployed == {v.address: predicted[v.address] for v in vaults if v != vaults[2]}
+    for vault in vaults:
+        assert multifactory.vaultToStaker(vault) == predicted[vault.address]
+
+    assert deploy(multifactory, vaults, alice) == {}
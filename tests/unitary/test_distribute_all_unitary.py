@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+
+import brownie
+import pytest
+from brownie_tokens.template import ERC20
+from utils import withRevertReason
+
+
+def create_distributor(distributor_factory, RewardCampaignDistributor, multi, token, alice):
+    tx = distributor_factory.createRewardCampaignDistributor(multi, token, {"from": alice})
+    distributor = RewardCampaignDistributor.at(
+        tx.events["RewardCampaignDistributorCreated"]["distributor"]
+    )
+    distributor.grantCampaignManagerRole(alice, {"from": alice})
+    distributor.grantDistributorRole(alice, {"from": alice})
+    return distributor
+
+
+@pytest.fixture
+def distributors(
+    distributor_factory, distributor, RewardCampaignDistributor, multi, reward_token2, alice, chain
+):
+    second = create_distributor(
+        distributor_factory, RewardCampaignDistributor, multi, reward_token2, alice
+    )
+    reward_token2.approve(second, 10 ** 18, {"from": alice})
+    now = chain.time()
+    second.setCampaign(now, now + 30 * 86400, 10 ** 18, {"from": alice})
+
+    # no campaign, so distribution is not enabled
+    token = ERC20()
+    multi.addReward(token, {"from": alice})
+    idle = create_distributor(distributor_factory, RewardCampaignDistributor, multi, token, alice)
+
+    # the distributors require the MFD to have updated in an earlier block
+    multi.stake(10 ** 18, alice, {"from": alice})
+    multi.stake(10 ** 18, alice, {"from": alice})
+    chain.sleep(86400)
+    chain.mine()
+    return [distributor, second, idle]
+
+
+def test_factory_is_distributor(distributor_factory, distributors):
+    for distributor in distributors:
+        assert distributor.isDistributor(distributor_factory)
+
+
+def test_distribute_all(
+    distributor_factory, distributors, multi, reward_token, reward_token2, alice
+):
+    tx = distributor_factory.distributeAll(multi, {"from": alice})
+
+    assert tx.return_value == 2
+    assert tx.events["DistributeAll"]["distributed"] == 2
+    distributed = {e.address: e["amount"] for e in tx.events["RewardsDistributed"]}
+    assert set(distributed) == {distributors[0].address, distributors[1].address}
+    assert multi.rewardData(reward_token)["amount"] == distributed[distributors[0].address]
+    assert multi.rewardData(reward_token2)["amount"] == distributed[distributors[1].address]
+    assert distributors[2].lastDistribution() == 0
+
+
+# Callers without the distributor role on a distributor cannot distribute through the factory
+def test_distribute_all_requires_caller_role(distributor_factory, distributors, multi, bob):
+    tx = distributor_factory.distributeAll(multi, {"from": bob})
+    assert tx.return_value == 0
+    assert "RewardsDistributed" not in tx.events
+
+
+# A failing distribution, here of a retired reward, is skipped instead of reverting the batch
+def test_distribute_all_skips_failures(
+    distributor_factory, distributors, multi, reward_token2, alice, chain
+):
+    multi.retireReward(reward_token2, {"from": alice})
+    chain.sleep(60)
+    balance = reward_token2.balanceOf(distributors[1])
+
+    tx = distributor_factory.distributeAll(multi, {"from": alice})
+    assert tx.return_value == 1
+    assert tx.events["RewardsDistributed"]["sender"] == distributor_factory
+    assert reward_token2.balanceOf(distributors[1]) == balance
+
+    failed = tx.events["DistributionFailed"]
+    assert len(failed) == 1
+    assert failed["mfd"] == multi
+    assert failed["distributor"] == distributors[1]
+    assert bytes(failed["reason"]) == withRevertReason("IAR")
+
+
+# A distribution running out of gas reverts the batch rather than being reported as failed
+def test_distribute_all_out_of_gas(
+    RewardCampaignDistributorFactory, MockGasBurningDistributor, multi, reward_token, alice
+):
+    implementation = MockGasBurningDistributor.deploy({"from": alice})
+    factory = RewardCampaignDistributorFactory.deploy(
+        implementation, implementation, {"from": alice}
+    )
+    factory.createRewardCampaignDistributor(multi, reward_token, {"from": alice})
+
+    with brownie.reverts("OOG"):
+        factory.distributeAll(multi, {"from": alice, "gas_limit": 3_000_000})
+
+
+def test_distribute_all_unknown_mfd(distributor_factory, alice, bob):
+    tx = distributor_factory.distributeAll(bob, {"from": alice})
+    assert tx.return_value == 0
@@ -52,3 +52,89 @@ def test_unstake_reverts_on_invalid_amount(multi, alice, bob, base_token, reward
     with brownie.reverts(withCustomError("InvalidAmount()")):
         multi.unstake(1, {"from": bob})
 
+
+# exit unstakes the full balance and claims every reward in one transaction
+def test_native_exit(multi, alice, bob, mvault, reward_token, issue):
+    amount = mvault.balanceOf(bob)
+    bob_initial_reward_balance = reward_token.balanceOf(bob)
+    mvault.approve(multi, amount, {"from": bob})
+    multi.stake(amount, bob, {"from": bob})
+
+    rewardAmount = 10 ** 18
+    reward_token.transfer(mvault, rewardAmount, {"from": alice})
+
+    tx = multi.exit({"from": bob})
+    assert tx.events["Unstake"]["receivedAmount"] == amount
+    reward = tx.events["RewardPaid"]["reward"]
+    assert tx.return_value[0] == reward
+
+    # vault rewards are collected once for the whole exit
+    vault_transfers = [
+        e for e in tx.events["Transfer"] if e.address == reward_token and e["_from"] == mvault
+    ]
+    assert len(vault_transfers) == 1
+
+    assert mvault.balanceOf(bob) == amount
+    assert multi.userData(bob)["tokenAmount"] == 0
+    assert reward_token.balanceOf(bob) - bob_initial_reward_balance == reward
+    (rewardTokens, rewardAmounts) = multi.claimableRewards(bob)
+    assert rewardAmounts[0] == 0
+
+
+# exit without a stake should revert
+def test_native_exit_reverts_without_stake(multi, bob, reward_token):
+    with brownie.reverts(withCustomError("InvalidAmount()")):
+        multi.exit({"from": bob})
+
+
+# stakeAndClaim pays out the rewards earned before the new stake
+def test_stake_and_claim(multi, alice, bob, mvault, reward_token, issue):
+    amount = 10 ** 18
+    mvault.approve(multi, 2 * amount, {"from": bob})
+    multi.stake(amount, bob, {"from": bob})
+
+    reward_token.transfer(mvault, 10 ** 17, {"from": alice})
+    bob_initial_reward_balance = reward_token.balanceOf(bob)
+
+    tx = multi.stakeAndClaim(amount, {"from": bob})
+    reward = tx.events["RewardPaid"]["reward"]
+    assert reward > 0
+    assert tx.events["Stake"]["amount"] == amount
+    assert multi.userData(bob)["tokenAmount"] == 2 * amount
+    assert reward_token.balanceOf(bob) - bob_initial_reward_balance == reward
+    assert multi.claimable(reward_token, bob) == 0
+
+
+# unstakeAndClaim only pays out the requested reward tokens
+def test_unstake_and_claim(multi, alice, bob, mvault, reward_token, slow_token, issue):
+    amount = 10 ** 18
+    mvault.approve(multi, amount, {"from": bob})
+    multi.stake(amount, bob, {"from": bob})
+
+    reward_token.transfer(mvault, 10 ** 17, {"from": alice})
+    slow_token.transfer(multi, 10 ** 17, {"from": alice})
+
+    tx = multi.unstakeAndClaim(amount // 2, [reward_token], {"from": bob})
+    assert tx.events["Unstake"]["receivedAmount"] == amount // 2
+    assert len(tx.events["RewardPaid"]) == 1
+    assert tx.events["RewardPaid"]["rewardToken"] == reward_token
+    assert multi.userData(bob)["tokenAmount"] == amount // 2
+
+    # the slow token reward was settled but not paid
+    assert multi.claimable(reward_token, bob) == 0
+    assert multi.claimable(slow_token, bob) == 10 ** 17
+
+
+# The combined entry points that pay rewards respect the pause
+def test_combined_entry_points_paused(multi, alice, bob, mvault, reward_token):
+    amount = 10 ** 18
+    mvault.approve(multi, 2 * amount, {"from": bob})
+    multi.stake(amount, bob, {"from": bob})
+    multi.pause({"from": alice})
+
+    with brownie.reverts("Pausable: paused"):
+        multi.exit({"from": bob})
+    with brownie.reverts("Pausable: paused"):
+        multi.stakeAndClaim(amount, {"from": bob})
+    with brownie.reverts("Pausable: paused"):
+        multi.unstakeAndClaim(amount, [reward_token], {"from": bob})
@@ -15,29 +15,38 @@ def number_to_address(number: int) -> str:
 
     return address
 
+
+# A vault without a staker, the shared mvault already has one
+@pytest.fixture
+def unstaked_vault(MockVault, multifactory, alice):
+    _mv = MockVault.deploy(10 ** 18, {"from": alice})
+    _mv.setIchiVaultFactory(multifactory.ichiFactory())
+    return _mv
+
+
 # Cannot instantiate/create a staker for a vault that already has a staker created
-def test_cannot_deploy_staker_twice(multifactory, mvault, alice):
-    multifactory.deployStaker(mvault, {"from": alice})
+def test_cannot_deploy_staker_twice(multifactory, unstaked_vault, alice):
+    multifactory.deployStaker(unstaked_vault, {"from": alice})
     with brownie.reverts("ALREADY_DEPLOYED"):
-        multifactory.deployStaker(mvault, {"from": alice})
+        multifactory.deployStaker(unstaked_vault, {"from": alice})
 
 
 # Can contract be paused
-def test_vault_to_staker_set(multifactory, mvault, alice):
-    tx = multifactory.deployStaker(mvault, {"from": alice})
+def test_vault_to_staker_set(multifactory, unstaked_vault, alice):
+    tx = multifactory.deployStaker(unstaked_vault, {"from": alice})
     expectedStaker = tx.events["StakerCreated"].values()[1]
 
-    actualStaker = multifactory.vaultToStaker(mvault)
+    actualStaker = multifactory.vaultToStaker(unstaked_vault)
 
     assert multifactory.cachedDeployData() == '0x'
     assert expectedStaker == actualStaker
 
 
-def test_staker_create2_address(multifactory, mvault, alice):
-    tx = multifactory.deployStaker(mvault, {"from": alice})
+def test_staker_create2_address(multifactory, unstaked_vault, alice):
+    tx = multifactory.deployStaker(unstaked_vault, {"from": alice})
     actualStaker = tx.events["StakerCreated"].values()[1]
 
-    encodedData = address_to_bytes32(mvault.address)
+    encodedData = address_to_bytes32(unstaked_vault.address)
     salt = keccak(encodedData)
     init_code_hash = multifactory.bytecodeHash()
 
@@ -47,8 +56,44 @@ def test_staker_create2_address(multifactory, mvault, alice):
     assert expectedStaker == actualStaker
     assert expectedStaker == expectedStaker2
 
-def test_cannot_deploy_staker_if_invalid_vault_factory(multifactory, mvault, alice):
-    mvault.setIchiVaultFactory(number_to_address(1))
+def test_cannot_deploy_staker_if_invalid_vault_factory(multifactory, unstaked_vault, alice):
+    unstaked_vault.setIchiVaultFactory(number_to_address(1))
 
     with brownie.reverts("INVALID_VF"):
-        multifactory.deployStaker(mvault, {"from": alice})
\ No newline at end of file
+        multifactory.deployStaker(unstaked_vault, {"from": alice})
+
+
+def test_predict_staker_address(multifactory, unstaked_vault, alice):
+    predicted = multifactory.predictStakerAddress(unstaked_vault)
+    salt = keccak(address_to_bytes32(unstaked_vault.address))
+    assert predicted == computeCreate2Address(multifactory, salt, multifactory.bytecodeHash())
+
+    tx = multifactory.deployStaker(unstaked_vault, {"from": alice})
+    assert tx.events["StakerCreated"].values()[1] == predicted
+
+
+def test_deploy_stakers(multifactory, MockVault, MultiFeeDistribution, alice):
+    vaults = [MockVault.deploy(10 ** 18, {"from": alice}) for _ in range(3)]
+    for vault in vaults:
+        vault.setIchiVaultFactory(multifactory.ichiFactory())
+    predicted = [multifactory.predictStakerAddress(vault) for vault in vaults]
+
+    tx = multifactory.deployStakers(vaults, {"from": alice})
+
+    assert tx.return_value == predicted
+    assert [e["ichiVault"] for e in tx.events["StakerCreated"]] == predicted
+    for vault, staker in zip(vaults, predicted):
+        assert multifactory.vaultToStaker(vault) == staker
+        assert MultiFeeDistribution.at(staker).owner() == alice
+    assert multifactory.cachedDeployData() == '0x'
+
+
+# A single invalid vault reverts the whole batch
+def test_deploy_stakers_reverts_batch(multifactory, MockVault, unstaked_vault, alice):
+    vault = MockVault.deploy(10 ** 18, {"from": alice})
+    vault.setIchiVaultFactory(multifactory.ichiFactory())
+    multifactory.deployStaker(unstaked_vault, {"from": alice})
+
+    with brownie.reverts("ALREADY_DEPLOYED"):
+        multifactory.deployStakers([vault, unstaked_vault], {"from": alice})
+    assert multifactory.vaultToStaker(vault) == brownie.ZERO_ADDRESS
@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+
+import brownie
+
+
+def stake(multi, mvault, account, amount):
+    mvault.approve(multi, amount, {"from": account})
+    multi.stake(amount, account, {"from": account})
+
+
+# Anyone can push rewards to a list of stakers and gets the per-user amounts back
+def test_get_reward_for_many(
+    multi, mvault, reward_token, slow_token, alice, bob, charlie, manager1, issue
+):
+    stake(multi, mvault, bob, 10 ** 18)
+    stake(multi, mvault, charlie, 3 * 10 ** 18)
+
+    reward_token.transfer(mvault, 4 * 10 ** 17, {"from": alice})
+    slow_token.transfer(multi, 4 * 10 ** 17, {"from": alice})
+    multi.updateReward({"from": alice})
+
+    expected = [multi.claimableRewards(user)[1] for user in (bob, charlie)]
+    assert all(amount > 0 for amounts in expected for amount in amounts)
+
+    init_balances = [reward_token.balanceOf(user) for user in (bob, charlie)]
+    tokens = [reward_token, slow_token]
+    tx = multi.getRewardForMany([bob, charlie], tokens, {"from": manager1})
+
+    assert [list(amounts) for amounts in tx.return_value] == [list(e) for e in expected]
+    assert reward_token.balanceOf(bob) - init_balances[0] == expected[0][0]
+    assert reward_token.balanceOf(charlie) - init_balances[1] == expected[1][0]
+    assert len(tx.events["RewardPaid"]) == 4
+
+    for user in (bob, charlie):
+        (rewardTokens, rewardAmounts) = multi.claimableRewards(user)
+        assert list(rewardAmounts) == [0, 0]
+
+
+# The vault is collected once for the whole batch
+def test_get_reward_for_many_collects_once(multi, mvault, reward_token, alice, bob, charlie, issue):
+    stake(multi, mvault, bob, 10 ** 18)
+    stake(multi, mvault, charlie, 10 ** 18)
+    reward_token.transfer(mvault, 10 ** 17, {"from": alice})
+
+    tx = multi.getRewardForMany([bob, charlie, alice], [reward_token], {"from": alice})
+    vault_transfers = [
+        e for e in tx.events["Transfer"] if e.address == reward_token and e["_from"] == mvault
+    ]
+    assert len(vault_transfers) == 1
+
+
+# Users with nothing to claim are skipped without reverting
+def test_get_reward_for_many_empty(multi, reward_token, alice, bob, charlie):
+    tx = multi.getRewardForMany([bob, charlie], [reward_token], {"from": alice})
+    assert "RewardPaid" not in tx.events
+    assert [list(amounts) for amounts in tx.return_value] == [[0], [0]]
+
+
+# Batched claims respect the pause
+def test_get_reward_for_many_paused(multi, reward_token, alice, bob):
+    multi.pause({"from": alice})
+    with brownie.reverts("Pausable: paused"):
+        multi.getRewardForMany([bob], [reward_token], {"from": alice})
@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+
+import random
+import time
+
+from scripts.merkle_rewards import MerkleTree, allocate, build_campaign, leaf, stake_weights, verify
+
+ALICE = "0x" + "11" * 20
+BOB = "0x" + "22" * 20
+
+
+def event(block, name, user, amount):
+    key = "amount" if name == "Stake" else "receivedAmount"
+    return {"block": block, "log_index": 0, "name": name, "args": {"user": user, key: amount}}
+
+
+# Stake time is clamped to the window, and stakes from before it count from its start
+def test_stake_weights():
+    block_times = {1: 50, 2: 150, 3: 180, 4: 250}
+    events = [
+        event(1, "Stake", ALICE, 10),
+        event(2, "Stake", BOB, 30),
+        event(3, "Unstake", ALICE, 10),
+        event(4, "Stake", ALICE, 100),
+    ]
+    weights = stake_weights(events, 100, 200, block_times.get)
+    assert weights == {ALICE: 10 * 80, BOB: 30 * 50}
+
+    assert allocate(weights, 1000) == {ALICE: 347, BOB: 652}
+    assert allocate(weights, 2) == {BOB: 1}
+    assert allocate({}, 1000) == {}
+
+
+def test_tree_shapes():
+    for size in (1, 2, 3, 5, 8, 13):
+        leaves = [leaf(i, ALICE, i + 1) for i in range(size)]
+        tree = MerkleTree(leaves)
+        for i, node in enumerate(leaves):
+            assert verify(tree.proof(i), tree.root, node)
+            assert not verify(tree.proof(i), tree.root, leaf(i, BOB, i + 1))
+
+
+# The builder has to keep up with campaigns over every staker of a large vault
+def test_build_100k_leaves():
+    rng = random.Random(0)
+    amounts = {
+        "0x" + rng.getrandbits(160).to_bytes(20, "big").hex(): rng.randint(1, 10 ** 24)
+        for _ in range(100_000)
+    }
+
+    started = time.perf_counter()
+    campaign = build_campaign(amounts)
+    elapsed = time.perf_counter() - started
+    assert elapsed < 30
+
+    assert len(campaign["claims"]) == len(amounts)
+    assert campaign["total"] == sum(amounts.values())
+    root = bytes.fromhex(campaign["merkleRoot"][2:])
+    for account in rng.sample(sorted(amounts), 100):
+        claim = campaign["claims"][account]
+        assert len(claim["proof"]) <= 17
+        proof = [bytes.fromhex(node[2:]) for node in claim["proof"]]
+        assert verify(proof, root, leaf(claim["index"], account, claim["amount"]))
@@ -0,0 +1,121 @@
+#!/usr/bin/python3
+
+import pytest
+from scripts.mfd_client import MFDClient
+
+
+@pytest.fixture
+def multicall(MockMulticall3, alice):
+    return MockMulticall3.deploy({"from": alice})
+
+
+@pytest.fixture
+def users(multi, mvault, reward_token, slow_token, alice, bob, charlie, manager1, issue):
+    users = [bob, charlie, manager1]
+    for idx, user in enumerate(users):
+        amount = (idx + 1) * 10 ** 17
+        mvault.approve(multi, amount, {"from": user})
+        multi.stake(amount, user, {"from": user})
+    slow_token.transfer(multi, 10 ** 17, {"from": alice})
+    multi.updateReward({"from": alice})
+    mvault.approve(multi, 10 ** 17, {"from": bob})
+    multi.stake(10 ** 17, bob, {"from": bob})
+    return users
+
+
+# Every field of the snapshot matches its getter, in two eth_calls
+def test_snapshot(multi, multicall, reward_token, slow_token, users):
+    client = MFDClient(multi, multicall)
+    snapshot = client.snapshot(users)
+
+    assert client.rpc_calls == 2
+    assert snapshot.total_stakes == multi.totalStakes()
+    assert snapshot.reward_tokens == [reward_token.address, slow_token.address]
+    for token in (reward_token, slow_token):
+        reward = snapshot.rewards[token.address]
+        assert tuple(multi.rewardData(token)) == (
+            reward.amount,
+            reward.last_time_updated,
+            reward.retired_index,
+            reward.reward_per_token,
+        )
+
+    for user in users:
+        state = snapshot.users[user.address]
+        (token_amount, last_time_updated, retired_rewards_settled) = multi.userData(user)
+        assert state.token_amount == token_amount
+        assert state.last_time_updated == last_time_updated
+        assert state.retired_rewards_settled == retired_rewards_settled
+        for token in (reward_token, slow_token):
+            assert state.claimable[token.address] == multi.claimable(token, user)
+            expected = multi.getUserRewardPerToken(user, token)
+            assert state.reward_per_token[token.address] == expected
+    assert snapshot.users[users[0].address].claimable[slow_token.address] > 0
+
+    assert snapshot.last_collection_block == multi.lastCollectionBlock()
+    assert snapshot.last_collection_time == multi.lastCollectionTime()
+    assert snapshot.collection_interval == multi.collectionInterval()
+    assert snapshot.active_reward_streams == multi.activeRewardStreams() == 0
+    assert snapshot.retired_reward_tokens == []
+    for token in (reward_token, slow_token):
+        assert snapshot.streams[token.address].reserve == 0
+
+
+# Retired rewards, streams and the collection settings are part of the same snapshot
+def test_snapshot_retired_rewards_and_streams(
+    multi, multicall, reward_token, slow_token, users, alice, chain
+):
+    multi.setCollectionInterval(3600, {"from": alice})
+    multi.retireReward(reward_token, {"from": alice})
+    slow_token.approve(multi, 10 ** 18, {"from": alice})
+    multi.fundRewardStream(slow_token, 10 ** 18, 7 * 86400, {"from": alice})
+    chain.sleep(600)
+    chain.mine()
+
+    client = MFDClient(multi, multicall)
+    snapshot = client.snapshot(users)
+
+    assert client.rpc_calls == 2
+    assert snapshot.collection_interval == 3600
+    assert snapshot.active_reward_streams == 1
+    assert snapshot.reward_tokens == [slow_token.address]
+    assert snapshot.retired_reward_tokens == [reward_token.address]
+    assert snapshot.rewards[reward_token.address].retired_index == 1
+
+    stream = snapshot.streams[slow_token.address]
+    assert (
+        stream.reward_rate,
+        stream.period_finish,
+        stream.last_update_time,
+        stream.reserve,
+    ) == tuple(multi.rewardStreams(slow_token))
+    assert stream.reserve == 10 ** 18
+
+    for user in users:
+        (_, amounts) = multi.claimableRetiredRewards(user)
+        assert snapshot.users[user.address].claimable_retired == {reward_token.address: amounts[0]}
+    assert snapshot.users[users[0].address].claimable_retired[reward_token.address] > 0
+
+
+def test_snapshot_chunks_calls(multi, multicall, users):
+    expected = MFDClient(multi, multicall).snapshot(users)
+
+    client = MFDClient(multi, multicall, max_calls=3)
+    assert client.snapshot(users, block_identifier=expected.block) == expected
+    assert client.rpc_calls > 2
+
+
+# All reads come from the pinned block, whatever happened since
+def test_snapshot_is_pinned(multi, multicall, mvault, users, bob, chain):
+    client = MFDClient(multi, multicall)
+    block = chain.height
+    before = client.snapshot(users, block_identifier=block)
+
+    mvault.approve(multi, 10 ** 17, {"from": bob})
+    multi.stake(10 ** 17, bob, {"from": bob})
+
+    assert client.snapshot(users, block_identifier=block) == before
+    after = client.snapshot(users)
+    assert after.total_stakes == before.total_stakes + 10 ** 17
+    (bob_before, bob_after) = (before.users[bob.address], after.users[bob.address])
+    assert bob_after.token_amount == bob_before.token_amount + 10 ** 17
@@ -0,0 +1,181 @@
+#!/usr/bin/python3
+
+import brownie
+import pytest
+
+DAY = 86400
+
+
+def create_multi_token_distributor(
+    distributor_factory, MultiTokenCampaignDistributor, multi, alice
+):
+    tx = distributor_factory.createMultiTokenCampaignDistributor(multi, {"from": alice})
+    distributor = MultiTokenCampaignDistributor.at(
+        tx.events["MultiTokenCampaignDistributorCreated"]["distributor"]
+    )
+    distributor.grantCampaignManagerRole(alice, {"from": alice})
+    distributor.grantDistributorRole(alice, {"from": alice})
+    return distributor
+
+
+def set_campaign(distributor, token, start, end, amount, alice):
+    token.approve(distributor, amount, {"from": alice})
+    return distributor.setCampaign(token, start, end, amount, {"from": alice})
+
+
+@pytest.fixture
+def multi_distributor(
+    distributor_factory, MultiTokenCampaignDistributor, multi, reward_token, reward_token2, alice
+):
+    distributor = create_multi_token_distributor(
+        distributor_factory, MultiTokenCampaignDistributor, multi, alice
+    )
+    # the distributor requires the MFD to have updated in an earlier block
+    multi.stake(10 ** 18, alice, {"from": alice})
+    multi.stake(10 ** 18, alice, {"from": alice})
+    return distributor
+
+
+def test_factory_creates_clone(distributor_factory, multi_distributor, multi, alice):
+    assert distributor_factory.getMultiTokenDistributor(multi) == multi_distributor
+    assert distributor_factory.allMultiTokenDistributorsLength() == 1
+    assert distributor_factory.allMultiTokenDistributors(0) == multi_distributor
+    assert multi_distributor.mfd() == multi
+    assert multi_distributor.isDistributor(distributor_factory)
+
+    with brownie.reverts("DAE"):
+        distributor_factory.createMultiTokenCampaignDistributor(multi, {"from": alice})
+
+
+def test_only_owner_creates(distributor_factory, multi, bob):
+    with brownie.reverts("Ownable: caller is not the owner"):
+        distributor_factory.createMultiTokenCampaignDistributor(multi, {"from": bob})
+
+
+def test_set_campaigns(multi_distributor, reward_token, reward_token2, alice, bob, chain):
+    now = chain.time()
+    set_campaign(multi_distributor, reward_token, now, now + 30 * DAY, 10 ** 18, alice)
+    tx = set_campaign(multi_distributor, reward_token2, now, now + 10 * DAY, 10 ** 17, alice)
+    assert tx.events["CampaignSet"]["rewardToken"] == reward_token2
+    assert tx.events["CampaignSet"]["actualAmount"] == 10 ** 17
+
+    # resetting a campaign does not list the token twice
+    set_campaign(multi_distributor, reward_token, now, now + 20 * DAY, 0, alice)
+    assert multi_distributor.rewardTokensLength() == 2
+    assert multi_distributor.getCampaign(reward_token)[:4] == (
+        now,
+        now + 20 * DAY,
+        10 ** 18,
+        10 ** 18,
+    )
+
+    with brownie.reverts("RNM"):
+        multi_distributor.setCampaign(reward_token, now, now + DAY, 0, {"from": bob})
+    with brownie.reverts("ICM"):
+        multi_distributor.setCampaign(reward_token, now, now, 0, {"from": alice})
+
+
+# Every due token is distributed in one call, each on its own schedule
+def test_distributes_all_tokens(
+    multi_distributor, multi, reward_token, reward_token2, alice, chain
+):
+    now = chain.time()
+    set_campaign(multi_distributor, reward_token, now, now + 30 * DAY, 10 ** 18, alice)
+    set_campaign(multi_distributor, reward_token2, now, now + 10 * DAY, 10 ** 17, alice)
+
+    chain.sleep(DAY)
+    chain.mine()
+    tx = multi_distributor.distributeRewards({"from": alice})
+
+    shares = {e["rewardToken"]: e["amount"] for e in tx.events["RewardsDistributed"]}
+    assert set(shares) == {reward_token.address, reward_token2.address}
+    assert 10 ** 18 // 30 <= shares[reward_token.address] <= 10 ** 18 // 29
+    assert 10 ** 17 // 10 <= shares[reward_token2.address] <= 10 ** 17 // 9
+    assert multi.rewardData(reward_token)["amount"] == shares[reward_token.address]
+    assert multi.rewardData(reward_token2)["amount"] == shares[reward_token2.address]
+    assert multi_distributor.lastDistribution(reward_token) == tx.timestamp
+    assert multi_distributor.lastDistribution(reward_token2) == tx.timestamp
+
+
+def test_skips_tokens_not_due(multi_distributor, multi, reward_token, reward_token2, alice, chain):
+    now = chain.time()
+    set_campaign(multi_distributor, reward_token, now, now + 30 * DAY, 10 ** 18, alice)
+    set_campaign(multi_distributor, reward_token2, now + 5 * DAY, now + 10 * DAY, 10 ** 17, alice)
+
+    chain.sleep(DAY)
+    chain.mine()
+    assert not multi_distributor.tokenDistributionEnabled(reward_token2)
+    tx = multi_distributor.distributeRewards({"from": alice})
+    assert [e["rewardToken"] for e in tx.events["RewardsDistributed"]] == [reward_token]
+    assert multi_distributor.lastDistribution(reward_token2) == now + 5 * DAY
+
+
+# A token the MFD no longer distributes stays with the distributor
+def test_skips_retired_tokens(multi_distributor, multi, reward_token, reward_token2, alice, chain):
+    now = chain.time()
+    set_campaign(multi_distributor, reward_token, now, now + 30 * DAY, 10 ** 18, alice)
+    set_campaign(multi_distributor, reward_token2, now, now + 10 * DAY, 10 ** 17, alice)
+    multi.retireReward(reward_token2, {"from": alice})
+
+    chain.sleep(DAY)
+    chain.mine()
+    tx = multi_distributor.distributeRewards({"from": alice})
+    assert [e["rewardToken"] for e in tx.events["RewardsDistributed"]] == [reward_token]
+    assert reward_token2.balanceOf(multi_distributor) == 10 ** 17
+
+
+def test_reverts_when_nothing_due(multi_distributor, reward_token, alice, bob, chain):
+    with brownie.reverts("NAC"):
+        multi_distributor.distributeRewards({"from": alice})
+    assert not multi_distributor.distributionEnabled()
+
+    now = chain.time()
+    set_campaign(multi_distributor, reward_token, now + DAY, now + 30 * DAY, 10 ** 18, alice)
+    with brownie.reverts("NAC"):
+        multi_distributor.distributeRewards({"from": alice})
+    with brownie.reverts("RND"):
+        multi_distributor.distributeRewards({"from": bob})
+
+
+# distributeAll counts the multi-token distributor once, whatever its number of tokens
+def test_distribute_all(
+    distributor_factory, multi_distributor, multi, reward_token, reward_token2, alice, chain
+):
+    now = chain.time()
+    set_campaign(multi_distributor, reward_token, now, now + 30 * DAY, 10 ** 18, alice)
+    set_campaign(multi_distributor, reward_token2, now, now + 10 * DAY, 10 ** 17, alice)
+
+    chain.sleep(DAY)
+    chain.mine()
+    tx = distributor_factory.distributeAll(multi, {"from": alice})
+    assert tx.return_value == 1
+    assert len(tx.events["RewardsDistributed"]) == 2
+
+
+def test_withdraw_tokens(multi_distributor, reward_token, alice, bob, chain):
+    now = chain.time()
+    set_campaign(multi_distributor, reward_token, now, now + 30 * DAY, 10 ** 18, alice)
+
+    with brownie.reverts("RNM"):
+        multi_distributor.withdrawTokens(reward_token, bob, {"from": bob})
+    multi_distributor.withdrawTokens(reward_token, bob, {"from": alice})
+    assert reward_token.balanceOf(multi_distributor) == 0
+
+
+# MFDs deployed before the hook and reward retirement still take distributions
+def test_distributes_to_legacy_mfd(
+    distributor_factory, MultiTokenCampaignDistributor, MockLegacyMFD, reward_token, alice, chain
+):
+    legacy = MockLegacyMFD.deploy({"from": alice})
+    distributor = create_multi_token_distributor(
+        distributor_factory, MultiTokenCampaignDistributor, legacy, alice
+    )
+    now = chain.time()
+    set_campaign(distributor, reward_token, now, now + 30 * DAY, 10 ** 18, alice)
+    legacy.setLastTimeUpdated(reward_token, now, {"from": alice})
+
+    chain.sleep(DAY)
+    tx = distributor.distributeRewards({"from": alice})
+    share = tx.events["RewardsDistributed"]["amount"]
+    assert share > 0
+    assert reward_token.balanceOf(legacy) == share
@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+
+import brownie
+from brownie_tokens.template import ERC20
+from utils import withCustomError
+
+
+# Only the notified token is credited, other rewards wait for the next update
+def test_notify_credits_single_token(multi, mvault, reward_token, reward_token2, alice, bob):
+    multi.stake(10 ** 18, alice, {"from": alice})
+
+    reward_token.transfer(multi, 10 ** 17, {"from": alice})
+    reward_token2.transfer(multi, 10 ** 17, {"from": alice})
+    tx = multi.notifyReward(reward_token, {"from": bob})
+
+    assert tx.events["RewardUpdated"]["rewardToken"] == reward_token
+    assert multi.rewardData(reward_token)["amount"] == 10 ** 17
+    assert multi.rewardData(reward_token2)["amount"] == 0
+    assert "Transfer" not in tx.events
+
+    (_, amounts) = multi.claimableRewards(alice)
+    assert list(amounts) == [10 ** 17, 0]
+
+
+def test_notify_inactive_reward(multi, alice):
+    token = ERC20()
+    with brownie.reverts(withCustomError("InactiveReward()")):
+        multi.notifyReward(token, {"from": alice})
+
+
+# Rewards pushed while nothing is staked stay pending for the first stakers
+def test_notify_without_stakes(multi, reward_token, alice):
+    reward_token.transfer(multi, 10 ** 17, {"from": alice})
+    tx = multi.notifyReward(reward_token, {"from": alice})
+    assert "RewardUpdated" not in tx.events
+    assert multi.rewardData(reward_token)["amount"] == 0
+
+
+# A distribution is credited to the stakers in the same transaction
+def test_distributor_notifies(multi, mvault, reward_token, distributor, alice, chain):
+    multi.stake(10 ** 18, alice, {"from": alice})
+    multi.stake(10 ** 18, alice, {"from": alice})
+
+    chain.sleep(86400)
+    chain.mine()
+    tx = distributor.distributeRewards({"from": alice})
+    share = tx.events["RewardsDistributed"]["amount"]
+
+    assert share > 0
+    assert tx.events["RewardUpdated"]["amount"] == share
+    assert multi.rewardData(reward_token)["amount"] == share
+    (_, [amount]) = multi.claimableRewards(alice)
+    assert share - 1 <= amount <= share
+
+
+# A retired reward is not sent to the MFD, the distributor keeps its balance
+def test_distributor_retired_reward(multi, reward_token, distributor, alice, chain):
+    multi.stake(10 ** 18, alice, {"from": alice})
+    multi.retireReward(reward_token, {"from": alice})
+    chain.sleep(86400)
+    chain.mine()
+
+    balance = reward_token.balanceOf(distributor)
+    mfd_balance = reward_token.balanceOf(multi)
+    with brownie.reverts("IAR"):
+        distributor.distributeRewards({"from": alice})
+    assert reward_token.balanceOf(distributor) == balance
+    assert reward_token.balanceOf(multi) == mfd_balance
+
+
+# MFDs deployed before the hook, with the unpacked reward data, still take distributions
+def test_distributor_on_legacy_mfd(
+    distributor_factory, RewardCampaignDistributor, MockLegacyMFD, reward_token, alice, chain
+):
+    legacy = MockLegacyMFD.deploy({"from": alice})
+    tx = distributor_factory.createRewardCampaignDistributor(legacy, reward_token, {"from": alice})
+    distributor = RewardCampaignDistributor.at(
+        tx.events["RewardCampaignDistributorCreated"]["distributor"]
+    )
+    distributor.grantCampaignManagerRole(alice, {"from": alice})
+    distributor.grantDistributorRole(alice, {"from": alice})
+    reward_token.approve(distributor, 10 ** 18, {"from": alice})
+    now = chain.time()
+    distributor.setCampaign(now, now + 30 * 86400, 10 ** 18, {"from": alice})
+
+    # the legacy MFD has not updated the reward yet
+    chain.sleep(86400)
+    with brownie.reverts("ILT"):
+        distributor.distributeRewards({"from": alice})
+
+    legacy.setLastTimeUpdated(reward_token, chain.time(), {"from": alice})
+    chain.sleep(60)
+    tx = distributor.distributeRewards({"from": alice})
+    share = tx.events["RewardsDistributed"]["amount"]
+    assert share > 0
+    assert reward_token.balanceOf(legacy) == share
@@ -0,0 +1,151 @@
+#!/usr/bin/python3
+
+import brownie
+from brownie_tokens.template import ERC20
+from utils import withCustomError
+
+
+def stake_and_accrue(multi, mvault, reward_token, alice, bob):
+    amount = 10 ** 18
+    mvault.approve(multi, amount, {"from": bob})
+    multi.stake(amount, bob, {"from": bob})
+    reward_token.transfer(mvault, 10 ** 17, {"from": alice})
+    multi.updateReward({"from": bob})
+    (rewardTokens, rewardAmounts) = multi.claimableRewards(bob)
+    return rewardAmounts[list(rewardTokens).index(reward_token)]
+
+
+# Only managers can retire a reward
+def test_only_manager_can_retire(multi, reward_token, bob):
+    with brownie.reverts(withCustomError("InsufficientPermission()")):
+        multi.retireReward(reward_token, {"from": bob})
+
+
+# A token that is not an active reward cannot be retired
+def test_cannot_retire_inactive_reward(multi, reward_token, alice):
+    token = ERC20()
+    with brownie.reverts(withCustomError("InactiveReward()")):
+        multi.retireReward(token, {"from": alice})
+
+    multi.retireReward(reward_token, {"from": alice})
+    with brownie.reverts(withCustomError("InactiveReward()")):
+        multi.retireReward(reward_token, {"from": alice})
+
+
+# Retiring swaps the last reward token into the freed slot
+def test_retire_compacts_reward_tokens(multi, reward_token, slow_token, alice):
+    assert multi.rewardTokens(0) == reward_token
+    assert multi.rewardTokens(1) == slow_token
+
+    tx = multi.retireReward(reward_token, {"from": alice})
+    assert tx.events["RewardRetired"]["rewardToken"] == reward_token
+
+    assert multi.rewardTokens(0) == slow_token
+    assert multi.rewardTokenIndex(slow_token) == 1
+    assert multi.rewardTokenIndex(reward_token) == 0
+    assert multi.retiredRewardTokens(0) == reward_token
+    assert multi.retiredRewardTokensLength() == 1
+    assert multi.rewardData(reward_token)["retiredIndex"] == 1
+
+    (rewardTokens, rewardAmounts) = multi.claimableRewards(alice)
+    assert list(rewardTokens) == [slow_token]
+
+
+# A retired reward cannot be added back
+def test_cannot_readd_retired_reward(multi, reward_token, alice):
+    multi.retireReward(reward_token, {"from": alice})
+    with brownie.reverts(withCustomError("ActiveReward()")):
+        multi.addReward(reward_token, {"from": alice})
+
+
+# Stake, unstake and updateReward no longer touch a retired reward
+def test_retired_reward_skipped(multi, mvault, reward_token, alice, bob, issue, chain):
+    stake_and_accrue(multi, mvault, reward_token, alice, bob)
+    multi.retireReward(reward_token, {"from": alice})
+    retired = multi.rewardData(reward_token)
+
+    chain.mine(timedelta=60)
+    reward_token.transfer(mvault, 10 ** 17, {"from": alice})
+    multi.unstake(10 ** 17, {"from": bob})
+    multi.updateReward({"from": bob})
+
+    assert multi.rewardData(reward_token) == retired
+
+
+# A staker keeps the residual of a retired reward across balance changes
+def test_claim_residual_after_retirement(multi, mvault, reward_token, alice, bob, issue):
+    residual = stake_and_accrue(multi, mvault, reward_token, alice, bob)
+    assert residual > 0
+    multi.retireReward(reward_token, {"from": alice})
+
+    (retiredTokens, retiredAmounts) = multi.claimableRetiredRewards(bob)
+    assert list(retiredTokens) == [reward_token]
+    assert retiredAmounts[0] == residual
+
+    # changing the balance settles the retired reward once
+    multi.unstake(10 ** 17, {"from": bob})
+    assert multi.userData(bob)["retiredRewardsSettled"] == 1
+    assert multi.claimable(reward_token, bob) == residual
+    (retiredTokens, retiredAmounts) = multi.claimableRetiredRewards(bob)
+    assert retiredAmounts[0] == residual
+
+    init_balance = reward_token.balanceOf(bob)
+    tx = multi.getReward(bob, [reward_token], {"from": bob})
+    assert tx.events["RewardPaid"]["reward"] == residual
+    assert reward_token.balanceOf(bob) - init_balance == residual
+
+    (retiredTokens, retiredAmounts) = multi.claimableRetiredRewards(bob)
+    assert retiredAmounts[0] == 0
+
+
+# The residual can be claimed without any balance change in between
+def test_claim_residual_without_settlement(multi, mvault, reward_token, alice, bob, issue):
+    residual = stake_and_accrue(multi, mvault, reward_token, alice, bob)
+    multi.retireReward(reward_token, {"from": alice})
+
+    tx = multi.getReward(bob, [reward_token], {"from": bob})
+    assert tx.events["RewardPaid"]["reward"] == residual
+
+    # a later balance change does not pay it out again
+    multi.unstake(10 ** 17, {"from": bob})
+    tx = multi.getReward(bob, [reward_token], {"from": bob})
+    assert "RewardPaid" not in tx.events
+
+
+# Stakers joining after retirement earn nothing from the retired reward
+def test_new_staker_cannot_claim_retired(multi, mvault, reward_token, alice, bob, charlie, issue):
+    stake_and_accrue(multi, mvault, reward_token, alice, bob)
+    multi.retireReward(reward_token, {"from": alice})
+
+    amount = 10 ** 18
+    mvault.approve(multi, amount, {"from": charlie})
+    multi.stake(amount, charlie, {"from": charlie})
+
+    (retiredTokens, retiredAmounts) = multi.claimableRetiredRewards(charlie)
+    assert retiredAmounts[0] == 0
+
+    tx = multi.getReward(charlie, [reward_token], {"from": charlie})
+    assert "RewardPaid" not in tx.events
+
+
+# Tokens arriving after retirement can be recovered by the owner, what stakers are owed cannot
+def test_recover_late_arrivals_of_retired_reward(multi, mvault, reward_token, alice, bob, issue):
+    residual = stake_and_accrue(multi, mvault, reward_token, alice, bob)
+    multi.retireReward(reward_token, {"from": alice})
+    owed = multi.rewardData(reward_token)["amount"]
+
+    # collected from the vault by a later stake, and sent directly
+    reward_token.transfer(mvault, 10 ** 17, {"from": alice})
+    multi.unstake(10 ** 17, {"from": bob})
+    reward_token.transfer(multi, 10 ** 17, {"from": alice})
+    late = reward_token.balanceOf(multi) - owed
+    assert late == 2 * 10 ** 17
+
+    with brownie.reverts(withCustomError("ActiveReward()")):
+        multi.recoverERC20(reward_token, late + 1, {"from": alice})
+    init_balance = reward_token.balanceOf(alice)
+    multi.recoverERC20(reward_token, late, {"from": alice})
+    assert reward_token.balanceOf(alice) - init_balance == late
+
+    tx = multi.getReward(bob, [reward_token], {"from": bob})
+    assert tx.events["RewardPaid"]["reward"] == residual
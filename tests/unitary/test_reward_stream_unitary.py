@@ -0,0 +1,149 @@
+#!/usr/bin/python3
+
+import brownie
+import pytest
+from brownie_tokens.template import ERC20
+from utils import withCustomError
+
+WEEK = 7 * 86400
+AMOUNT = 4 * 10 ** 18
+
+
+@pytest.fixture
+def stream(multi, reward_token, alice):
+    multi.stake(10 ** 18, alice, {"from": alice})
+    reward_token.approve(multi, AMOUNT, {"from": alice})
+    return multi.fundRewardStream(reward_token, AMOUNT, WEEK, {"from": alice})
+
+
+def claimable(multi, account):
+    (_, [amount]) = multi.claimableRewards(account)
+    return amount
+
+
+def test_fund_stream(multi, reward_token, stream):
+    assert stream.events["RewardStreamUpdated"]["reserve"] == AMOUNT
+    (rate, period_finish, last_update, reserve) = multi.rewardStreams(reward_token)
+    assert rate == AMOUNT // WEEK
+    assert period_finish == stream.timestamp + WEEK
+    assert last_update == stream.timestamp
+    assert reserve == AMOUNT
+    assert multi.activeRewardStreams() == 1
+    assert multi.rewardData(reward_token)["amount"] == AMOUNT
+
+
+def test_fund_stream_permissions(multi, reward_token, bob):
+    reward_token.approve(multi, AMOUNT, {"from": bob})
+    with brownie.reverts(withCustomError("InsufficientPermission()")):
+        multi.fundRewardStream(reward_token, AMOUNT, WEEK, {"from": bob})
+
+
+def test_fund_stream_invalid(multi, reward_token, alice):
+    reward_token.approve(multi, AMOUNT, {"from": alice})
+    with brownie.reverts(withCustomError("InvalidAmount()")):
+        multi.fundRewardStream(reward_token, 0, WEEK, {"from": alice})
+    with brownie.reverts(withCustomError("InvalidAmount()")):
+        multi.fundRewardStream(reward_token, AMOUNT, 0, {"from": alice})
+    with brownie.reverts(withCustomError("InactiveReward()")):
+        multi.fundRewardStream(ERC20(), AMOUNT, WEEK, {"from": alice})
+
+
+# Accrual is linear in time and visible before any transaction credits it
+def test_stream_accrues_linearly(multi, reward_token, stream, alice, chain):
+    chain.sleep(WEEK // 2)
+    chain.mine()
+    assert claimable(multi, alice) == pytest.approx(AMOUNT // 2, rel=0.01)
+
+    multi.updateReward({"from": alice})
+    assert claimable(multi, alice) == pytest.approx(AMOUNT // 2, rel=0.01)
+    assert multi.rewardStreams(reward_token)["reserve"] == pytest.approx(AMOUNT // 2, rel=0.01)
+
+
+# Once the period is over the whole reserve is paid, rounding included
+def test_stream_pays_out_fully(multi, reward_token, stream, alice, chain):
+    chain.sleep(WEEK + 3600)
+    chain.mine()
+    assert claimable(multi, alice) == AMOUNT
+
+    balance = reward_token.balanceOf(alice)
+    multi.getAllRewards({"from": alice})
+    assert reward_token.balanceOf(alice) - balance == AMOUNT
+    assert multi.rewardStreams(reward_token)["reserve"] == 0
+    assert multi.activeRewardStreams() == 0
+
+
+def test_stream_split_between_stakers(multi, mvault, reward_token, stream, alice, bob, chain):
+    mvault.approve(multi, 3 * 10 ** 18, {"from": bob})
+    multi.stake(3 * 10 ** 18, bob, {"from": bob})
+    start = claimable(multi, alice)
+
+    chain.sleep(WEEK)
+    chain.mine()
+    streamed = AMOUNT - start
+    assert claimable(multi, alice) - start == pytest.approx(streamed // 4, rel=0.01)
+    assert claimable(multi, bob) == pytest.approx(streamed * 3 // 4, rel=0.01)
+
+
+# A top-up adds what is left of the running stream to the new amount
+def test_stream_top_up(multi, reward_token, stream, alice, chain):
+    chain.sleep(WEEK // 2)
+    reward_token.approve(multi, AMOUNT, {"from": alice})
+    tx = multi.fundRewardStream(reward_token, AMOUNT, WEEK, {"from": alice})
+
+    reserve = tx.events["RewardStreamUpdated"]["reserve"]
+    assert reserve == pytest.approx(AMOUNT * 3 // 2, rel=0.01)
+    assert multi.rewardStreams(reward_token)["rewardRate"] == reserve // WEEK
+    assert multi.activeRewardStreams() == 1
+
+    chain.sleep(WEEK)
+    chain.mine()
+    assert claimable(multi, alice) == 2 * AMOUNT
+
+
+def test_retire_streaming_reward(multi, reward_token, stream, alice, chain):
+    with brownie.reverts(withCustomError("ActiveReward()")):
+        multi.retireReward(reward_token, {"from": alice})
+
+    chain.sleep(WEEK)
+    multi.retireReward(reward_token, {"from": alice})
+    assert multi.activeRewardStreams() == 0
+
+
+# Without stakers nothing is credited, the first stakers receive the emission
+def test_stream_without_stakes(multi, reward_token, alice, chain):
+    reward_token.approve(multi, AMOUNT, {"from": alice})
+    tx = multi.fundRewardStream(reward_token, AMOUNT, WEEK, {"from": alice})
+    assert "RewardUpdated" not in tx.events
+
+    chain.sleep(WEEK)
+    multi.stake(10 ** 18, alice, {"from": alice})
+    assert multi.rewardStreams(reward_token)["reserve"] == AMOUNT
+
+    chain.sleep(60)
+    chain.mine()
+    assert claimable(multi, alice) == AMOUNT
+
+
+# Tokens charging a fee on transfer fund the stream with what the staker actually received
+def test_stream_fee_on_transfer_token(multi, reward_token, MockFeeToken, alice, chain):
+    token = MockFeeToken.deploy(10 ** 24, 100, {"from": alice})
+    multi.addReward(token, {"from": alice})
+    multi.stake(10 ** 18, alice, {"from": alice})
+
+    token.approve(multi, AMOUNT, {"from": alice})
+    tx = multi.fundRewardStream(token, AMOUNT, WEEK, {"from": alice})
+    received = AMOUNT * 99 // 100
+    assert token.balanceOf(multi) == received
+    assert tx.events["RewardStreamUpdated"]["reserve"] == received
+    assert multi.rewardStreams(token)["reserve"] == received
+    assert multi.rewardData(token)["amount"] == received
+
+    # updates keep working once the stream is over, the credited amount is backed by the balance
+    chain.sleep(WEEK)
+    multi.stake(10 ** 18, alice, {"from": alice})
+    assert multi.rewardData(token)["amount"] <= token.balanceOf(multi)
+
+    tx = multi.getReward(alice, [token], {"from": alice})
+    paid = tx.events["RewardPaid"]["reward"]
+    assert received - WEEK <= paid <= received
+    assert token.balanceOf(multi) == received - paid
@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+
+import brownie
+import pytest
+from eth_keys import keys
+from eth_utils import keccak, to_bytes
+
+PERMIT_TYPEHASH = keccak(
+    text="Permit(address owner,address spender,uint256 value,uint256 nonce,uint256 deadline)"
+)
+
+
+def abi_word(value):
+    if isinstance(value, int):
+        return value.to_bytes(32, "big")
+    return to_bytes(hexstr=str(value)).rjust(32, b"\0")
+
+
+# sign against the contract's own DOMAIN_SEPARATOR, ganache may report a different chain id
+def sign_permit(vault, signer, spender, value, deadline):
+    fields = [signer, spender, value, vault.nonces(signer), deadline]
+    struct_hash = keccak(PERMIT_TYPEHASH + b"".join(abi_word(field) for field in fields))
+    digest = keccak(b"\x19\x01" + to_bytes(hexstr=str(vault.DOMAIN_SEPARATOR())) + struct_hash)
+    signature = keys.PrivateKey(to_bytes(hexstr=signer.private_key)).sign_msg_hash(digest)
+    return signature.v + 27, abi_word(signature.r), abi_word(signature.s)
+
+
+@pytest.fixture
+def signer(accounts, mpermitvault, alice):
+    _signer = accounts.add()
+    alice.transfer(_signer, "1 ether")
+    mpermitvault.transfer(_signer, 10 ** 19, {"from": alice})
+    return _signer
+
+
+# A permit signature replaces the separate approve transaction
+def test_stake_with_permit(permit_multi, mpermitvault, signer, chain):
+    amount = 10 ** 18
+    deadline = chain.time() + 3600
+    (v, r, s) = sign_permit(mpermitvault, signer, permit_multi, amount, deadline)
+
+    assert mpermitvault.allowance(signer, permit_multi) == 0
+    tx = permit_multi.stakeWithPermit(amount, signer, deadline, v, r, s, {"from": signer})
+
+    assert tx.events["Stake"]["amount"] == amount
+    assert permit_multi.userData(signer)["tokenAmount"] == amount
+    assert mpermitvault.allowance(signer, permit_multi) == 0
+    assert mpermitvault.nonces(signer) == 1
+
+
+# A permit that was already submitted does not block the stake
+def test_stake_with_used_permit(permit_multi, mpermitvault, signer, chain):
+    amount = 10 ** 18
+    deadline = chain.time() + 3600
+    (v, r, s) = sign_permit(mpermitvault, signer, permit_multi, amount, deadline)
+    mpermitvault.permit(signer, permit_multi, amount, deadline, v, r, s, {"from": signer})
+
+    permit_multi.stakeWithPermit(amount, signer, deadline, v, r, s, {"from": signer})
+    assert permit_multi.userData(signer)["tokenAmount"] == amount
+
+
+# Staking tokens without permit support fall back to the existing allowance
+def test_stake_with_permit_falls_back_to_allowance(multi, mvault, bob):
+    amount = 10 ** 18
+    mvault.approve(multi, amount, {"from": bob})
+    multi.stakeWithPermit(amount, bob, 0, 0, 0, 0, {"from": bob})
+    assert multi.userData(bob)["tokenAmount"] == amount
+
+
+# Without a valid permit or an allowance the stake reverts
+def test_stake_with_invalid_permit_reverts(multi, mvault, bob):
+    with brownie.reverts("ERC20: insufficient allowance"):
+        multi.stakeWithPermit(10 ** 18, bob, 0, 0, 0, 0, {"from": bob})
@@ -0,0 +1,45 @@
+#!/usr/bin/python3
+
+from brownie_tokens.template import ERC20
+from scripts.update_config import apply, plan_staker
+
+
+def test_reconcile(multi, distributor_factory, reward_token, alice, bob, charlie):
+    tokens = [ERC20(), ERC20()]
+    config = {
+        "managers": [alice.address, bob.address],
+        "removed_managers": [charlie.address],
+        "reward_tokens": [reward_token.address] + [t.address for t in tokens],
+        "distributors": [reward_token.address, tokens[0].address],
+    }
+
+    actions = plan_staker(multi, config, distributor_factory)
+    # one setManagers, one addRewards and the two distributors
+    assert len(actions) == 4
+    apply(actions, alice)
+
+    assert multi.managers(bob)
+    (active, _) = multi.claimableRewardsForMany([], [])
+    assert list(active) == [reward_token] + tokens
+    for token in (reward_token, tokens[0]):
+        assert distributor_factory.getDistributor(multi, token) != "0x" + "00" * 20
+
+    assert plan_staker(multi, config, distributor_factory) == []
+
+
+def test_reconcile_removals(multi, reward_token, alice, bob, charlie):
+    multi.setManagers([bob, charlie], {"from": alice})
+    token = ERC20()
+    multi.addReward(token, {"from": alice})
+    config = {
+        "removed_managers": [bob.address, charlie.address],
+        "reward_tokens": [reward_token.address],
+    }
+
+    # unlisted rewards are kept unless pruned
+    assert [a.fn for a in plan_staker(multi, config)] == [multi.removeManagers]
+
+    apply(plan_staker(multi, config, prune=True), alice)
+    assert not multi.managers(bob) and not multi.managers(charlie)
+    assert multi.rewardData(token)["retiredIndex"] == 1
+    assert plan_staker(multi, config, prune=True) == []
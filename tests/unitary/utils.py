@@ -7,6 +7,17 @@ def withCustomError(customErrorString):
     return 'typed error: ' + errMsg
 
 
+# revert data of require(false, message), as caught by try/catch (bytes memory reason)
+def withRevertReason(message):
+    data = message.encode()
+    return (
+        Web3.keccak(text="Error(string)")[:4]
+        + (32).to_bytes(32, "big")
+        + len(data).to_bytes(32, "big")
+        + data.ljust((len(data) + 31) // 32 * 32, b"\0")
+    )
+
+
 # based on: https://github.com/pandadefi/brownie-create2/blob/master/tests/test_factory.py
 def computeCreate2Address(factory, saltBytes32, init_code_hash):
 